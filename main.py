@@ -27,6 +27,20 @@ def main():
         cli.run_price_check(symbol)
     elif command == 'signals':
         cli.run_signals()
+    elif command == 'backfill':
+        symbol = sys.argv[2] if len(sys.argv) > 2 else None
+        interval = sys.argv[3] if len(sys.argv) > 3 else '1m'
+        cli.run_backfill(symbol, interval)
+    elif command == 'backtest':
+        symbols = sys.argv[2] if len(sys.argv) > 2 else None
+        days = float(sys.argv[3]) if len(sys.argv) > 3 else None
+        cli.run_backtest(symbols, days)
+    elif command == 'sweep':
+        symbols = sys.argv[2] if len(sys.argv) > 2 else None
+        days = float(sys.argv[3]) if len(sys.argv) > 3 else None
+        output = sys.argv[4] if len(sys.argv) > 4 else 'sweep_results.csv'
+        samples = int(sys.argv[5]) if len(sys.argv) > 5 else None
+        cli.run_sweep(symbols, days, output, samples)
     elif command == 'telegram':
         import nest_asyncio
         from src.memo_bot_pro.config import Config
@@ -0,0 +1,78 @@
+"""
+Alert Digest for MeMo Bot Pro
+Per-user price alert buffering, merging a window of alerts into one message
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Choices offered in the notification settings menu, in seconds (0 = instant alerts)
+DIGEST_WINDOWS = (0, 10, 30, 60)
+
+
+def next_digest_window(current: Optional[float]) -> int:
+    """The settings-menu choice after current, wrapping back to instant"""
+    windows = [w for w in DIGEST_WINDOWS if w > (current or 0)]
+    return windows[0] if windows else DIGEST_WINDOWS[0]
+
+
+@dataclass
+class PendingDigest:
+    language: str
+    due_at: float
+    changes: Dict[str, Dict] = field(default_factory=dict)  # symbol -> merged change
+    alerts: int = 0
+
+
+class AlertDigest:
+    """
+    Buffers price changes per user until their window closes.
+
+    The first alert opens a window of the user's chosen length; every change
+    that arrives before it closes is merged in, keeping the price from the
+    start of the window and the latest price per symbol. A user following
+    many symbols then receives one message per window instead of one per
+    symbol cooldown.
+    """
+
+    def __init__(self):
+        self._pending: Dict[int, PendingDigest] = {}
+        self.buffered = 0
+        self.flushed = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, user_id: int, language: str, changes: List[Dict], window: float, now: float):
+        digest = self._pending.get(user_id)
+        if digest is None:
+            digest = self._pending[user_id] = PendingDigest(language, now + window)
+        digest.language = language
+        for change in changes:
+            merged = digest.changes.get(change['symbol'])
+            if merged is None:
+                digest.changes[change['symbol']] = dict(change)
+            else:
+                merged['new_price'] = change['new_price']
+        digest.alerts += 1
+        self.buffered += 1
+
+    def due(self, now: float) -> List[Tuple[int, str, List[Dict]]]:
+        """Remove and return (user_id, language, merged changes) for every closed window"""
+        ready = [user_id for user_id, digest in self._pending.items() if digest.due_at <= now]
+        digests = []
+        for user_id in ready:
+            digest = self._pending.pop(user_id)
+            digests.append((user_id, digest.language, list(digest.changes.values())))
+        self.flushed += len(digests)
+        return digests
+
+    def discard(self, user_id: int):
+        self._pending.pop(user_id, None)
+
+    def stats(self) -> Dict:
+        return {
+            'pending': len(self._pending),
+            'buffered': self.buffered,
+            'flushed': self.flushed,
+            'merged': self.buffered - self.flushed - sum(d.alerts for d in self._pending.values())
+        }
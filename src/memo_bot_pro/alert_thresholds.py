@@ -0,0 +1,121 @@
+"""
+Alert Thresholds for MeMo Bot Pro
+Volatility-adaptive price alert bands with per-symbol and per-user overrides
+"""
+from typing import Dict, Optional, Tuple
+
+# Choices offered in the notification settings menu, in percent (None = the symbol's band)
+ALERT_CHANGE_CHOICES = (None, 0.5, 1.0, 2.0, 5.0)
+
+
+def next_alert_change(current: Optional[float]) -> Optional[float]:
+    """The settings-menu choice after current, wrapping back to the symbol's band"""
+    choices = [c for c in ALERT_CHANGE_CHOICES[1:] if c > (current or 0)]
+    return choices[0] if choices else ALERT_CHANGE_CHOICES[0]
+
+
+class AlertThresholds:
+    """
+    Decides whether a price move is worth an alert.
+
+    A symbol alerts when its move since the last alert exceeds a band of
+    sigma standard deviations of its recent tick prices (from the streaming
+    indicators), never less than min_change_percent. A fixed percentage can
+    be set per symbol instead. Users can raise the bar for themselves with
+    their own minimum change, measured from the last price they were alerted
+    at for that symbol, so moves too small for them add up across alerts
+    until they clear it. They cannot go below the symbol's band, since their
+    check only runs on moves that already cleared it.
+    """
+
+    def __init__(self, sigma: float = 2.0, min_change_percent: float = 0.05, min_samples: int = 30,
+                 symbol_overrides: Optional[Dict[str, float]] = None):
+        self.sigma = sigma
+        self.min_change_percent = min_change_percent
+        self.min_samples = min_samples
+        self.symbol_overrides: Dict[str, float] = dict(symbol_overrides or {})
+        self.sent = 0
+        self.suppressed = 0
+        self.user_sent = 0
+        self.user_suppressed = 0
+        self._bands: Dict[str, float] = {}
+        # Last price each user with their own minimum change was alerted at, per symbol
+        self._user_prices: Dict[Tuple[int, str], float] = {}
+
+    def configure(self, sigma: Optional[float] = None, min_change_percent: Optional[float] = None,
+                  min_samples: Optional[int] = None, symbol_overrides: Optional[Dict[str, float]] = None):
+        if sigma is not None:
+            self.sigma = sigma
+        if min_change_percent is not None:
+            self.min_change_percent = min_change_percent
+        if min_samples is not None:
+            self.min_samples = min_samples
+        if symbol_overrides is not None:
+            self.symbol_overrides = dict(symbol_overrides)
+
+    def band(self, symbol: str, indicators: Optional[Dict[str, float]] = None) -> float:
+        """Minimum move in percent for symbol to alert, given its streaming indicator values"""
+        if symbol in self.symbol_overrides:
+            return self.symbol_overrides[symbol]
+        band = self.min_change_percent
+        if self.sigma > 0 and indicators and indicators['samples'] >= self.min_samples and indicators['mean']:
+            band = max(band, self.sigma * indicators['std'] / indicators['mean'] * 100)
+        return band
+
+    def check(self, symbol: str, old_price: float, new_price: float,
+              indicators: Optional[Dict[str, float]] = None) -> bool:
+        """True if the move from old_price (last alert) to new_price clears the symbol's band"""
+        band = self.band(symbol, indicators)
+        self._bands[symbol] = band
+        if old_price and abs(new_price - old_price) / old_price * 100 >= band:
+            self.sent += 1
+            return True
+        self.suppressed += 1
+        return False
+
+    def allow_user(self, user_id: int, symbol: str, min_change_percent: Optional[float],
+                   old_price: float, new_price: float) -> bool:
+        """Apply a user's own minimum change to a move (old_price -> new_price) that already cleared the symbol band"""
+        if min_change_percent:
+            key = (user_id, symbol)
+            # Until the user's first alert for symbol, measure from the last alert everyone saw
+            base = self._user_prices.setdefault(key, old_price)
+            if base and abs(new_price - base) / base * 100 < min_change_percent:
+                self.user_suppressed += 1
+                return False
+            self._user_prices[key] = new_price
+        self.user_sent += 1
+        return True
+
+    def forget_user(self, user_id: int):
+        """Drop a user's last alerted prices, e.g. when they unsubscribe"""
+        for key in [key for key in self._user_prices if key[0] == user_id]:
+            del self._user_prices[key]
+
+    def stats(self) -> Dict:
+        checked = self.sent + self.suppressed
+        return {
+            'sigma': self.sigma,
+            'min_change_percent': self.min_change_percent,
+            'sent': self.sent,
+            'suppressed': self.suppressed,
+            'suppression_ratio': self.suppressed / checked if checked else 0.0,
+            'user_sent': self.user_sent,
+            'user_suppressed': self.user_suppressed,
+            'user_prices': len(self._user_prices),
+            'bands': {symbol: round(band, 4) for symbol, band in self._bands.items()}
+        }
+
+
+def parse_symbol_thresholds(value: str) -> Dict[str, float]:
+    """'BTCUSDT:0.3,ETHUSDT:0.5' -> {'BTCUSDT': 0.3, 'ETHUSDT': 0.5}"""
+    thresholds = {}
+    for item in value.split(','):
+        symbol, _, percent = item.partition(':')
+        if symbol.strip() and percent.strip():
+            thresholds[symbol.strip().upper()] = float(percent)
+    return thresholds
+
+
+# Shared by the bot's alert loop and the health monitor
+alert_thresholds = AlertThresholds()
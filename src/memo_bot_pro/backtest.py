@@ -0,0 +1,343 @@
+"""
+Backtester for MeMo Bot Pro
+Array-based simulation of the scalping strategy over stored candles, with fees, stats and equity curves
+"""
+import math
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .candle_store import CandleStore, candle_store
+from .indicators import atr, ema, macd, rsi
+
+
+EXIT_TAKE_PROFIT = 0
+EXIT_STOP_LOSS = 1
+EXIT_TIME = 2
+EXIT_REASONS = ('take_profit', 'stop_loss', 'time')
+
+DAY_MS = 24 * 3600_000
+
+TRADE_COLUMNS = ('symbol', 'entry_time', 'exit_time', 'entry_price', 'exit_price', 'confidence',
+                 'hold_bars', 'exit_reason', 'fees', 'pnl', 'return_pct')
+
+
+@dataclass
+class BacktestParams:
+    """Strategy and execution settings; defaults mirror ScalpingSignalGenerator.RISK_PARAMS"""
+    take_profit_min: float = 1.0  # Percent
+    take_profit_max: float = 2.0  # Percent
+    stop_loss_percent: float = 0.5
+    min_confidence: int = 75
+    volatility_threshold: float = 0.5  # Realised volatility (percent) needed to trade
+    volume_spike_ratio: float = 1.5  # Candle volume vs the window average
+    window: int = 100  # Candles of history behind each signal, as IndicatorEngine uses
+    max_hold_bars: int = 30  # Upper bound of the signal's time window
+    fee_percent: float = 0.1  # Charged on entry and exit notional
+    trade_amount_usdt: float = 50.0
+    initial_capital: float = 1000.0
+
+    @classmethod
+    def from_risk_params(cls, risk_params: Dict, **overrides) -> 'BacktestParams':
+        params = cls(
+            take_profit_min=risk_params['take_profit_min'],
+            take_profit_max=risk_params['take_profit_max'],
+            stop_loss_percent=risk_params['stop_loss_percent'],
+            min_confidence=risk_params['min_confidence'],
+            trade_amount_usdt=risk_params['max_trade_usdt']
+        )
+        for name, value in overrides.items():
+            setattr(params, name, value)
+        return params
+
+
+@dataclass
+class BacktestResult:
+    params: BacktestParams
+    trades: Dict[str, np.ndarray]  # Parallel columns, one row per trade, ordered by exit time
+    equity_time: np.ndarray  # Exit times (ms) of the trades, starting with the first candle
+    equity: np.ndarray  # Account value after each trade, starting with initial_capital
+    stats: Dict = field(default_factory=dict)
+    symbol_stats: Dict[str, Dict] = field(default_factory=dict)
+
+    def trade_list(self) -> List[Dict]:
+        names = list(self.trades)
+        rows = []
+        for values in zip(*(self.trades[name].tolist() for name in names)):
+            row = dict(zip(names, values))
+            row['exit_reason'] = EXIT_REASONS[row['exit_reason']]
+            rows.append(row)
+        return rows
+
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Mean of x[..., t - window + 1 .. t]; NaN until a full window is available"""
+    csum = np.cumsum(x, axis=-1)
+    out = np.full(x.shape, np.nan)
+    out[..., window - 1:] = csum[..., window - 1:]
+    out[..., window:] -= csum[..., :-window]
+    out[..., window - 1:] /= window
+    return out
+
+
+def _shift(x: np.ndarray, fill: float) -> np.ndarray:
+    """x delayed by one step along the last axis"""
+    return np.concatenate([np.full(x.shape[:-1] + (1,), fill), x[..., :-1]], axis=-1)
+
+
+def signal_features(close: np.ndarray, high: np.ndarray, low: np.ndarray, volume: np.ndarray,
+                    window: int = 100) -> Dict[str, np.ndarray]:
+    """
+    Per-candle inputs of the scalping rule; they do not depend on the risk
+    parameters, so a parameter sweep computes them once per symbol set.
+    Arrays are (time,) or (symbols, time) for equal-length histories.
+
+    Uses the same indicators as the live path: EMA 12/26 gap, MACD histogram,
+    RSI 14, realised volatility and volume spike over the last window
+    candles, and ATR for the take-profit and holding time.
+    """
+    close = np.asarray(close, dtype=np.float64)
+
+    ema_gap_pct = (ema(close, 12) - ema(close, 26)) / close * 100
+    _, _, macd_hist = macd(close)
+    rsi_value = np.concatenate([np.full(close.shape[:-1] + (1,), 50.0), rsi(close)], axis=-1)
+    atr_pct = atr(high, low, close) / close * 100
+
+    # Realised volatility over window candles: std of window - 1 log returns, scaled to the window
+    returns = np.diff(np.log(close), axis=-1, prepend=np.log(close[..., :1]))
+    mean_r = _rolling_mean(returns, window - 1)
+    var_r = np.clip(_rolling_mean(returns * returns, window - 1) - mean_r * mean_r, 0, None)
+    volatility = np.sqrt(var_r) * math.sqrt(window - 1) * 100
+
+    # Current candle volume against the average of the previous window - 1 candles
+    prior_volume = _shift(_rolling_mean(np.asarray(volume, dtype=np.float64), window - 1), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volume_ratio = np.where(prior_volume > 0, volume / prior_volume, 1.0)
+        strength = np.maximum(np.abs(ema_gap_pct) / 0.5, np.abs(macd_hist) / close * 1000)
+
+    return {
+        'bullish': (ema_gap_pct > 0) & (macd_hist > 0) & (rsi_value < 70)
+                   & (np.arange(close.shape[-1]) >= window - 1),
+        'volatility': volatility,
+        'volume_ratio': volume_ratio,
+        'confidence': 75 + np.round(np.minimum(strength, 1.0) * 20),
+        'atr_pct': atr_pct,
+    }
+
+
+def scalping_signals(features: Dict[str, np.ndarray], params: BacktestParams) -> Dict[str, np.ndarray]:
+    """The ScalpingSignalGenerator BUY rule, take-profit and time window at every candle close"""
+    atr_pct = features['atr_pct']
+    buy = (features['bullish'] & (features['volatility'] > params.volatility_threshold)
+           & (features['volume_ratio'] > params.volume_spike_ratio)
+           & (features['confidence'] >= params.min_confidence))
+
+    take_profit = np.clip(atr_pct * 3, params.take_profit_min, params.take_profit_max)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hold = np.where(atr_pct > 0, take_profit / atr_pct, params.max_hold_bars)
+    hold = np.clip(hold, 5, params.max_hold_bars).astype(np.int64)
+
+    return {'buy': buy, 'take_profit': take_profit, 'hold': hold, 'confidence': features['confidence']}
+
+
+def simulate_trades(open_time: np.ndarray, open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                    close: np.ndarray, signals: Dict[str, np.ndarray],
+                    params: BacktestParams) -> Dict[str, np.ndarray]:
+    """
+    Fill every BUY signal at the next candle's open and find its exit.
+
+    Exits for all candidate entries are found at once on a (entries, hold)
+    window of highs and lows. When take-profit and stop-loss are both inside
+    one candle the stop is assumed to fill first. Only one position is open
+    per symbol, so candidates that start before the previous exit are dropped.
+    """
+    length = len(close)
+    step = int(open_time[1] - open_time[0])
+    horizon = params.max_hold_bars
+    candidates = np.flatnonzero(signals['buy'][:-1])
+    entry_idx = candidates + 1
+
+    pad = np.full(horizon, np.nan)
+    high_windows = sliding_window_view(np.concatenate([high, pad]), horizon)[entry_idx]
+    low_windows = sliding_window_view(np.concatenate([low, pad]), horizon)[entry_idx]
+    hold = signals['hold'][candidates]
+    in_window = np.arange(horizon)[None, :] < hold[:, None]
+
+    entry_price = open_[entry_idx]
+    take_profit_price = entry_price * (1 + signals['take_profit'][candidates] / 100)
+    stop_price = entry_price * (1 - params.stop_loss_percent / 100)
+
+    hit_tp = in_window & (high_windows >= take_profit_price[:, None])
+    hit_sl = in_window & (low_windows <= stop_price[:, None])
+    first_tp = np.where(hit_tp.any(axis=1), hit_tp.argmax(axis=1), horizon)
+    first_sl = np.where(hit_sl.any(axis=1), hit_sl.argmax(axis=1), horizon)
+
+    time_exit = np.minimum(hold - 1, length - 1 - entry_idx)
+    offset = np.minimum(np.minimum(first_tp, first_sl), time_exit)
+    reason = np.where(first_sl <= np.minimum(first_tp, time_exit), EXIT_STOP_LOSS,
+                      np.where(first_tp <= time_exit, EXIT_TAKE_PROFIT, EXIT_TIME))
+    exit_idx = entry_idx + offset
+    exit_price = np.select(
+        [reason == EXIT_TAKE_PROFIT, reason == EXIT_STOP_LOSS],
+        # A stop gapped through at the open fills at the open
+        [take_profit_price, np.minimum(stop_price, open_[exit_idx])],
+        close[exit_idx]
+    )
+
+    # One position at a time: walk the candidates, skipping ones that overlap the open trade
+    taken = []
+    k = 0
+    while k < len(candidates):
+        taken.append(k)
+        k = int(np.searchsorted(entry_idx, exit_idx[k], side='right'))
+    taken = np.asarray(taken, dtype=np.int64)
+
+    quantity = params.trade_amount_usdt / entry_price[taken]
+    exit_value = quantity * exit_price[taken]
+    fees = (params.trade_amount_usdt + exit_value) * params.fee_percent / 100
+    pnl = exit_value - params.trade_amount_usdt - fees
+
+    return {
+        'entry_time': open_time[entry_idx[taken]],
+        'exit_time': open_time[exit_idx[taken]] + step,
+        'entry_price': entry_price[taken],
+        'exit_price': exit_price[taken],
+        'confidence': signals['confidence'][candidates[taken]],
+        'hold_bars': offset[taken] + 1,
+        'exit_reason': reason[taken],
+        'fees': fees,
+        'pnl': pnl,
+        'return_pct': pnl / params.trade_amount_usdt * 100,
+    }
+
+
+def trade_stats(trades: Dict[str, np.ndarray], params: BacktestParams, start_ms: int, end_ms: int) -> Dict:
+    """Win rate, profit factor, drawdown and daily Sharpe ratio for a set of trades"""
+    pnl = trades['pnl']
+    count = len(pnl)
+    equity = params.initial_capital + np.cumsum(pnl)
+    peak = np.maximum.accumulate(np.concatenate([[params.initial_capital], equity]))
+    drawdown = (peak[1:] - equity) / peak[1:] if count else np.zeros(0)
+
+    # Daily P&L (days without trades count as zero) for an annualised Sharpe ratio
+    days = max(1, int(math.ceil((end_ms - start_ms) / DAY_MS)))
+    day_index = np.clip((trades['exit_time'] - start_ms) // DAY_MS, 0, days - 1).astype(np.int64)
+    daily_returns = np.bincount(day_index, weights=pnl, minlength=days) / params.initial_capital
+    daily_std = daily_returns.std()
+    gross_profit = pnl[pnl > 0].sum()
+    gross_loss = -pnl[pnl < 0].sum()
+
+    return {
+        'trades': count,
+        'win_rate': float((pnl > 0).mean() * 100) if count else 0.0,
+        'total_pnl': float(pnl.sum()),
+        'total_fees': float(trades['fees'].sum()),
+        'return_pct': float(pnl.sum() / params.initial_capital * 100),
+        'avg_return_pct': float(trades['return_pct'].mean()) if count else 0.0,
+        'profit_factor': float(gross_profit / gross_loss) if gross_loss > 0 else float('inf') if gross_profit > 0 else 0.0,
+        'max_drawdown_pct': float(drawdown.max() * 100) if count else 0.0,
+        'sharpe': float(daily_returns.mean() / daily_std * math.sqrt(365)) if daily_std > 0 else 0.0,
+        'avg_hold_bars': float(trades['hold_bars'].mean()) if count else 0.0,
+        'exits': {name: int((trades['exit_reason'] == code).sum()) for code, name in enumerate(EXIT_REASONS)},
+        'days': days,
+    }
+
+
+def load_history(symbols: List[str], interval: str = '1m', days: Optional[float] = None,
+                 store: Optional[CandleStore] = None) -> Dict[str, Dict[str, np.ndarray]]:
+    """Stored candles per symbol (the last days only, if given); symbols without data are skipped"""
+    store = store or candle_store
+    history = {}
+    for symbol in symbols:
+        series = store.find(symbol, interval)
+        if series is None or len(series) == 0:
+            continue
+        start_ms = series.last_open_time - int(days * DAY_MS) if days else None
+        history[symbol] = series.range(start_ms)
+    return history
+
+
+def run_backtest(history: Dict[str, Dict[str, np.ndarray]], params: Optional[BacktestParams] = None,
+                 feature_cache: Optional[Dict] = None) -> BacktestResult:
+    """
+    Backtest every symbol in history (candle columns as returned by CandleStore.range).
+
+    Pass the same feature_cache dict to repeated runs over the same history
+    to reuse the indicators between parameter sets.
+    """
+    params = params or BacktestParams()
+    per_symbol = {}
+    symbol_stats = {}
+    start_ms, end_ms = None, None
+
+    # Histories of equal length are stacked so the indicators run once per group;
+    # with a feature_cache they are computed once per symbol across runs
+    groups: Dict[int, List[str]] = {}
+    for symbol, candles in history.items():
+        length = len(candles['open_time'])
+        if length > params.window:
+            groups.setdefault(length, []).append(symbol)
+
+    for symbols in groups.values():
+        features = {}
+        if feature_cache is not None:
+            features = {s: feature_cache[(s, params.window)] for s in symbols if (s, params.window) in feature_cache}
+        missing = [s for s in symbols if s not in features]
+        if missing:
+            stacked = {
+                name: np.stack([np.asarray(history[s][name], dtype=np.float64) for s in missing])
+                for name in ('high', 'low', 'close', 'volume')
+            }
+            computed = signal_features(stacked['close'], stacked['high'], stacked['low'],
+                                       stacked['volume'], params.window)
+            for row, symbol in enumerate(missing):
+                features[symbol] = {name: values[row] for name, values in computed.items()}
+                if feature_cache is not None:
+                    feature_cache[(symbol, params.window)] = features[symbol]
+
+        for symbol in symbols:
+            candles = history[symbol]
+            open_time = np.asarray(candles['open_time'], dtype=np.int64)
+            columns = {name: np.asarray(candles[name], dtype=np.float64) for name in ('open', 'high', 'low', 'close')}
+            trades = simulate_trades(open_time, columns['open'], columns['high'], columns['low'],
+                                     columns['close'], scalping_signals(features[symbol], params), params)
+            trades['symbol'] = np.full(len(trades['pnl']), symbol)
+            per_symbol[symbol] = trades
+
+            first, last = int(open_time[0]), int(open_time[-1] + open_time[1] - open_time[0])
+            start_ms = first if start_ms is None else min(start_ms, first)
+            end_ms = last if end_ms is None else max(end_ms, last)
+            symbol_stats[symbol] = trade_stats(trades, params, first, last)
+
+    if per_symbol:
+        combined = {name: np.concatenate([t[name] for t in per_symbol.values()]) for name in TRADE_COLUMNS}
+        order = np.argsort(combined['exit_time'], kind='stable')
+        combined = {name: column[order] for name, column in combined.items()}
+    else:
+        combined = {name: np.zeros(0, dtype=np.int64 if name in ('entry_time', 'exit_time', 'exit_reason') else np.float64)
+                    for name in TRADE_COLUMNS}
+        start_ms = end_ms = 0
+
+    equity = params.initial_capital + np.concatenate([[0.0], np.cumsum(combined['pnl'])])
+    equity_time = np.concatenate([[start_ms], combined['exit_time']]).astype(np.int64)
+    stats = trade_stats(combined, params, start_ms, end_ms)
+    stats['symbols'] = len(per_symbol)
+    stats['params'] = asdict(params)
+
+    return BacktestResult(params=params, trades=combined, equity_time=equity_time, equity=equity,
+                          stats=stats, symbol_stats=symbol_stats)
+
+
+def format_stats(stats: Dict) -> str:
+    """Multi-line plain text summary of trade_stats() output"""
+    exits = stats['exits']
+    return (
+        f"Trades: {stats['trades']}  Win rate: {stats['win_rate']:.1f}%  "
+        f"Profit factor: {stats['profit_factor']:.2f}\n"
+        f"P&L: ${stats['total_pnl']:.2f} ({stats['return_pct']:+.2f}%)  Fees: ${stats['total_fees']:.2f}\n"
+        f"Max drawdown: {stats['max_drawdown_pct']:.2f}%  Sharpe: {stats['sharpe']:.2f}  "
+        f"Avg hold: {stats['avg_hold_bars']:.1f} bars\n"
+        f"Exits: {exits['take_profit']} take-profit, {exits['stop_loss']} stop-loss, {exits['time']} time"
+    )
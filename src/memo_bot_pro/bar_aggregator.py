@@ -0,0 +1,214 @@
+"""
+Bar Aggregator for MeMo Bot Pro
+Multi-timeframe OHLCV bars built in one pass over a live or replayed tick stream
+"""
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .candle_store import INTERVAL_MS
+
+
+DEFAULT_BAR_INTERVALS = ('1m', '5m', '15m', '1h')
+
+
+@dataclass
+class Bar:
+    """One OHLCV bar; open_time is in milliseconds and aligned to the interval"""
+    symbol: str
+    interval: str
+    open_time: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0  # Base-asset volume from stream updates; polled prices carry none
+    ticks: int = 0
+
+    @property
+    def close_time(self) -> int:
+        return self.open_time + INTERVAL_MS[self.interval]
+
+    @property
+    def change_percent(self) -> float:
+        return (self.close - self.open) / self.open * 100 if self.open else 0.0
+
+    def update(self, price: float, volume: float = 0.0):
+        self.high = max(self.high, price)
+        self.low = min(self.low, price)
+        self.close = price
+        self.volume += volume
+        self.ticks += 1
+
+    def merge(self, later: 'Bar'):
+        """Extend this bar with a later bar of a finer interval"""
+        self.high = max(self.high, later.high)
+        self.low = min(self.low, later.low)
+        self.close = later.close
+        self.volume += later.volume
+        self.ticks += later.ticks
+
+    def to_kline(self) -> list:
+        """REST kline row layout ([open_time, o, h, l, c, v]) as used by the candle store"""
+        return [self.open_time, self.open, self.high, self.low, self.close, self.volume]
+
+
+class BarAggregator:
+    """
+    Builds bars for several intervals at once from one tick stream.
+
+    Each tick only touches the open bar of the finest interval. When that bar
+    closes it is rolled up into the coarser intervals, so the per-tick cost
+    does not grow with the number of timeframes. Subscribers are called with
+    every closed bar of the intervals they asked for.
+    """
+
+    def __init__(self, intervals: Iterable[str] = DEFAULT_BAR_INTERVALS, history: int = 500):
+        self.intervals = sorted(intervals, key=lambda i: INTERVAL_MS[i])
+        self.base = self.intervals[0]
+        self._base_ms = INTERVAL_MS[self.base]
+        for interval in self.intervals[1:]:
+            if INTERVAL_MS[interval] % self._base_ms:
+                raise ValueError(f"{interval} is not a multiple of the {self.base} base interval")
+
+        self.history_size = history
+        self._open: Dict[str, Bar] = {}
+        self._rollups: Dict[Tuple[str, str], Bar] = {}
+        self._history: Dict[Tuple[str, str], deque] = {}
+        self._closed_until: Dict[str, int] = {}
+        self._subscribers: List[Tuple[Callable[[Bar], None], Optional[set]]] = []
+        self.ticks = 0
+        self.late_ticks = 0
+        self.bars_closed = {interval: 0 for interval in self.intervals}
+
+    def subscribe(self, callback: Callable[[Bar], None], intervals: Optional[Iterable[str]] = None):
+        """Call callback(bar) on every bar close, optionally only for some intervals"""
+        self._subscribers.append((callback, set(intervals) if intervals else None))
+
+    def unsubscribe(self, callback: Callable[[Bar], None]):
+        self._subscribers = [(cb, iv) for cb, iv in self._subscribers if cb != callback]
+
+    def on_tick(self, symbol: str, price: float, time_ms: int, volume: float = 0.0) -> List[Bar]:
+        """Apply one tick; returns the bars it closed (finest interval first)"""
+        self.ticks += 1
+        start = time_ms - time_ms % self._base_ms
+        closed = []
+
+        bar = self._open.get(symbol)
+        if start < (bar.open_time if bar is not None else self._closed_until.get(symbol, 0)):
+            # Out-of-order tick for a bar that already closed
+            self.late_ticks += 1
+            return closed
+        if bar is not None and start > bar.open_time:
+            closed = self._close(bar)
+            bar = None
+
+        if bar is None:
+            self._open[symbol] = Bar(symbol, self.base, start, price, price, price, price, volume, 1)
+        else:
+            bar.update(price, volume)
+        return closed
+
+    def advance(self, now_ms: int) -> List[Bar]:
+        """Close open bars and rollups whose time is up, for symbols that stopped ticking"""
+        closed = []
+        for bar in list(self._open.values()):
+            if bar.close_time <= now_ms:
+                closed.extend(self._close(bar))
+        # A rollup only closes from _close() when its last base bar closes; without ticks
+        # in that last slot it would stay open, so close expired ones here (finest first)
+        expired = [key for key, rollup in self._rollups.items() if rollup.close_time <= now_ms]
+        for key in sorted(expired, key=lambda key: INTERVAL_MS[key[1]]):
+            rollup = self._rollups.pop(key)
+            # Later ticks for this bucket are late; they must not reopen it
+            self._closed_until[rollup.symbol] = max(self._closed_until.get(rollup.symbol, 0), rollup.close_time)
+            self._record(rollup)
+            closed.append(rollup)
+        return closed
+
+    def feed(self, ticks: Iterable) -> int:
+        """Aggregate tick_replay.Tick objects (or anything with time_ms/symbol/price); returns bars closed"""
+        closed = 0
+        for tick in ticks:
+            closed += len(self.on_tick(tick.symbol, tick.price, tick.time_ms))
+        return closed
+
+    def current(self, symbol: str, interval: str) -> Optional[Bar]:
+        """The still-forming bar for symbol at interval, including the latest ticks"""
+        if interval not in self.intervals:
+            raise ValueError(f"Interval {interval} is not aggregated")
+        base_bar = self._open.get(symbol)
+        if interval == self.base:
+            return replace(base_bar) if base_bar else None
+
+        rollup = self._rollups.get((symbol, interval))
+        if base_bar is None:
+            return replace(rollup) if rollup else None
+        start = base_bar.open_time - base_bar.open_time % INTERVAL_MS[interval]
+        if rollup is None or rollup.open_time != start:
+            # The open base bar is the first of a new bucket
+            return replace(base_bar, interval=interval, open_time=start)
+        merged = replace(rollup)
+        merged.merge(base_bar)
+        return merged
+
+    def history(self, symbol: str, interval: str, count: Optional[int] = None) -> List[Bar]:
+        """Closed bars, oldest first"""
+        bars = list(self._history.get((symbol, interval), ()))
+        return bars[-count:] if count else bars
+
+    def last_closed(self, symbol: str, interval: str) -> Optional[Bar]:
+        bars = self._history.get((symbol, interval))
+        return bars[-1] if bars else None
+
+    def stats(self) -> Dict:
+        return {
+            'intervals': list(self.intervals),
+            'symbols': len(self._open),
+            'ticks': self.ticks,
+            'late_ticks': self.late_ticks,
+            'bars_closed': dict(self.bars_closed),
+            'subscribers': len(self._subscribers)
+        }
+
+    def _close(self, bar: Bar) -> List[Bar]:
+        del self._open[bar.symbol]
+        self._closed_until[bar.symbol] = bar.close_time
+        closed = [bar]
+        for interval in self.intervals[1:]:
+            step = INTERVAL_MS[interval]
+            start = bar.open_time - bar.open_time % step
+            key = (bar.symbol, interval)
+            rollup = self._rollups.get(key)
+            if rollup is not None and rollup.open_time != start:
+                # The stream skipped the end of that bucket; close it as it stands
+                closed.append(self._rollups.pop(key))
+                rollup = None
+            if rollup is None:
+                rollup = self._rollups[key] = replace(bar, interval=interval, open_time=start)
+            else:
+                rollup.merge(bar)
+            if bar.close_time == start + step:
+                closed.append(self._rollups.pop(key))
+
+        for closed_bar in closed:
+            self._record(closed_bar)
+        return closed
+
+    def _record(self, bar: Bar):
+        key = (bar.symbol, bar.interval)
+        if key not in self._history:
+            self._history[key] = deque(maxlen=self.history_size)
+        self._history[key].append(bar)
+        self.bars_closed[bar.interval] += 1
+
+        for callback, intervals in self._subscribers:
+            if intervals is None or bar.interval in intervals:
+                try:
+                    callback(bar)
+                except Exception as e:
+                    print(f"Error in bar close subscriber: {e}")
+
+
+# Fed by the bot's price loop; shared with anything that wants bar closes
+bar_aggregator = BarAggregator()
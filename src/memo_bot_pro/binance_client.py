@@ -1,19 +1,454 @@
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
+import math
+import random
+import threading
 import time
+import zlib
 from decimal import Decimal
 
+from .exchange_info import symbol_filters
+from .http_transport import shared_transport
 
-class MockBinanceClient:
-    def __init__(self):
-        self.mock_prices = {
-            'BTCUSDT': 45000.50,
-            'ETHUSDT': 3200.75,
-            'BNBUSDT': 450.25,
-            'SOLUSDT': 120.30,
-            'XRPUSDT': 0.62
+
+TOP_SYMBOLS = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'SOLUSDT', 'XRPUSDT']
+
+# Intermediate quotes tried, in order, when an asset has no direct USDT pair
+QUOTE_ROUTES = ['BTC', 'ETH', 'BNB', 'FDUSD', 'USDC']
+
+
+@dataclass
+class MarketSnapshot:
+    """One all-tickers response, stamped with a process-wide version"""
+    version: int
+    fetched_at: float
+    tickers: List[Dict]
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    @cached_property
+    def price_map(self) -> Dict[str, float]:
+        """Prices keyed by symbol, parsed once per snapshot"""
+        return {t['symbol']: float(t['price']) for t in self.tickers}
+
+
+def _snapshot_prices(snapshot: MarketSnapshot, mock: bool) -> List[Dict]:
+    """The get_all_prices() view of a snapshot: every mock ticker, or the first 5 top symbols"""
+    if mock:
+        return list(snapshot.tickers)
+    return [t for t in snapshot.tickers if t['symbol'] in TOP_SYMBOLS][:5]
+
+
+class MarketSnapshotCache:
+    """
+    Process-wide TTL cache for the all-tickers snapshot.
+
+    Fresh snapshots (younger than ttl) are served directly. Snapshots inside the
+    stale window (ttl + stale_ttl) are served immediately while a single background
+    refresh runs. Anything older blocks on one upstream fetch shared by all callers.
+    """
+
+    def __init__(self, ttl: float = 1.0, stale_ttl: float = 5.0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._snapshots: Dict[str, MarketSnapshot] = {}
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self._async_fetch_locks: Dict[str, asyncio.Lock] = {}
+        self._background_tasks = set()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._version = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fetches = 0
+
+    def configure(self, ttl: Optional[float] = None, stale_ttl: Optional[float] = None):
+        if ttl is not None:
+            self.ttl = ttl
+        if stale_ttl is not None:
+            self.stale_ttl = stale_ttl
+
+    def get(self, key: str, fetch: Callable[[], List[Dict]]) -> MarketSnapshot:
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None:
+            age = snapshot.age
+            if age < self.ttl:
+                self.hits += 1
+                return snapshot
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._refresh_in_background(key, fetch)
+                return snapshot
+        self.misses += 1
+        return self._refresh(key, fetch)
+
+    async def get_async(self, key: str, fetch: Callable[[], Awaitable[List[Dict]]]) -> MarketSnapshot:
+        """Coroutine variant of get() for AsyncBinanceClient; never blocks the event loop"""
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None:
+            age = snapshot.age
+            if age < self.ttl:
+                self.hits += 1
+                return snapshot
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._refresh_as_task(key, fetch)
+                return snapshot
+        self.misses += 1
+        return await self._refresh_async(key, fetch)
+
+    def peek(self, key: str) -> Optional[MarketSnapshot]:
+        """Return the current snapshot without triggering a fetch"""
+        return self._snapshots.get(key)
+
+    def store(self, key: str, tickers: List[Dict]) -> MarketSnapshot:
+        with self._lock:
+            self._version += 1
+            snapshot = MarketSnapshot(version=self._version, fetched_at=time.monotonic(), tickers=tickers)
+            self._snapshots[key] = snapshot
+        return snapshot
+
+    def invalidate(self, key: Optional[str] = None):
+        with self._lock:
+            if key is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(key, None)
+
+    def stats(self) -> Dict:
+        requests = self.hits + self.stale_hits + self.misses
+        return {
+            'ttl': self.ttl,
+            'stale_ttl': self.stale_ttl,
+            'version': self._version,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'upstream_fetches': self.fetches,
+            'hit_ratio': (self.hits + self.stale_hits) / requests if requests else 0.0,
+            'snapshots': {key: round(snap.age, 3) for key, snap in self._snapshots.items()}
         }
 
+    def _fetch_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            if key not in self._fetch_locks:
+                self._fetch_locks[key] = threading.Lock()
+            return self._fetch_locks[key]
+
+    def _refresh(self, key: str, fetch: Callable[[], List[Dict]]) -> MarketSnapshot:
+        with self._fetch_lock(key):
+            # Another caller may have refreshed while we waited for the lock
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot.age < self.ttl:
+                return snapshot
+            self.fetches += 1
+            return self.store(key, fetch())
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], List[Dict]]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self._refresh(key, fetch)
+            except Exception as e:
+                print(f"Error refreshing market snapshot ({key}): {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    async def _refresh_async(self, key: str, fetch: Callable[[], Awaitable[List[Dict]]]) -> MarketSnapshot:
+        if key not in self._async_fetch_locks:
+            self._async_fetch_locks[key] = asyncio.Lock()
+        async with self._async_fetch_locks[key]:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot.age < self.ttl:
+                return snapshot
+            self.fetches += 1
+            return self.store(key, await fetch())
+
+    def _refresh_as_task(self, key: str, fetch: Callable[[], Awaitable[List[Dict]]]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        async def run():
+            try:
+                await self._refresh_async(key, fetch)
+            except Exception as e:
+                print(f"Error refreshing market snapshot ({key}): {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+
+# Request weight per python-binance method (Binance spot REST, per IP per minute)
+ENDPOINT_WEIGHTS = {
+    'get_all_tickers': 4,
+    'get_symbol_ticker': 2,
+    'get_ticker': 2,
+    'get_account': 20,
+    'order_market_buy': 1,
+    'order_market_sell': 1,
+    'order_market': 1,
+    'get_exchange_info': 20,
+    'get_klines': 2,
+}
+
+# Lower value = higher priority
+PRIORITY_ORDER = 0
+PRIORITY_ACCOUNT = 1
+PRIORITY_MARKET_DATA = 2
+
+ENDPOINT_PRIORITIES = {
+    'order_market_buy': PRIORITY_ORDER,
+    'order_market_sell': PRIORITY_ORDER,
+    'order_market': PRIORITY_ORDER,
+    'get_account': PRIORITY_ACCOUNT,
+}
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a low-priority call is shed to protect the request-weight budget"""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        super().__init__(f"Request weight budget exhausted for {endpoint}, retry in {retry_after:.1f}s")
+
+
+class RequestWeightGovernor:
+    """
+    Token bucket over Binance's per-minute request weight.
+
+    The bucket refills at weight_limit / 60 per second. Each priority may only
+    spend down to its reserve, so market data cannot starve account calls and
+    neither can starve orders. Calls that would wait longer than their priority's
+    max wait are shed with RateLimitExceeded. The X-MBX-USED-WEIGHT-1M header of
+    every response corrects the local estimate, and 429/418 responses pause all
+    calls for the Retry-After period.
+    """
+
+    # Fraction of the budget kept back from each priority
+    RESERVES = {PRIORITY_ORDER: 0.0, PRIORITY_ACCOUNT: 0.1, PRIORITY_MARKET_DATA: 0.2}
+    # Longest a caller of each priority queues before being shed
+    MAX_WAIT = {PRIORITY_ORDER: 30.0, PRIORITY_ACCOUNT: 5.0, PRIORITY_MARKET_DATA: 1.0}
+
+    def __init__(self, weight_limit: int = 6000):
+        self.weight_limit = weight_limit
+        self._tokens = float(weight_limit)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.used_weight = 0  # Last value reported by Binance
+        self.granted = 0
+        self.queued = 0
+        self.shed = 0
+        self.bans = 0
+
+    def configure(self, weight_limit: Optional[int] = None):
+        if weight_limit is not None:
+            with self._lock:
+                self.weight_limit = weight_limit
+                self._tokens = min(self._tokens, float(weight_limit))
+
+    def acquire(self, endpoint: str):
+        """Block until the endpoint's weight can be spent, or raise RateLimitExceeded"""
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(endpoint, waited)
+            if wait is None:
+                return
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, endpoint: str):
+        """Coroutine variant of acquire(); queues with asyncio.sleep instead of blocking"""
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(endpoint, waited)
+            if wait is None:
+                return
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def observe(self, response):
+        """Self-correct from the used-weight header of a Binance response"""
+        headers = getattr(response, 'headers', None)
+        if not headers:
+            return
+        used = headers.get('X-MBX-USED-WEIGHT-1M') or headers.get('X-MBX-USED-WEIGHT')
+        if used is None:
+            return
+        with self._lock:
+            self.used_weight = int(used)
+            self._refill()
+            self._tokens = min(self._tokens, float(self.weight_limit - self.used_weight))
+
+    def penalize(self, status_code: int, retry_after: Optional[float] = None):
+        """Pause every call after a 429 (rate limited) or 418 (IP banned) response"""
+        if status_code not in (429, 418):
+            return
+        with self._lock:
+            self.bans += 1
+            self._tokens = 0.0
+            pause = retry_after if retry_after else 60.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+        print(f"⚠️ Binance returned {status_code}, pausing REST calls for {pause:.1f}s")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._refill()
+            blocked_for = max(0.0, self._blocked_until - time.monotonic())
+            return {
+                'weight_limit': self.weight_limit,
+                'used_weight_1m': self.used_weight,
+                'available_weight': round(self._tokens, 1),
+                'blocked_for': round(blocked_for, 1),
+                'granted': self.granted,
+                'queued': self.queued,
+                'shed': self.shed,
+                'bans': self.bans
+            }
+
+    def _refill(self):
+        now = time.monotonic()
+        rate = self.weight_limit / 60.0
+        self._tokens = min(float(self.weight_limit), self._tokens + (now - self._updated) * rate)
+        self._updated = now
+
+    def _try_acquire(self, endpoint: str, waited: float) -> Optional[float]:
+        """Spend the weight and return None, or return how long to wait before retrying"""
+        weight = ENDPOINT_WEIGHTS.get(endpoint, 1)
+        priority = ENDPOINT_PRIORITIES.get(endpoint, PRIORITY_MARKET_DATA)
+
+        with self._lock:
+            self._refill()
+            now = time.monotonic()
+            reserve = self.weight_limit * self.RESERVES[priority]
+
+            if now < self._blocked_until:
+                wait = self._blocked_until - now
+            elif self._tokens - weight >= reserve:
+                self._tokens -= weight
+                self.granted += 1
+                return None
+            else:
+                wait = (reserve + weight - self._tokens) / (self.weight_limit / 60.0)
+
+            if waited + wait > self.MAX_WAIT[priority]:
+                self.shed += 1
+                raise RateLimitExceeded(endpoint, wait)
+            if waited == 0:
+                self.queued += 1
+            return min(wait, 1.0)
+
+
+def parse_balances(account: Dict) -> Dict:
+    """Reduce a get_account() response to non-zero balances keyed by asset"""
+    balances = {}
+    
+    for balance in account.get('balances', []):
+        asset = balance['asset']
+        free = float(balance['free'])
+        locked = float(balance['locked'])
+        total = free + locked
+        
+        if total > 0:
+            balances[asset] = {
+                'free': free,
+                'locked': locked,
+                'total': total
+            }
+    
+    return balances
+
+
+def resolve_usdt_price(asset: str, price_map: Dict[str, float]) -> Optional[float]:
+    """Price one unit of asset in USDT via a direct, inverse or one-hop quote route"""
+    if asset == 'USDT':
+        return 1.0
+    
+    direct = price_map.get(f"{asset}USDT")
+    if direct:
+        return direct
+    
+    inverse = price_map.get(f"USDT{asset}")
+    if inverse:
+        return 1.0 / inverse
+    
+    for quote in QUOTE_ROUTES:
+        cross = price_map.get(f"{asset}{quote}")
+        quote_price = price_map.get(f"{quote}USDT")
+        if cross and quote_price:
+            return cross * quote_price
+    
+    return None
+
+
+def value_balances_in_usdt(balances: Dict, price_map: Dict[str, float]) -> Dict[str, float]:
+    """Value every asset of a get_balance() result against one price map (0.0 if unpriceable)"""
+    values = {}
+    
+    for asset, balance_info in balances.items():
+        amount = balance_info['total'] if isinstance(balance_info, dict) else balance_info
+        price = resolve_usdt_price(asset, price_map)
+        values[asset] = amount * price if price else 0.0
+    
+    return values
+
+
+# Shared by every BinanceClient in the process (bot, web API, signals, health probe)
+market_cache = MarketSnapshotCache()
+weight_governor = RequestWeightGovernor()
+
+
+def _penalize_from_error(error: Exception):
+    """Feed 429/418 API errors (python-binance BinanceAPIException) to the governor"""
+    status_code = getattr(error, 'status_code', None)
+    if status_code in (429, 418):
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        retry_after = headers.get('Retry-After')
+        weight_governor.penalize(status_code, float(retry_after) if retry_after else None)
+
+
+MOCK_PRICES = {
+    'BTCUSDT': 45000.50,
+    'ETHUSDT': 3200.75,
+    'BNBUSDT': 450.25,
+    'SOLUSDT': 120.30,
+    'XRPUSDT': 0.62
+}
+
+
+class MockBinanceClient:
+    mock = True
+
+    def __init__(self, replay=None):
+        self.mock_prices = dict(MOCK_PRICES)
+        # Optional tick_replay.TickReplay that moves mock_prices along a virtual clock
+        self.replay = replay
+
+    def _sync_prices(self):
+        if self.replay is not None:
+            self.mock_prices.update(self.replay.sync())
+
     def get_ticker_price(self, symbol: str) -> Dict:
+        self._sync_prices()
         price = self.mock_prices.get(symbol, 100.00)
         return {
             'symbol': symbol,
@@ -21,6 +456,7 @@ class MockBinanceClient:
         }
 
     def get_all_tickers(self) -> List[Dict]:
+        self._sync_prices()
         return [
             {'symbol': symbol, 'price': str(price)}
             for symbol, price in self.mock_prices.items()
@@ -38,7 +474,72 @@ class MockBinanceClient:
             ]
         }
     
+    def get_klines(self, symbol: str, interval: str = '1m', startTime: Optional[int] = None,
+                   endTime: Optional[int] = None, limit: int = 500) -> List[list]:
+        """Deterministic synthetic klines around the mock price (same candle on every call)"""
+        from .candle_store import INTERVAL_MS
+        step = INTERVAL_MS[interval]
+        now = int(time.time() * 1000)
+        last_open = now - now % step
+        end_open = min(last_open, endTime - endTime % step) if endTime else last_open
+        if startTime is None:
+            start_open = end_open - (limit - 1) * step
+        else:
+            # First candle opening at or after startTime, as Binance does
+            start_open = -(-startTime // step) * step
+
+        base = MOCK_PRICES.get(symbol, 100.00)
+
+        def level(t: int) -> float:
+            # Slow six-hour cycle so trends and volatility look plausible
+            return base * (1 + 0.01 * math.sin(t / 3_600_000 * math.pi / 3))
+
+        klines = []
+        open_time = start_open
+        while open_time <= end_open and len(klines) < limit:
+            rng = random.Random(zlib.crc32(f"{symbol}:{interval}:{open_time}".encode()))
+            open_price = level(open_time)
+            close_price = level(open_time + step) * (1 + rng.gauss(0, 0.0015))
+            high = max(open_price, close_price) * (1 + abs(rng.gauss(0, 0.001)))
+            low = min(open_price, close_price) * (1 - abs(rng.gauss(0, 0.001)))
+            volume = rng.uniform(10, 100)
+            klines.append([
+                open_time, f"{open_price:.8f}", f"{high:.8f}", f"{low:.8f}", f"{close_price:.8f}",
+                f"{volume:.8f}", open_time + step - 1, f"{volume * close_price:.8f}", rng.randint(50, 500),
+                f"{volume / 2:.8f}", f"{volume * close_price / 2:.8f}", '0'
+            ])
+            open_time += step
+        return klines
+
+    def get_exchange_info(self) -> Dict:
+        # step size, tick size per mock symbol, mirroring the live spot filters
+        rules = {
+            'BTCUSDT': ('0.00001', '0.01'),
+            'ETHUSDT': ('0.0001', '0.01'),
+            'BNBUSDT': ('0.001', '0.01'),
+            'SOLUSDT': ('0.001', '0.01'),
+            'XRPUSDT': ('0.1', '0.0001')
+        }
+        return {
+            'symbols': [
+                {
+                    'symbol': symbol,
+                    'status': 'TRADING',
+                    'baseAsset': symbol.replace('USDT', ''),
+                    'quoteAsset': 'USDT',
+                    'quoteAssetPrecision': 8,
+                    'filters': [
+                        {'filterType': 'PRICE_FILTER', 'tickSize': tick_size},
+                        {'filterType': 'LOT_SIZE', 'stepSize': step_size, 'minQty': step_size, 'maxQty': '9000000'},
+                        {'filterType': 'NOTIONAL', 'minNotional': '5.00000000'}
+                    ]
+                }
+                for symbol, (step_size, tick_size) in rules.items()
+            ]
+        }
+
     def order_market_buy(self, symbol: str, quantity: float) -> Dict:
+        self._sync_prices()
         return {
             'symbol': symbol,
             'orderId': 12345,
@@ -50,6 +551,7 @@ class MockBinanceClient:
         }
     
     def order_market_sell(self, symbol: str, quantity: float) -> Dict:
+        self._sync_prices()
         return {
             'symbol': symbol,
             'orderId': 12346,
@@ -62,49 +564,79 @@ class MockBinanceClient:
 
 
 class BinanceClient:
-    def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None, mock: bool = True):
+    def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None, mock: bool = True,
+                 replay=None):
         self.mock = mock
         self.client = None
 
         if mock:
-            self.client = MockBinanceClient()
+            self.client = MockBinanceClient(replay)
         else:
             if not api_key or not api_secret:
                 print("Warning: API credentials not provided. Using mock mode.")
-                self.client = MockBinanceClient()
+                self.client = MockBinanceClient(replay)
                 self.mock = True
                 return
             try:
                 from binance.client import Client
                 self.client = Client(api_key, api_secret)
+                # Route REST calls through the shared keep-alive pool
+                shared_transport.mount(self.client.session)
             except ImportError:
                 print("Warning: python-binance not installed. Using mock mode.")
-                self.client = MockBinanceClient()
+                self.client = MockBinanceClient(replay)
                 self.mock = True
             except Exception as e:
                 print(f"Warning: Failed to initialize Binance client: {e}. Using mock mode.")
-                self.client = MockBinanceClient()
+                self.client = MockBinanceClient(replay)
                 self.mock = True
 
+    def _call(self, endpoint: str, **kwargs):
+        """Run a live python-binance call under the shared request-weight budget"""
+        weight_governor.acquire(endpoint)
+        try:
+            return getattr(self.client, endpoint)(**kwargs)
+        except Exception as e:
+            _penalize_from_error(e)
+            raise
+        finally:
+            weight_governor.observe(getattr(self.client, 'response', None))
+
     def get_price(self, symbol: str = 'BTCUSDT') -> Dict:
         if self.mock:
             return self.client.get_ticker_price(symbol=symbol)
         else:
             try:
-                result = self.client.get_symbol_ticker(symbol=symbol)
+                result = self._call('get_symbol_ticker', symbol=symbol)
                 return result
             except Exception as e:
                 print(f"Error fetching price for {symbol}: {e}")
                 raise
 
+    @property
+    def cache_key(self) -> str:
+        return 'mock' if self.mock else 'live'
+
+    @property
+    def replaying(self) -> bool:
+        """Mock prices driven by a tick_replay.TickReplay"""
+        return self.mock and getattr(self.client, 'replay', None) is not None
+
+    def get_market_snapshot(self) -> MarketSnapshot:
+        """Get the shared all-tickers snapshot, fetching upstream only when it has expired"""
+        if self.replaying:
+            # Replayed prices move with the virtual clock, not the wall-clock TTL; every read is a new tick
+            return market_cache.store(self.cache_key, self.client.get_all_tickers())
+        if self.mock:
+            return market_cache.get(self.cache_key, self.client.get_all_tickers)
+        return market_cache.get(self.cache_key, lambda: self._call('get_all_tickers'))
+
     def get_all_prices(self) -> List[Dict]:
         if self.mock:
-            return self.client.get_all_tickers()
+            return _snapshot_prices(self.get_market_snapshot(), True)
         else:
             try:
-                tickers = self.client.get_all_tickers()
-                top_5_symbols = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'SOLUSDT', 'XRPUSDT']
-                return [t for t in tickers if t['symbol'] in top_5_symbols][:5]
+                return _snapshot_prices(self.get_market_snapshot(), False)
             except Exception as e:
                 print(f"Error fetching all prices: {e}")
                 raise
@@ -113,12 +645,15 @@ class BinanceClient:
         if self.mock:
             return self.client.get_account()
         else:
-            return self.client.get_account()
+            return self._call('get_account')
 
     def get_market_summary(self) -> Dict:
-        prices = self.get_all_prices()
+        # One snapshot read, so the version always matches the prices
+        snapshot = self.get_market_snapshot()
+        prices = _snapshot_prices(snapshot, self.mock)
         return {
             'timestamp': time.time(),
+            'snapshot_version': snapshot.version,
             'total_pairs': len(prices),
             'top_pairs': prices[:5] if prices else []
         }
@@ -131,36 +666,54 @@ class BinanceClient:
     
     def get_balance(self) -> Dict:
         """Get account balance information"""
-        account = self.get_account_info()
-        balances = {}
-        
-        for balance in account.get('balances', []):
-            asset = balance['asset']
-            free = float(balance['free'])
-            locked = float(balance['locked'])
-            total = free + locked
-            
-            if total > 0:
-                balances[asset] = {
-                    'free': free,
-                    'locked': locked,
-                    'total': total
-                }
-        
-        return balances
+        return parse_balances(self.get_account_info())
+    
+    def get_exchange_info(self) -> Dict:
+        if self.mock:
+            return self.client.get_exchange_info()
+        return self._call('get_exchange_info')
+    
+    def get_klines(self, symbol: str, interval: str = '1m', start_time: Optional[int] = None,
+                   end_time: Optional[int] = None, limit: int = 500) -> List[list]:
+        """Get raw klines ([open_time, open, high, low, close, volume, ...]) oldest first"""
+        params = {'symbol': symbol, 'interval': interval, 'limit': limit}
+        if start_time is not None:
+            params['startTime'] = start_time
+        if end_time is not None:
+            params['endTime'] = end_time
+        if self.mock:
+            return self.client.get_klines(**params)
+        return self._call('get_klines', **params)
+    
+    def refresh_symbol_filters(self, force: bool = False):
+        """Load symbol filters from exchange info when the shared index is missing or expired"""
+        if force or symbol_filters.needs_refresh():
+            try:
+                # Mock filters are never written over the live cold-start file
+                symbol_filters.update(self.get_exchange_info(), persist=not self.mock)
+            except Exception as e:
+                symbol_filters.refresh_failed(e)
+    
+    def size_order(self, symbol: str, quantity: float, price: Optional[float] = None) -> Decimal:
+        """Round a base quantity to the symbol's LOT_SIZE and check it against its filters"""
+        self.refresh_symbol_filters()
+        return symbol_filters.size_order(symbol, quantity, price)
     
     def execute_buy(self, symbol: str, usdt_amount: float) -> Dict:
         """Execute a market buy order"""
         if self.mock:
             price_info = self.get_price(symbol)
             price = float(price_info['price'])
-            quantity = usdt_amount / price
-            return self.client.order_market_buy(symbol=symbol, quantity=quantity)
+            quantity = self.size_order(symbol, usdt_amount / price, price)
+            return self.client.order_market_buy(symbol=symbol, quantity=format(quantity, 'f'))
         else:
+            self.refresh_symbol_filters()
+            quote_qty = symbol_filters.size_quote_order(symbol, usdt_amount)
             try:
-                order = self.client.order_market_buy(
+                order = self._call(
+                    'order_market_buy',
                     symbol=symbol,
-                    quoteOrderQty=usdt_amount
+                    quoteOrderQty=format(quote_qty, 'f')
                 )
                 return order
             except Exception as e:
@@ -169,29 +722,259 @@ class BinanceClient:
     
     def execute_sell(self, symbol: str, quantity: float) -> Dict:
         """Execute a market sell order"""
+        price = self.get_market_snapshot().price_map.get(symbol)
+        sized = self.size_order(symbol, quantity, price)
         if self.mock:
-            return self.client.order_market_sell(symbol=symbol, quantity=quantity)
+            return self.client.order_market_sell(symbol=symbol, quantity=format(sized, 'f'))
         else:
             try:
-                order = self.client.order_market_sell(
+                order = self._call(
+                    'order_market_sell',
                     symbol=symbol,
-                    quantity=quantity
+                    quantity=format(sized, 'f')
                 )
                 return order
             except Exception as e:
                 print(f"Error executing sell order for {symbol}: {e}")
                 raise
     
+    def execute_market_order(self, symbol: str, side: str, quantity: float, price: Optional[float] = None) -> Dict:
+        """Execute a market order for a base-asset quantity ('BUY' or 'SELL')"""
+        sized = format(self.size_order(symbol, quantity, price), 'f')
+        if self.mock:
+            if side == 'BUY':
+                return self.client.order_market_buy(symbol=symbol, quantity=sized)
+            return self.client.order_market_sell(symbol=symbol, quantity=sized)
+        try:
+            return self._call('order_market', symbol=symbol, side=side, quantity=sized)
+        except Exception as e:
+            print(f"Error executing {side.lower()} order for {symbol}: {e}")
+            raise
+    
+    def value_balances(self, balances: Dict) -> Dict[str, float]:
+        """Value a whole balances dict in USDT against one all-tickers snapshot"""
+        return value_balances_in_usdt(balances, self.get_market_snapshot().price_map)
+    
     def get_asset_value_in_usdt(self, asset: str, amount: float) -> float:
         """Convert asset amount to USDT value"""
         if asset == 'USDT':
             return amount
         
         try:
-            symbol = f"{asset}USDT"
-            price_info = self.get_price(symbol)
+            return self.value_balances({asset: amount})[asset]
+        except Exception as e:
+            print(f"Error getting USDT value for {asset}: {e}")
+            return 0.0
+
+
+class AsyncBinanceClient:
+    """
+    asyncio counterpart of BinanceClient with the same method surface.
+
+    Live mode uses python-binance's AsyncClient, whose pooled aiohttp session is
+    created lazily inside the running event loop on first use.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None, mock: bool = True,
+                 replay=None):
+        self.mock = mock
+        self.client = None
+        self._api_key = api_key
+        self._api_secret = api_secret
+        self._client_lock = None
+
+        if mock:
+            self.client = MockBinanceClient(replay)
+        elif not api_key or not api_secret:
+            print("Warning: API credentials not provided. Using mock mode.")
+            self.client = MockBinanceClient(replay)
+            self.mock = True
+        else:
+            try:
+                from binance import AsyncClient  # noqa: F401
+            except ImportError:
+                print("Warning: python-binance not installed. Using mock mode.")
+                self.client = MockBinanceClient(replay)
+                self.mock = True
+
+    @classmethod
+    def from_client(cls, binance_client: BinanceClient) -> 'AsyncBinanceClient':
+        """Build an async client with the same mode and credentials as a BinanceClient"""
+        if binance_client.mock:
+            async_client = cls(mock=True)
+            # Share the mock so both clients see the same (possibly replayed) prices
+            async_client.client = binance_client.client
+            return async_client
+        return cls(binance_client.client.API_KEY, binance_client.client.API_SECRET, mock=False)
+
+    async def _get_client(self):
+        if self.client is None:
+            if self._client_lock is None:
+                self._client_lock = asyncio.Lock()
+            async with self._client_lock:
+                if self.client is None:
+                    try:
+                        from binance import AsyncClient
+                        self.client = await AsyncClient.create(
+                            self._api_key, self._api_secret,
+                            session_params=shared_transport.aiohttp_session_params()
+                        )
+                    except Exception as e:
+                        print(f"Warning: Failed to initialize async Binance client: {e}. Using mock mode.")
+                        self.client = MockBinanceClient()
+                        self.mock = True
+        return self.client
+
+    async def close(self):
+        if self.client is not None and not self.mock:
+            await self.client.close_connection()
+
+    async def _call(self, endpoint: str, **kwargs):
+        """Await a live python-binance call under the shared request-weight budget"""
+        client = await self._get_client()
+        await weight_governor.acquire_async(endpoint)
+        try:
+            return await getattr(client, endpoint)(**kwargs)
+        except Exception as e:
+            _penalize_from_error(e)
+            raise
+        finally:
+            weight_governor.observe(getattr(client, 'response', None))
+
+    async def get_price(self, symbol: str = 'BTCUSDT') -> Dict:
+        client = await self._get_client()
+        if self.mock:
+            return client.get_ticker_price(symbol=symbol)
+        else:
+            try:
+                return await self._call('get_symbol_ticker', symbol=symbol)
+            except Exception as e:
+                print(f"Error fetching price for {symbol}: {e}")
+                raise
+
+    @property
+    def cache_key(self) -> str:
+        return 'mock' if self.mock else 'live'
+
+    @property
+    def replaying(self) -> bool:
+        """Mock prices driven by a tick_replay.TickReplay"""
+        return self.mock and getattr(self.client, 'replay', None) is not None
+
+    async def get_market_snapshot(self) -> MarketSnapshot:
+        """Get the shared all-tickers snapshot, fetching upstream only when it has expired"""
+        client = await self._get_client()
+        if self.replaying:
+            # Replayed prices move with the virtual clock, not the wall-clock TTL; every read is a new tick
+            return market_cache.store(self.cache_key, client.get_all_tickers())
+        if self.mock:
+            async def fetch():
+                return client.get_all_tickers()
+        else:
+            async def fetch():
+                return await self._call('get_all_tickers')
+        return await market_cache.get_async(self.cache_key, fetch)
+
+    async def get_all_prices(self) -> List[Dict]:
+        if self.mock:
+            return _snapshot_prices(await self.get_market_snapshot(), True)
+        else:
+            try:
+                return _snapshot_prices(await self.get_market_snapshot(), False)
+            except Exception as e:
+                print(f"Error fetching all prices: {e}")
+                raise
+
+    async def get_account_info(self) -> Dict:
+        client = await self._get_client()
+        if self.mock:
+            return client.get_account()
+        else:
+            return await self._call('get_account')
+
+    async def get_market_summary(self) -> Dict:
+        # One snapshot read, so the version always matches the prices
+        snapshot = await self.get_market_snapshot()
+        prices = _snapshot_prices(snapshot, self.mock)
+        return {
+            'timestamp': time.time(),
+            'snapshot_version': snapshot.version,
+            'total_pairs': len(prices),
+            'top_pairs': prices[:5] if prices else []
+        }
+
+    async def get_top_5_currencies(self) -> List[Dict]:
+        return (await self.get_all_prices())[:5]
+
+    async def get_top_10_currencies(self) -> List[Dict]:
+        return await self.get_top_5_currencies()
+
+    async def get_balance(self) -> Dict:
+        """Get account balance information"""
+        return parse_balances(await self.get_account_info())
+
+    async def get_exchange_info(self) -> Dict:
+        client = await self._get_client()
+        if self.mock:
+            return client.get_exchange_info()
+        return await self._call('get_exchange_info')
+
+    async def refresh_symbol_filters(self, force: bool = False):
+        """Load symbol filters from exchange info when the shared index is missing or expired"""
+        if force or symbol_filters.needs_refresh():
+            try:
+                exchange_info = await self.get_exchange_info()
+                symbol_filters.update(exchange_info, persist=not self.mock)
+            except Exception as e:
+                symbol_filters.refresh_failed(e)
+
+    async def size_order(self, symbol: str, quantity: float, price: Optional[float] = None) -> Decimal:
+        """Round a base quantity to the symbol's LOT_SIZE and check it against its filters"""
+        await self.refresh_symbol_filters()
+        return symbol_filters.size_order(symbol, quantity, price)
+
+    async def execute_buy(self, symbol: str, usdt_amount: float) -> Dict:
+        """Execute a market buy order"""
+        client = await self._get_client()
+        if self.mock:
+            price_info = await self.get_price(symbol)
             price = float(price_info['price'])
-            return amount * price
+            quantity = await self.size_order(symbol, usdt_amount / price, price)
+            return client.order_market_buy(symbol=symbol, quantity=format(quantity, 'f'))
+        else:
+            await self.refresh_symbol_filters()
+            quote_qty = symbol_filters.size_quote_order(symbol, usdt_amount)
+            try:
+                return await self._call('order_market_buy', symbol=symbol, quoteOrderQty=format(quote_qty, 'f'))
+            except Exception as e:
+                print(f"Error executing buy order for {symbol}: {e}")
+                raise
+
+    async def execute_sell(self, symbol: str, quantity: float) -> Dict:
+        """Execute a market sell order"""
+        client = await self._get_client()
+        price = (await self.get_market_snapshot()).price_map.get(symbol)
+        sized = format(await self.size_order(symbol, quantity, price), 'f')
+        if self.mock:
+            return client.order_market_sell(symbol=symbol, quantity=sized)
+        else:
+            try:
+                return await self._call('order_market_sell', symbol=symbol, quantity=sized)
+            except Exception as e:
+                print(f"Error executing sell order for {symbol}: {e}")
+                raise
+
+    async def value_balances(self, balances: Dict) -> Dict[str, float]:
+        """Value a whole balances dict in USDT against one all-tickers snapshot"""
+        return value_balances_in_usdt(balances, (await self.get_market_snapshot()).price_map)
+
+    async def get_asset_value_in_usdt(self, asset: str, amount: float) -> float:
+        """Convert asset amount to USDT value"""
+        if asset == 'USDT':
+            return amount
+
+        try:
+            return (await self.value_balances({asset: amount}))[asset]
         except Exception as e:
             print(f"Error getting USDT value for {asset}: {e}")
             return 0.0
@@ -0,0 +1,277 @@
+"""
+Candle Store for MeMo Bot Pro
+Local per-symbol, per-interval kline history in memory-mapped NumPy columns
+
+The store holds exchange klines only: it is filled by REST backfill (the
+bot's minute job and python main.py backfill), never from the live tick
+stream, whose bars are built from sampled prices.
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Column name -> dtype; open_time is the exchange kline open time in milliseconds
+CANDLE_COLUMNS = {
+    'open_time': np.int64,
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.float64,
+}
+
+INTERVAL_MS = {
+    '1m': 60_000,
+    '3m': 3 * 60_000,
+    '5m': 5 * 60_000,
+    '15m': 15 * 60_000,
+    '30m': 30 * 60_000,
+    '1h': 3600_000,
+    '2h': 2 * 3600_000,
+    '4h': 4 * 3600_000,
+    '1d': 24 * 3600_000,
+}
+
+# Binance returns at most this many klines per request
+KLINES_PAGE_LIMIT = 1000
+
+
+def klines_to_columns(klines: List[list]) -> Dict[str, np.ndarray]:
+    """Convert REST kline rows ([open_time, o, h, l, c, v, ...]) into column arrays"""
+    return {
+        'open_time': np.array([k[0] for k in klines], dtype=np.int64),
+        'open': np.array([k[1] for k in klines], dtype=np.float64),
+        'high': np.array([k[2] for k in klines], dtype=np.float64),
+        'low': np.array([k[3] for k in klines], dtype=np.float64),
+        'close': np.array([k[4] for k in klines], dtype=np.float64),
+        'volume': np.array([k[5] for k in klines], dtype=np.float64),
+    }
+
+
+class CandleSeries:
+    """
+    Append-only candle columns for one symbol and interval.
+
+    Each column is a raw memory-mapped file that grows by doubling; meta.json
+    records how many rows are valid. Rows must arrive in open_time order. A row
+    with the same open_time as the last stored row replaces it, so the candle
+    that was still forming at the previous backfill gets its final values.
+    """
+
+    def __init__(self, path: str, initial_capacity: int = 1024):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+        meta = self._read_meta()
+        self._length = meta.get('length', 0)
+        self.revision = 0  # Bumped on every append so readers can cache derived arrays
+        self._capacity = max(meta.get('capacity', initial_capacity), self._length, 1)
+        self._columns: Dict[str, np.memmap] = self._open_columns(self._capacity)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        if self._length == 0:
+            return None
+        return int(self._columns['open_time'][self._length - 1])
+
+    def append(self, rows: Dict[str, np.ndarray]) -> int:
+        """Append rows (dict of equal-length column arrays); returns how many new rows were added"""
+        times = np.asarray(rows['open_time'], dtype=np.int64)
+        if len(times) == 0:
+            return 0
+
+        with self._lock:
+            start = 0
+            last = self.last_open_time
+            if last is not None:
+                # Skip rows we already have; overwrite the last (possibly still forming) candle
+                start = int(np.searchsorted(times, last, side='left'))
+                if start < len(times) and times[start] == last:
+                    for name in CANDLE_COLUMNS:
+                        self._columns[name][self._length - 1] = rows[name][start]
+                    start += 1
+
+            added = len(times) - start
+            if added > 0:
+                self._ensure_capacity(self._length + added)
+                end = self._length + added
+                for name, dtype in CANDLE_COLUMNS.items():
+                    self._columns[name][self._length:end] = np.asarray(rows[name][start:], dtype=dtype)
+                self._length = end
+
+            self.revision += 1
+            self._flush()
+            return added
+
+    def range(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Rows with start_ms <= open_time <= end_ms as zero-copy views into the mapped columns"""
+        length, columns = self._snapshot()
+        times = columns['open_time'][:length]
+        i = int(np.searchsorted(times, start_ms, side='left')) if start_ms is not None else 0
+        j = int(np.searchsorted(times, end_ms, side='right')) if end_ms is not None else length
+        return {name: column[i:j] for name, column in columns.items()}
+
+    def tail(self, count: int) -> Dict[str, np.ndarray]:
+        """The most recent count rows as zero-copy views"""
+        length, columns = self._snapshot()
+        i = max(0, length - count)
+        return {name: column[i:length] for name, column in columns.items()}
+
+    def _snapshot(self) -> Tuple[int, Dict[str, np.memmap]]:
+        """Length and columns for lock-free readers while append() runs in another thread"""
+        # Length first: append() swaps in grown columns before it raises the length,
+        # so the columns read after it always hold at least that many rows
+        length = self._length
+        return length, self._columns
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.path, 'meta.json')
+
+    def _read_meta(self) -> Dict:
+        try:
+            with open(self._meta_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _open_columns(self, capacity: int) -> Dict[str, np.memmap]:
+        columns = {}
+        for name, dtype in CANDLE_COLUMNS.items():
+            file_path = os.path.join(self.path, f"{name}.bin")
+            size = capacity * np.dtype(dtype).itemsize
+            if not os.path.exists(file_path) or os.path.getsize(file_path) < size:
+                with open(file_path, 'ab') as f:
+                    f.truncate(size)
+            columns[name] = np.memmap(file_path, dtype=dtype, mode='r+', shape=(capacity,))
+        return columns
+
+    def _ensure_capacity(self, needed: int):
+        if needed <= self._capacity:
+            return
+        for column in self._columns.values():
+            column.flush()
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        # Swapped in with one assignment so readers never see a partial set of columns;
+        # views handed out earlier keep the old mapping alive until they are released
+        self._columns = self._open_columns(capacity)
+        self._capacity = capacity
+
+    def _flush(self):
+        for column in self._columns.values():
+            column.flush()
+        tmp_path = f"{self._meta_path()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'length': self._length, 'capacity': self._capacity}, f)
+        os.replace(tmp_path, self._meta_path())
+
+
+class CandleStore:
+    """
+    Directory of CandleSeries laid out as <root>/<SYMBOL>/<interval>/.
+
+    backfill() fetches only the klines newer than what is already on disk, so
+    repeated runs cost one small klines request per series.
+    """
+
+    def __init__(self, root: str = 'candles'):
+        self.root = root
+        self._series: Dict[Tuple[str, str], CandleSeries] = {}
+        self._lock = threading.Lock()
+        self.backfill_requests = 0
+        self.rows_backfilled = 0
+        self.backfills_skipped = 0
+
+    def configure(self, root: Optional[str] = None):
+        if root is not None and root != self.root:
+            with self._lock:
+                self.root = root
+                self._series = {}
+
+    def series(self, symbol: str, interval: str) -> CandleSeries:
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Unsupported interval: {interval}")
+        key = (symbol, interval)
+        with self._lock:
+            if key not in self._series:
+                self._series[key] = CandleSeries(os.path.join(self.root, symbol, interval))
+            return self._series[key]
+
+    def find(self, symbol: str, interval: str) -> Optional[CandleSeries]:
+        """The series if it has been stored before, without creating it on disk"""
+        key = (symbol, interval)
+        if key not in self._series and not os.path.isdir(os.path.join(self.root, symbol, interval)):
+            return None
+        return self.series(symbol, interval)
+
+    def range(self, symbol: str, interval: str, start_ms: Optional[int] = None,
+              end_ms: Optional[int] = None) -> Dict[str, np.ndarray]:
+        return self.series(symbol, interval).range(start_ms, end_ms)
+
+    def tail(self, symbol: str, interval: str, count: int) -> Dict[str, np.ndarray]:
+        return self.series(symbol, interval).tail(count)
+
+    def append_klines(self, symbol: str, interval: str, klines: List[list]) -> int:
+        """Append REST-format kline rows"""
+        if not klines:
+            return 0
+        return self.series(symbol, interval).append(klines_to_columns(klines))
+
+    def backfill(self, binance_client, symbol: str, interval: str = '1m', lookback: int = 1000) -> int:
+        """Fetch klines newer than the last stored candle (or the last lookback candles if empty)"""
+        # Synthetic mock klines must never mix with the live history backtests and sweeps read
+        if getattr(binance_client, 'mock', False):
+            self.backfills_skipped += 1
+            return 0
+        step = INTERVAL_MS[interval]
+        series = self.series(symbol, interval)
+        last = series.last_open_time
+        # Start at the last stored candle so a candle that was still forming gets its final values
+        start = last if last is not None else int(time.time() * 1000) - lookback * step
+
+        added = 0
+        while True:
+            klines = binance_client.get_klines(symbol, interval, start_time=start, limit=KLINES_PAGE_LIMIT)
+            self.backfill_requests += 1
+            if not klines:
+                break
+            added += series.append(klines_to_columns(klines))
+            if len(klines) < KLINES_PAGE_LIMIT:
+                break
+            start = int(klines[-1][0]) + step
+
+        self.rows_backfilled += added
+        return added
+
+    def backfill_all(self, binance_client, symbols: List[str], interval: str = '1m') -> Dict[str, int]:
+        results = {}
+        for symbol in symbols:
+            try:
+                results[symbol] = self.backfill(binance_client, symbol, interval)
+            except Exception as e:
+                print(f"Error backfilling {symbol} {interval} candles: {e}")
+                results[symbol] = 0
+        return results
+
+    def stats(self) -> Dict:
+        return {
+            'root': self.root,
+            'series': {f"{symbol}:{interval}": len(s) for (symbol, interval), s in self._series.items()},
+            'backfill_requests': self.backfill_requests,
+            'rows_backfilled': self.rows_backfilled,
+            'backfills_skipped': self.backfills_skipped
+        }
+
+
+# Shared by the bot, the web API and offline tools in this process
+candle_store = CandleStore()
@@ -1,6 +1,7 @@
 import asyncio
+from typing import Optional
 from .config import Config
-from .binance_client import BinanceClient
+from .binance_client import BinanceClient, TOP_SYMBOLS
 from .signal_generator import SignalGenerator
 from .telegram_bot import TelegramBot
 
@@ -27,7 +28,7 @@ class CLI:
             print(f"  {item['symbol']}: ${item['price']}")
         
         print("\n💡 Generating Trading Signals...\n")
-        signal_gen = SignalGenerator(client)
+        signal_gen = SignalGenerator(client, seed=self.config.signal_seed)
         summary = signal_gen.get_trading_summary()
         print(summary)
 
@@ -38,10 +39,82 @@ class CLI:
 
     def run_signals(self):
         client = BinanceClient(mock=self.config.mock_mode)
-        signal_gen = SignalGenerator(client)
+        signal_gen = SignalGenerator(client, seed=self.config.signal_seed)
         summary = signal_gen.get_trading_summary()
         print(summary)
 
+    def run_backfill(self, symbol: Optional[str] = None, interval: str = '1m'):
+        from .candle_store import candle_store
+        candle_store.configure(root=self.config.candle_store_path)
+        client = BinanceClient(
+            api_key=self.config.binance_api_key,
+            api_secret=self.config.binance_api_secret,
+            mock=self.config.mock_mode
+        )
+        if client.mock:
+            print("❌ Backfill needs live Binance data - mock klines are not stored (set MOCK_MODE=false)")
+            return
+        symbols = [symbol.upper()] if symbol else TOP_SYMBOLS
+        print(f"🕯️ Backfilling {interval} candles into {self.config.candle_store_path}/ ...")
+        for name, added in candle_store.backfill_all(client, symbols, interval).items():
+            print(f"  {name}: +{added} candles ({len(candle_store.series(name, interval))} stored)")
+
+    def run_backtest(self, symbols: Optional[str] = None, days: Optional[float] = None):
+        from .backtest import BacktestParams, format_stats, load_history, run_backtest
+        from .candle_store import candle_store
+        from .scalping_signals import ScalpingSignalGenerator
+        candle_store.configure(root=self.config.candle_store_path)
+        names = [s.strip().upper() for s in symbols.split(',')] if symbols else TOP_SYMBOLS
+        history = load_history(names, '1m', days)
+        if not history:
+            print(f"❌ No 1m candles stored for {', '.join(names)} - run 'python main.py backfill' first")
+            return
+
+        params = BacktestParams.from_risk_params(ScalpingSignalGenerator(None).RISK_PARAMS)
+        bars = sum(len(candles['close']) for candles in history.values())
+        print(f"🧪 Backtesting scalping strategy on {bars:,} candles ({len(history)} symbols)...\n")
+        result = run_backtest(history, params)
+        for symbol, stats in result.symbol_stats.items():
+            print(f"  {symbol}: {stats['trades']} trades, win rate {stats['win_rate']:.1f}%, "
+                  f"P&L ${stats['total_pnl']:.2f}")
+        print(f"\n📊 Total over {result.stats['days']} days:")
+        print(format_stats(result.stats))
+
+    def run_sweep(self, symbols: Optional[str] = None, days: Optional[float] = None,
+                  output: str = 'sweep_results.csv', samples: Optional[int] = None):
+        from .backtest import BacktestParams, load_history
+        from .candle_store import candle_store
+        from .scalping_signals import ScalpingSignalGenerator
+        from .sweep import DEFAULT_SPACE, export_results, grid, random_search, run_sweep, symbol_sets, to_trading_config
+        candle_store.configure(root=self.config.candle_store_path)
+        names = [s.strip().upper() for s in symbols.split(',')] if symbols else TOP_SYMBOLS
+        history = load_history(names, '1m', days)
+        if not history:
+            print(f"❌ No 1m candles stored for {', '.join(names)} - run 'python main.py backfill' first")
+            return
+
+        space = dict(DEFAULT_SPACE, symbols=symbol_sets(list(history)))
+        if samples:
+            # Continuous ranges around the grid for random search
+            space.update(stop_loss_percent=(0.2, 1.5), take_profit_min=(0.3, 2.0),
+                         take_profit_max=(0.5, 4.0), min_confidence=(75, 95))
+            combinations = random_search(space, samples)
+        else:
+            combinations = grid(space)
+
+        params = BacktestParams.from_risk_params(ScalpingSignalGenerator(None).RISK_PARAMS)
+        print(f"🔬 Sweeping {len(combinations)} parameter sets over {len(history)} symbols...")
+        rows = run_sweep(history, combinations, params)
+        export_results(rows, output)
+
+        for row in rows[:5]:
+            print(f"  #{row['rank']}: SL {row['stop_loss_percent']}% TP {row['take_profit_min']}-"
+                  f"{row['take_profit_max']}% conf>={row['min_confidence']} [{row['symbols']}] -> "
+                  f"Sharpe {row['sharpe']:.2f}, P&L ${row['total_pnl']:.2f}, {row['trades']} trades")
+        if rows:
+            print(f"\n💡 Best as trading_config: {to_trading_config(rows[0])}")
+        print(f"📄 {len(rows)} results written to {output}")
+
     def run_telegram_bot(self):
         bot = TelegramBot(self.config)
         
@@ -64,6 +137,12 @@ COMMANDS:
     demo                Show demo with market data and signals
     price <SYMBOL>      Get current price for a symbol (e.g., BTCUSDT)
     signals             Generate trading signals
+    backfill [SYMBOL] [INTERVAL]
+                        Download new klines into the local candle store
+    backtest [SYMBOLS] [DAYS]
+                        Backtest the scalping strategy on stored 1m candles
+    sweep [SYMBOLS] [DAYS] [OUTPUT] [SAMPLES]
+                        Rank risk parameters by backtest (grid, or SAMPLES random sets)
     telegram            Start Telegram bot
     help                Show this help message
 
@@ -74,6 +153,7 @@ ENVIRONMENT VARIABLES:
     TELEGRAM_CHAT_ID        Your Telegram chat ID (optional)
     MOCK_MODE               Set to 'false' to use live APIs (default: true)
     PORT                    Web server port (default: 5000)
+    CANDLE_STORE_PATH       Local candle store directory (default: candles)
 
 EXAMPLES:
     python main.py              # Start web dashboard
@@ -81,6 +161,9 @@ EXAMPLES:
     python main.py demo
     python main.py price ETHUSDT
     python main.py signals
+    python main.py backfill BTCUSDT 5m
+    python main.py backtest BTCUSDT,ETHUSDT 30
+    python main.py sweep BTCUSDT,ETHUSDT 30 sweep.csv
     python main.py telegram
 
 For live trading, set the required API keys in your environment variables.
@@ -2,6 +2,8 @@ import os
 from dataclasses import dataclass
 from typing import Optional
 
+from .alert_thresholds import parse_symbol_thresholds
+
 
 @dataclass
 class Config:
@@ -11,10 +13,41 @@ class Config:
     telegram_chat_id: Optional[str] = None
     mock_mode: bool = False  # Default to REAL Binance API
     admin_user_ids: list = None
+    price_cache_ttl: float = 1.0  # Seconds an all-tickers snapshot is served as fresh
+    price_cache_stale_ttl: float = 5.0  # Extra seconds served stale while refreshing
+    market_stream_enabled: bool = True  # Push price alerts from the WebSocket feed
+    market_stream_url: Optional[str] = None  # Override the Binance mini-ticker stream URL
+    http_pool_size: int = 20  # Keep-alive connections kept per host pool
+    http_per_host_limit: int = 8  # Concurrent outbound requests allowed per host
+    http_dns_cache_ttl: float = 300.0  # Seconds to reuse resolved addresses (0 disables)
+    binance_weight_limit: int = 6000  # Binance REST request weight allowed per minute
+    exchange_info_cache_path: str = 'exchange_info_cache.json'  # Symbol filters persisted for cold start
+    exchange_info_refresh_hours: float = 6.0  # How often symbol filters are reloaded
+    candle_store_path: str = 'candles'  # Directory for memory-mapped kline history
+    mock_replay: Optional[str] = None  # Tick replay in mock mode: JSONL path, 'random_walk', 'jumps' or 'flat'
+    mock_replay_speed: float = 1.0  # Replay speed multiplier (0 = advance only when stepped)
+    mock_replay_seed: int = 42  # Seed for synthetic tick generators
+    tick_record_path: Optional[str] = None  # Append live prices to this JSONL file for later replay
+    indicator_state_path: Optional[str] = 'indicator_state.json'  # Streaming indicator snapshot kept across restarts
+    signal_seed: Optional[int] = None  # Seed simulated signal values so the same prices give identical signals
+    alert_sigma: float = 2.0  # Price alerts need a move of this many recent standard deviations (0 = floor only)
+    alert_min_change_percent: float = 0.05  # Smallest move in percent that can trigger a price alert
+    alert_symbol_thresholds: dict = None  # Fixed alert moves in percent per symbol, replacing the adaptive band
+    alert_digest_seconds: int = 0  # Default window for merging a user's alerts into one message (0 = instant)
+    telegram_rate_limit: float = 30.0  # Messages per second across all chats (Telegram bot limit)
+    telegram_per_chat_interval: float = 1.0  # Minimum seconds between messages to one chat
+    telegram_fanout_concurrency: int = 20  # Messages in flight at once during a broadcast wave
+    subscriber_reconcile_interval: float = 600.0  # Seconds between full reloads of the in-memory alert roster
+    outbox_enabled: bool = True  # Queue notifications durably before sending (survives restarts)
+    outbox_path: str = 'outbox.db'  # SQLite queue file used when DATABASE_URL is not set
+    outbox_workers: int = 1  # Sender tasks draining the queue in this process
+    outbox_visibility_timeout: float = 60.0  # Seconds a claimed message stays hidden from other senders
     
     def __post_init__(self):
         if self.admin_user_ids is None:
             self.admin_user_ids = []
+        if self.alert_symbol_thresholds is None:
+            self.alert_symbol_thresholds = {}
 
     @classmethod
     def from_env(cls) -> 'Config':
@@ -28,7 +61,36 @@ class Config:
             telegram_bot_token=os.getenv('TELEGRAM_BOT_TOKEN'),
             telegram_chat_id=os.getenv('TELEGRAM_CHAT_ID'),
             mock_mode=os.getenv('MOCK_MODE', 'false').lower() == 'true',  # Default to REAL API
-            admin_user_ids=admin_user_ids
+            admin_user_ids=admin_user_ids,
+            price_cache_ttl=float(os.getenv('PRICE_CACHE_TTL', '1.0')),
+            price_cache_stale_ttl=float(os.getenv('PRICE_CACHE_STALE_TTL', '5.0')),
+            market_stream_enabled=os.getenv('MARKET_STREAM', 'true').lower() == 'true',
+            market_stream_url=os.getenv('MARKET_STREAM_URL'),
+            http_pool_size=int(os.getenv('HTTP_POOL_SIZE', '20')),
+            http_per_host_limit=int(os.getenv('HTTP_PER_HOST_LIMIT', '8')),
+            http_dns_cache_ttl=float(os.getenv('HTTP_DNS_CACHE_TTL', '300')),
+            binance_weight_limit=int(os.getenv('BINANCE_WEIGHT_LIMIT', '6000')),
+            exchange_info_cache_path=os.getenv('EXCHANGE_INFO_CACHE', 'exchange_info_cache.json'),
+            exchange_info_refresh_hours=float(os.getenv('EXCHANGE_INFO_REFRESH_HOURS', '6')),
+            candle_store_path=os.getenv('CANDLE_STORE_PATH', 'candles'),
+            mock_replay=os.getenv('MOCK_REPLAY') or None,
+            mock_replay_speed=float(os.getenv('MOCK_REPLAY_SPEED', '1.0')),
+            mock_replay_seed=int(os.getenv('MOCK_REPLAY_SEED', '42')),
+            tick_record_path=os.getenv('TICK_RECORD_PATH') or None,
+            indicator_state_path=os.getenv('INDICATOR_STATE_PATH', 'indicator_state.json') or None,
+            signal_seed=int(os.getenv('SIGNAL_SEED')) if os.getenv('SIGNAL_SEED') else None,
+            alert_sigma=float(os.getenv('ALERT_SIGMA', '2.0')),
+            alert_min_change_percent=float(os.getenv('ALERT_MIN_CHANGE_PERCENT', '0.05')),
+            alert_symbol_thresholds=parse_symbol_thresholds(os.getenv('ALERT_SYMBOL_THRESHOLDS', '')),
+            alert_digest_seconds=int(os.getenv('ALERT_DIGEST_SECONDS', '0')),
+            telegram_rate_limit=float(os.getenv('TELEGRAM_RATE_LIMIT', '30')),
+            telegram_per_chat_interval=float(os.getenv('TELEGRAM_PER_CHAT_INTERVAL', '1.0')),
+            telegram_fanout_concurrency=int(os.getenv('TELEGRAM_FANOUT_CONCURRENCY', '20')),
+            subscriber_reconcile_interval=float(os.getenv('SUBSCRIBER_RECONCILE_INTERVAL', '600')),
+            outbox_enabled=os.getenv('OUTBOX_ENABLED', 'true').lower() == 'true',
+            outbox_path=os.getenv('OUTBOX_PATH', 'outbox.db'),
+            outbox_workers=int(os.getenv('OUTBOX_WORKERS', '1')),
+            outbox_visibility_timeout=float(os.getenv('OUTBOX_VISIBILITY_TIMEOUT', '60'))
         )
 
     def validate_binance(self) -> bool:
@@ -1,9 +1,11 @@
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from typing import Dict, List, Optional
+from psycopg2.extras import RealDictCursor, execute_values
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 import os
 
+from .outbound import OutboundMessage
+
 
 class Database:
     def __init__(self):
@@ -78,6 +80,16 @@ class Database:
             )
         """)
         
+        # Per-user alert digest window in seconds (NULL = ALERT_DIGEST_SECONDS, 0 = instant)
+        cur.execute("""
+            ALTER TABLE users ADD COLUMN IF NOT EXISTS alert_digest_seconds INTEGER
+        """)
+        
+        # Per-user minimum price move for alerts (NULL = the adaptive symbol band)
+        cur.execute("""
+            ALTER TABLE trading_config ADD COLUMN IF NOT EXISTS alert_change_percent DECIMAL(6, 3)
+        """)
+        
         cur.execute("""
             CREATE INDEX IF NOT EXISTS idx_trade_history_user_id ON trade_history(user_id)
         """)
@@ -86,6 +98,28 @@ class Database:
             CREATE INDEX IF NOT EXISTS idx_trade_history_executed_at ON trade_history(executed_at DESC)
         """)
         
+        # Durable outbound Telegram queue (see outbox.py)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS outbound_messages (
+                id BIGSERIAL PRIMARY KEY,
+                dedupe_key VARCHAR(255) UNIQUE NOT NULL,
+                chat_id BIGINT NOT NULL,
+                payload TEXT NOT NULL,
+                priority SMALLINT DEFAULT 9,
+                status VARCHAR(10) DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                available_at TIMESTAMP DEFAULT NOW(),
+                expires_at TIMESTAMP,
+                created_at TIMESTAMP DEFAULT NOW(),
+                sent_at TIMESTAMP,
+                last_error TEXT
+            )
+        """)
+        
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_outbound_ready ON outbound_messages(status, priority, available_at)
+        """)
+        
         conn.commit()
         cur.close()
         conn.close()
@@ -114,10 +148,12 @@ class Database:
         auto_trading = settings.get('auto_trading', False)
         timezone = settings.get('timezone', 'UTC')
         last_activity = settings.get('last_activity', datetime.now())
+        alert_digest_seconds = settings.get('alert_digest_seconds')  # Kept as stored when not given
         
         cur.execute("""
-            INSERT INTO users (user_id, username, language, auto_signals, auto_trading, timezone, last_activity, last_updated)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            INSERT INTO users (user_id, username, language, auto_signals, auto_trading, timezone, last_activity, last_updated,
+                               alert_digest_seconds)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
             ON CONFLICT (user_id) DO UPDATE SET
                 username = EXCLUDED.username,
                 language = EXCLUDED.language,
@@ -125,8 +161,10 @@ class Database:
                 auto_trading = EXCLUDED.auto_trading,
                 timezone = EXCLUDED.timezone,
                 last_activity = EXCLUDED.last_activity,
-                last_updated = EXCLUDED.last_updated
-        """, (user_id, username, language, auto_signals, auto_trading, timezone, last_activity, datetime.now()))
+                last_updated = EXCLUDED.last_updated,
+                alert_digest_seconds = COALESCE(EXCLUDED.alert_digest_seconds, users.alert_digest_seconds)
+        """, (user_id, username, language, auto_signals, auto_trading, timezone, last_activity, datetime.now(),
+              alert_digest_seconds))
         
         conn.commit()
         cur.close()
@@ -265,6 +303,22 @@ class Database:
         
         return dict(config) if config else None
     
+    def get_trading_configs(self, user_ids: Optional[List[int]] = None) -> Dict[int, Dict]:
+        """Stored trading configurations keyed by user_id, for all users or just user_ids (users without a row are omitted)"""
+        conn = self.get_connection()
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        
+        if user_ids is None:
+            cur.execute("SELECT * FROM trading_config")
+        else:
+            cur.execute("SELECT * FROM trading_config WHERE user_id = ANY(%s)", (list(user_ids),))
+        configs = cur.fetchall()
+        
+        cur.close()
+        conn.close()
+        
+        return {config['user_id']: dict(config) for config in configs}
+    
     def update_trading_config(self, user_id: int, config: Dict):
         """Update user's trading configuration"""
         conn = self.get_connection()
@@ -272,14 +326,16 @@ class Database:
         
         cur.execute("""
             INSERT INTO trading_config 
-            (user_id, max_trade_amount_usdt, stop_loss_percent, take_profit_percent, min_confidence, enabled_symbols, updated_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            (user_id, max_trade_amount_usdt, stop_loss_percent, take_profit_percent, min_confidence, enabled_symbols,
+             alert_change_percent, updated_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
             ON CONFLICT (user_id) DO UPDATE SET
                 max_trade_amount_usdt = EXCLUDED.max_trade_amount_usdt,
                 stop_loss_percent = EXCLUDED.stop_loss_percent,
                 take_profit_percent = EXCLUDED.take_profit_percent,
                 min_confidence = EXCLUDED.min_confidence,
                 enabled_symbols = EXCLUDED.enabled_symbols,
+                alert_change_percent = EXCLUDED.alert_change_percent,
                 updated_at = EXCLUDED.updated_at
         """, (
             user_id,
@@ -288,6 +344,7 @@ class Database:
             config.get('take_profit_percent', 1.50),
             config.get('min_confidence', 75.00),
             config.get('enabled_symbols', 'BTCUSDT,ETHUSDT,BNBUSDT,SOLUSDT,XRPUSDT'),
+            config.get('alert_change_percent'),
             datetime.now()
         ))
         
@@ -346,3 +403,128 @@ class Database:
         conn.commit()
         cur.close()
         conn.close()
+    
+    def enqueue_outbound(self, messages: Sequence[OutboundMessage]) -> int:
+        """Queue messages with one multi-row INSERT; rows whose dedupe_key exists are skipped"""
+        if not messages:
+            return 0
+        conn = self.get_connection()
+        cur = conn.cursor()
+        
+        rows = execute_values(cur, """
+            INSERT INTO outbound_messages (dedupe_key, chat_id, payload, priority, expires_at)
+            VALUES %s
+            ON CONFLICT (dedupe_key) DO NOTHING
+            RETURNING id
+        """, [
+            (m.dedupe_key, m.chat_id, m.payload, m.priority, m.expires_in)
+            for m in messages
+        ], template="(%s, %s, %s, %s, NOW() + %s * INTERVAL '1 second')", page_size=len(messages), fetch=True)
+        
+        conn.commit()
+        cur.close()
+        conn.close()
+        
+        return len(rows)
+    
+    def claim_outbound(self, limit: int, visibility_timeout: float) -> List[OutboundMessage]:
+        """Take up to limit ready messages, hidden from other senders for visibility_timeout seconds"""
+        conn = self.get_connection()
+        cur = conn.cursor()
+        
+        # SKIP LOCKED lets concurrent senders claim disjoint batches without waiting on each other
+        cur.execute("""
+            UPDATE outbound_messages
+            SET available_at = NOW() + %s * INTERVAL '1 second', attempts = attempts + 1
+            WHERE id IN (
+                SELECT id FROM outbound_messages
+                WHERE status = 'pending' AND available_at <= NOW()
+                AND (expires_at IS NULL OR expires_at > NOW())
+                ORDER BY priority, id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, dedupe_key, chat_id, payload, priority, attempts
+        """, (visibility_timeout, limit))
+        
+        rows = cur.fetchall()
+        
+        conn.commit()
+        cur.close()
+        conn.close()
+        
+        messages = [
+            OutboundMessage(chat_id, payload, key, priority, id=message_id, attempts=attempts)
+            for message_id, key, chat_id, payload, priority, attempts in rows
+        ]
+        messages.sort(key=lambda m: (m.priority, m.id))
+        return messages
+    
+    def ack_outbound(self, ids: Sequence[int]):
+        """Mark delivered messages as sent"""
+        if not ids:
+            return
+        conn = self.get_connection()
+        cur = conn.cursor()
+        
+        cur.execute("""
+            UPDATE outbound_messages
+            SET status = 'sent', sent_at = NOW()
+            WHERE id = ANY(%s)
+        """, (list(ids),))
+        
+        conn.commit()
+        cur.close()
+        conn.close()
+    
+    def fail_outbound(self, failures: Sequence[Tuple[int, str, Optional[float]]]):
+        """(id, error, retry delay) per message; a None delay marks it failed for good"""
+        if not failures:
+            return
+        conn = self.get_connection()
+        cur = conn.cursor()
+        
+        execute_values(cur, """
+            UPDATE outbound_messages AS o
+            SET status = CASE WHEN f.delay IS NULL THEN 'failed' ELSE o.status END,
+                available_at = CASE WHEN f.delay IS NULL THEN o.available_at
+                                    ELSE NOW() + f.delay * INTERVAL '1 second' END,
+                last_error = f.error
+            FROM (VALUES %s) AS f(id, error, delay)
+            WHERE o.id = f.id
+        """, list(failures), template="(%s::BIGINT, %s::TEXT, %s::DOUBLE PRECISION)", page_size=len(failures))
+        
+        conn.commit()
+        cur.close()
+        conn.close()
+    
+    def outbound_stats(self) -> Dict[str, int]:
+        """Queued message counts by status"""
+        conn = self.get_connection()
+        cur = conn.cursor()
+        
+        cur.execute("SELECT status, COUNT(*) FROM outbound_messages GROUP BY status")
+        rows = cur.fetchall()
+        
+        cur.close()
+        conn.close()
+        
+        return dict(rows)
+    
+    def purge_outbound(self, days: float = 7.0) -> int:
+        """Delete finished messages older than days, and pending ones that expired"""
+        conn = self.get_connection()
+        cur = conn.cursor()
+        
+        cur.execute("""
+            DELETE FROM outbound_messages
+            WHERE (status != 'pending' AND created_at < NOW() - INTERVAL '1 day' * %s)
+            OR (status = 'pending' AND expires_at <= NOW())
+        """, (days,))
+        deleted = cur.rowcount
+        
+        conn.commit()
+        cur.close()
+        conn.close()
+        
+        return deleted
@@ -0,0 +1,227 @@
+"""
+Symbol Filter Cache for MeMo Bot Pro
+Exchange-info LOT_SIZE / PRICE_FILTER / MIN_NOTIONAL rules for sizing orders before they are sent
+"""
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_DOWN
+from typing import Dict, Optional
+
+
+EXCHANGE_INFO_CACHE_FILE = 'exchange_info_cache.json'
+
+
+class OrderSizeError(ValueError):
+    """Raised when an order cannot be sized to satisfy the symbol's filters"""
+
+
+def floor_to_step(value, step: Decimal) -> Decimal:
+    """Round a quantity or price down to a multiple of step"""
+    value = Decimal(str(value))
+    if step <= 0:
+        return value
+    return (value / step).to_integral_value(rounding=ROUND_DOWN) * step
+
+
+@dataclass
+class SymbolFilters:
+    """Trading rules for one symbol, parsed from an exchange-info entry"""
+    symbol: str
+    base_asset: str
+    quote_asset: str
+    status: str = 'TRADING'
+    step_size: Decimal = Decimal('0')
+    min_qty: Decimal = Decimal('0')
+    max_qty: Decimal = Decimal('0')
+    tick_size: Decimal = Decimal('0')
+    min_notional: Decimal = Decimal('0')
+    quote_precision: int = 8
+
+    @classmethod
+    def from_symbol_info(cls, info: Dict) -> 'SymbolFilters':
+        filters = {f['filterType']: f for f in info.get('filters', [])}
+        lot = filters.get('LOT_SIZE', {})
+        price = filters.get('PRICE_FILTER', {})
+        # Binance replaced MIN_NOTIONAL with NOTIONAL on most spot symbols
+        notional = filters.get('NOTIONAL') or filters.get('MIN_NOTIONAL') or {}
+        return cls(
+            symbol=info['symbol'],
+            base_asset=info.get('baseAsset', ''),
+            quote_asset=info.get('quoteAsset', ''),
+            status=info.get('status', 'TRADING'),
+            step_size=Decimal(lot.get('stepSize', '0')).normalize(),
+            min_qty=Decimal(lot.get('minQty', '0')),
+            max_qty=Decimal(lot.get('maxQty', '0')),
+            tick_size=Decimal(price.get('tickSize', '0')).normalize(),
+            min_notional=Decimal(notional.get('minNotional', '0')),
+            quote_precision=int(info.get('quoteAssetPrecision', info.get('quotePrecision', 8)))
+        )
+
+    def round_quantity(self, quantity) -> Decimal:
+        return floor_to_step(quantity, self.step_size)
+
+    def round_quote(self, amount) -> Decimal:
+        return floor_to_step(amount, Decimal(1).scaleb(-self.quote_precision))
+
+    def check(self, quantity: Decimal, price) -> Optional[str]:
+        """Return why an order of quantity at price would be rejected, or None if it is valid"""
+        if self.status != 'TRADING':
+            return f"{self.symbol} is not trading ({self.status})"
+        if quantity <= 0 or quantity < self.min_qty:
+            return f"Quantity below minimum {self.min_qty} for {self.symbol}"
+        if self.max_qty and quantity > self.max_qty:
+            return f"Quantity above maximum {self.max_qty} for {self.symbol}"
+        if price and quantity * Decimal(str(price)) < self.min_notional:
+            return f"Order value below minimum {self.min_notional} {self.quote_asset} for {self.symbol}"
+        return None
+
+    def to_dict(self) -> Dict:
+        return {
+            'symbol': self.symbol,
+            'baseAsset': self.base_asset,
+            'quoteAsset': self.quote_asset,
+            'status': self.status,
+            'quoteAssetPrecision': self.quote_precision,
+            'filters': [
+                {'filterType': 'LOT_SIZE', 'stepSize': str(self.step_size),
+                 'minQty': str(self.min_qty), 'maxQty': str(self.max_qty)},
+                {'filterType': 'PRICE_FILTER', 'tickSize': str(self.tick_size)},
+                {'filterType': 'NOTIONAL', 'minNotional': str(self.min_notional)}
+            ]
+        }
+
+
+class SymbolFilterIndex:
+    """
+    Process-wide symbol -> SymbolFilters index.
+
+    Loaded once from exchange info and refreshed after refresh_interval. Every
+    successful load is written to cache_path so a restart can size orders
+    immediately, before the first exchange-info call completes.
+    """
+
+    def __init__(self, cache_path: str = EXCHANGE_INFO_CACHE_FILE, refresh_interval: float = 6 * 3600):
+        self.cache_path = cache_path
+        self.refresh_interval = refresh_interval
+        self._filters: Dict[str, SymbolFilters] = {}
+        self._loaded_at = 0.0
+        self._disk_checked = False
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def configure(self, cache_path: Optional[str] = None, refresh_interval: Optional[float] = None):
+        if cache_path is not None and cache_path != self.cache_path:
+            self.cache_path = cache_path
+            self._disk_checked = False
+        if refresh_interval is not None:
+            self.refresh_interval = refresh_interval
+
+    def needs_refresh(self) -> bool:
+        self._load_from_disk()
+        now = time.time()
+        if now < self._retry_at:
+            return False
+        return not self._filters or now - self._loaded_at > self.refresh_interval
+
+    def update(self, exchange_info: Dict, persist: bool = True):
+        """Replace the index from a get_exchange_info() response and persist it"""
+        filters = {}
+        for info in exchange_info.get('symbols', []):
+            entry = SymbolFilters.from_symbol_info(info)
+            filters[entry.symbol] = entry
+
+        with self._lock:
+            self._filters = filters
+            self._loaded_at = time.time()
+            self.refreshes += 1
+        if persist:
+            self._save_to_disk()
+
+    def refresh_failed(self, error: Exception, retry_in: float = 60.0):
+        self.refresh_errors += 1
+        self._retry_at = time.time() + retry_in
+        if self._filters:
+            print(f"⚠️ Exchange info refresh failed, keeping cached filters: {error}")
+        else:
+            print(f"❌ Exchange info unavailable, orders will be sent unsized: {error}")
+
+    def get(self, symbol: str) -> Optional[SymbolFilters]:
+        self._load_from_disk()
+        return self._filters.get(symbol)
+
+    def size_order(self, symbol: str, quantity, price=None) -> Decimal:
+        """Round quantity down to the symbol's step and validate it, raising OrderSizeError"""
+        filters = self.get(symbol)
+        if filters is None:
+            return Decimal(str(quantity))
+        rounded = filters.round_quantity(quantity)
+        error = filters.check(rounded, price)
+        if error:
+            raise OrderSizeError(error)
+        return rounded
+
+    def size_quote_order(self, symbol: str, quote_amount) -> Decimal:
+        """Round a quoteOrderQty to the quote precision and check the minimum notional"""
+        filters = self.get(symbol)
+        if filters is None:
+            return Decimal(str(quote_amount))
+        rounded = filters.round_quote(quote_amount)
+        if filters.status != 'TRADING':
+            raise OrderSizeError(f"{symbol} is not trading ({filters.status})")
+        if rounded < filters.min_notional:
+            raise OrderSizeError(
+                f"Order value below minimum {filters.min_notional} {filters.quote_asset} for {symbol}"
+            )
+        return rounded
+
+    def stats(self) -> Dict:
+        return {
+            'symbols': len(self._filters),
+            'age': round(time.time() - self._loaded_at, 1) if self._loaded_at else None,
+            'refresh_interval': self.refresh_interval,
+            'refreshes': self.refreshes,
+            'refresh_errors': self.refresh_errors,
+            'cache_path': self.cache_path
+        }
+
+    def _load_from_disk(self):
+        if self._disk_checked:
+            return
+        with self._lock:
+            if self._disk_checked:
+                return
+            self._disk_checked = True
+            if self._filters or not os.path.exists(self.cache_path):
+                return
+            try:
+                with open(self.cache_path) as f:
+                    data = json.load(f)
+                self._filters = {
+                    info['symbol']: SymbolFilters.from_symbol_info(info)
+                    for info in data.get('symbols', [])
+                }
+                self._loaded_at = data.get('saved_at', 0.0)
+            except Exception as e:
+                print(f"Error loading exchange info cache: {e}")
+
+    def _save_to_disk(self):
+        data = {
+            'saved_at': self._loaded_at,
+            'symbols': [f.to_dict() for f in self._filters.values()]
+        }
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            print(f"Error saving exchange info cache: {e}")
+
+
+# Shared by every BinanceClient in the process
+symbol_filters = SymbolFilterIndex()
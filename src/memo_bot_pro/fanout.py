@@ -0,0 +1,172 @@
+"""
+Notification Fanout for MeMo Bot Pro
+Concurrent Telegram delivery within the global bot rate limit and per-chat pacing
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from telegram.error import RetryAfter
+
+
+class TokenBucket:
+    """Async token bucket; pause() stops all acquirers, e.g. for a 429 retry_after"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def pause(self, seconds: float):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class FanoutResult:
+    sent: int = 0
+    failed: int = 0
+    retried: int = 0
+    elapsed: float = 0.0
+    delivered: List[int] = field(default_factory=list)
+    queued: int = 0  # Handed to the outbound queue instead of sent directly
+
+
+class NotificationFanout:
+    """
+    Delivers a wave of messages with bounded concurrency.
+
+    Every send takes a token from one bucket refilled at Telegram's bot-wide
+    rate (~30 msg/s), and each chat gets at most one message per
+    per_chat_interval. A 429 pauses the whole bucket for its retry_after
+    before the message is retried, since the limit it reports is bot-wide.
+    A wave of N messages therefore takes about N / rate seconds instead of
+    the sum of per-message round trips and sleeps.
+    """
+
+    def __init__(self, rate: float = 30.0, per_chat_interval: float = 1.0,
+                 concurrency: int = 20, max_retries: int = 3):
+        self.bucket = TokenBucket(rate)
+        self.per_chat_interval = per_chat_interval
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self._chat_next: Dict[int, float] = {}
+        self.sent = 0
+        self.failed = 0
+        self.retry_after_count = 0
+        self.waves = 0
+
+    def configure(self, rate: Optional[float] = None, per_chat_interval: Optional[float] = None,
+                  concurrency: Optional[int] = None, max_retries: Optional[int] = None):
+        if rate is not None:
+            self.bucket.rate = rate
+        if per_chat_interval is not None:
+            self.per_chat_interval = per_chat_interval
+        if concurrency is not None:
+            self.concurrency = max(1, concurrency)
+        if max_retries is not None:
+            self.max_retries = max_retries
+
+    async def send(self, bot, chat_id: int, **kwargs) -> Tuple[bool, int]:
+        """Send one message within the limits; returns (delivered, retries)"""
+        retries = 0
+        while True:
+            await self._wait_for_chat(chat_id)
+            await self.bucket.acquire()
+            try:
+                await bot.send_message(chat_id=chat_id, **kwargs)
+                self.sent += 1
+                return True, retries
+            except RetryAfter as e:
+                self.retry_after_count += 1
+                wait = e.retry_after.total_seconds() if isinstance(e.retry_after, timedelta) else float(e.retry_after)
+                self.bucket.pause(wait)
+                if retries >= self.max_retries:
+                    raise
+                retries += 1
+
+    async def deliver(self, bot, messages: Iterable[Tuple],
+                      on_sent: Optional[Callable[[Tuple], None]] = None,
+                      on_failed: Optional[Callable[[Tuple, Exception], None]] = None,
+                      label: str = 'message') -> FanoutResult:
+        """
+        Send (chat_id, send_message kwargs, ...) items concurrently. on_sent(item)
+        and on_failed(item, error) are called per item; extra tuple entries are
+        passed through for the callbacks.
+        """
+        started = time.monotonic()
+        result = FanoutResult()
+        queue: asyncio.Queue = asyncio.Queue()
+        for message in messages:
+            queue.put_nowait(message)
+
+        async def worker():
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                chat_id, kwargs = item[0], item[1]
+                try:
+                    _, retries = await self.send(bot, chat_id, **kwargs)
+                    result.sent += 1
+                    result.retried += retries
+                    result.delivered.append(chat_id)
+                    if on_sent:
+                        on_sent(item)
+                except Exception as e:
+                    self.failed += 1
+                    result.failed += 1
+                    print(f"❌ Error sending {label} to user {chat_id}: {e}")
+                    if on_failed:
+                        on_failed(item, e)
+
+        workers = min(self.concurrency, queue.qsize())
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        self.waves += 1
+        self._prune_chats()
+        result.elapsed = time.monotonic() - started
+        return result
+
+    def stats(self) -> Dict:
+        return {
+            'rate': self.bucket.rate,
+            'per_chat_interval': self.per_chat_interval,
+            'concurrency': self.concurrency,
+            'waves': self.waves,
+            'sent': self.sent,
+            'failed': self.failed,
+            'retry_after': self.retry_after_count
+        }
+
+    async def _wait_for_chat(self, chat_id: int):
+        now = time.monotonic()
+        ready = self._chat_next.get(chat_id, 0.0)
+        # Reserve the next slot before sleeping so concurrent sends to one chat queue up
+        self._chat_next[chat_id] = max(now, ready) + self.per_chat_interval
+        if ready > now:
+            await asyncio.sleep(ready - now)
+
+    def _prune_chats(self):
+        now = time.monotonic()
+        self._chat_next = {chat: ready for chat, ready in self._chat_next.items() if ready > now}
+
+
+# One budget for every sender in the process - Telegram's limit is per bot token
+fanout = NotificationFanout()
@@ -0,0 +1,255 @@
+"""
+Shared HTTP Transport for MeMo Bot Pro
+Pooled keep-alive connections, DNS caching, per-host limits and timeouts for outbound calls
+"""
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+
+class DNSCache:
+    """
+    TTL cache of resolved addresses for connections opened by PooledAdapter.
+
+    Only the adapter's own connection pools use it; the process-wide
+    resolver (and with it database, Telegram and websocket clients) is
+    left alone.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        """Addresses for host in resolver order, from the cache while fresh"""
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] < self.ttl:
+                self.hits += 1
+                return entry[1]
+        infos = socket.getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (now, addresses)
+        return addresses
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        return {
+            'ttl': self.ttl,
+            'enabled': self.enabled,
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+class _CachedDNSConnection:
+    """Connection mixin that connects to cached addresses; TLS still verifies the original host name"""
+    dns_cache: DNSCache = None
+
+    def _new_conn(self):
+        if self.dns_cache is None or not self.dns_cache.enabled:
+            return super()._new_conn()
+        host = self._dns_host
+        try:
+            addresses = self.dns_cache.resolve(host, self.port)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        error = None
+        for address in addresses:
+            self._dns_host = address
+            try:
+                return super()._new_conn()
+            except (NewConnectionError, ConnectTimeoutError) as e:
+                error = e
+            finally:
+                self._dns_host = host
+        raise error
+
+
+def _cached_pool_classes(dns_cache: DNSCache) -> Dict[str, type]:
+    """Connection pool classes for http/https whose connections resolve through dns_cache"""
+    classes = {}
+    for scheme, pool_cls, conn_cls in (('http', HTTPConnectionPool, HTTPConnection),
+                                       ('https', HTTPSConnectionPool, HTTPSConnection)):
+        connection = type(conn_cls.__name__, (_CachedDNSConnection, conn_cls), {'dns_cache': dns_cache})
+        classes[scheme] = type(pool_cls.__name__, (pool_cls,), {'ConnectionCls': connection})
+    return classes
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter that applies default timeouts, caps concurrent requests per host and caches DNS"""
+
+    def __init__(self, per_host_limit: int = 8, timeout: Tuple[float, float] = (3.05, 10.0),
+                 dns_cache: Optional[DNSCache] = None, **kwargs):
+        self.per_host_limit = per_host_limit
+        self.default_timeout = timeout
+        self.dns_cache = dns_cache
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._slots_lock = threading.Lock()
+        self.requests_sent = 0
+        self.errors = 0
+        self.waited = 0
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        if self.dns_cache is not None:
+            self.poolmanager.pool_classes_by_scheme = _cached_pool_classes(self.dns_cache)
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def send(self, request, timeout=None, **kwargs):
+        slot = self._host_slot(urlsplit(request.url).netloc)
+        if not slot.acquire(blocking=False):
+            self.waited += 1
+            slot.acquire()
+        try:
+            self.requests_sent += 1
+            return super().send(request, timeout=timeout or self.default_timeout, **kwargs)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            slot.release()
+
+
+class HttpTransport:
+    """
+    Process-wide outbound HTTP layer.
+
+    Sync callers share one requests.Session (and can mount the tuned adapter on
+    third-party sessions such as python-binance's). Async callers get aiohttp
+    connectors with matching pool, per-host and DNS cache settings.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 20, per_host_limit: int = 8,
+                 connect_timeout: float = 3.05, read_timeout: float = 10.0,
+                 keepalive_timeout: float = 60.0, dns_cache_ttl: float = 300.0):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.per_host_limit = per_host_limit
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache = DNSCache(ttl=dns_cache_ttl)
+        self._build()
+
+    def _build(self):
+        self.adapter = PooledAdapter(
+            per_host_limit=self.per_host_limit,
+            timeout=self.timeout,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            dns_cache=self.dns_cache
+        )
+        self.session = requests.Session()
+        self.mount(self.session)
+
+    def configure(self, pool_maxsize: Optional[int] = None, per_host_limit: Optional[int] = None,
+                  dns_cache_ttl: Optional[float] = None):
+        """Apply startup settings; call before clients mount the adapter"""
+        changed = False
+        if pool_maxsize is not None and pool_maxsize != self.pool_maxsize:
+            self.pool_maxsize = pool_maxsize
+            changed = True
+        if per_host_limit is not None and per_host_limit != self.per_host_limit:
+            self.per_host_limit = per_host_limit
+            changed = True
+        if dns_cache_ttl is not None:
+            self.dns_cache.ttl = dns_cache_ttl
+            self.dns_cache.clear()
+        if changed:
+            self._build()
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+    def mount(self, session: requests.Session) -> requests.Session:
+        session.mount('https://', self.adapter)
+        session.mount('http://', self.adapter)
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def aiohttp_connector(self):
+        """Create a tuned aiohttp connector; must be called inside the running event loop"""
+        import aiohttp
+        return aiohttp.TCPConnector(
+            limit=self.pool_maxsize,
+            limit_per_host=self.per_host_limit,
+            ttl_dns_cache=int(self.dns_cache.ttl) if self.dns_cache.ttl > 0 else None,
+            keepalive_timeout=self.keepalive_timeout
+        )
+
+    def aiohttp_session_params(self) -> Dict:
+        """Session kwargs for python-binance's AsyncClient.create(session_params=...)"""
+        import aiohttp
+        return {
+            'connector': self.aiohttp_connector(),
+            'timeout': aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+        }
+
+    def stats(self) -> Dict:
+        pools = []
+        manager = self.adapter.poolmanager
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            if pool is None:
+                continue
+            pools.append({
+                'host': f"{pool.scheme}://{pool.host}:{pool.port}",
+                'connections_opened': pool.num_connections,
+                'requests': pool.num_requests,
+                'reuse_ratio': 1 - pool.num_connections / pool.num_requests if pool.num_requests else 0.0
+            })
+
+        return {
+            'pool_maxsize': self.pool_maxsize,
+            'per_host_limit': self.per_host_limit,
+            'timeout': list(self.timeout),
+            'requests': self.adapter.requests_sent,
+            'errors': self.adapter.errors,
+            'waited_for_host_slot': self.adapter.waited,
+            'pools': pools,
+            'dns_cache': self.dns_cache.stats()
+        }
+
+
+# Shared by the Binance client, health monitor and heartbeat sender
+shared_transport = HttpTransport()
@@ -0,0 +1,297 @@
+"""
+Technical Indicators for MeMo Bot Pro
+NumPy-vectorised SMA/EMA/RSI/MACD/ATR/Bollinger/volatility over a symbols x time price matrix
+"""
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .candle_store import CandleStore, candle_store
+
+
+# All functions take arrays shaped (symbols, time) - or (time,) for one symbol -
+# and work along the last axis. Exponential smoothing is done as one matrix
+# product with a cached weight matrix, so cost does not grow with a Python loop
+# over time steps.
+
+
+@lru_cache(maxsize=64)
+def _ewm_weights(alpha: float, length: int) -> np.ndarray:
+    """Weights W with (x @ W)[t] = exponential average of x[0..t], seeded with x[0]"""
+    idx = np.arange(length)
+    lag = idx[None, :] - idx[:, None]  # lag[i, t] = t - i
+    weights = np.where(lag >= 0, alpha * (1 - alpha) ** np.clip(lag, 0, None), 0.0)
+    weights[0, :] = (1 - alpha) ** idx  # Seed carries the remaining weight
+    weights.setflags(write=False)
+    return weights
+
+
+# Longer series are smoothed in blocks of this many steps so the weight matrix stays small
+_EWM_BLOCK = 128
+
+
+@lru_cache(maxsize=64)
+def _ewm_block_weights(alpha: float, block: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Within-block weights (no seed) and the decay applied to the previous block's last value"""
+    idx = np.arange(block)
+    lag = idx[None, :] - idx[:, None]
+    inner = np.where(lag >= 0, alpha * (1 - alpha) ** np.clip(lag, 0, None), 0.0)
+    carry = (1 - alpha) ** (idx + 1)
+    inner.setflags(write=False)
+    carry.setflags(write=False)
+    return inner, carry
+
+
+def _ewm(x: np.ndarray, alpha: float) -> np.ndarray:
+    length = x.shape[-1]
+    if length <= 2 * _EWM_BLOCK:
+        return x @ _ewm_weights(alpha, length)
+
+    inner, carry = _ewm_block_weights(alpha, _EWM_BLOCK)
+    out = np.empty_like(x)
+    prev = np.asarray(x[..., 0])  # Seeding with x[0] makes the first output x[0]
+    for start in range(0, length, _EWM_BLOCK):
+        block = x[..., start:start + _EWM_BLOCK]
+        n = block.shape[-1]
+        out[..., start:start + n] = block @ inner[:n, :n] + prev[..., None] * carry[:n]
+        prev = out[..., start + n - 1]
+    return out
+
+
+@lru_cache(maxsize=64)
+def _latest_weights(length: int, fast: int, slow: int, signal: int,
+                    smooth: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Columns that map a length-step close series straight to the latest
+    EMA(fast), EMA(slow), MACD and MACD signal values, plus the Wilder
+    weights (over length - 1 steps) used for the latest RSI and ATR.
+    """
+    fast_w = _ewm_weights(2.0 / (fast + 1), length)
+    slow_w = _ewm_weights(2.0 / (slow + 1), length)
+    macd_w = fast_w - slow_w
+    signal_w = macd_w @ _ewm_weights(2.0 / (signal + 1), length)[:, -1]
+    weights = np.column_stack([fast_w[:, -1], slow_w[:, -1], macd_w[:, -1], signal_w])
+    weights.setflags(write=False)
+    return weights, _ewm_weights(1.0 / smooth, length - 1)[:, -1].copy()
+
+
+def sma(x: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average; the first period-1 values are NaN"""
+    x = np.asarray(x, dtype=np.float64)
+    csum = np.cumsum(x, axis=-1)
+    out = np.full(x.shape, np.nan)
+    out[..., period - 1:] = csum[..., period - 1:]
+    out[..., period:] -= csum[..., :-period]
+    out[..., period - 1:] /= period
+    return out
+
+
+def ema(x: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average with alpha = 2 / (period + 1)"""
+    return _ewm(np.asarray(x, dtype=np.float64), 2.0 / (period + 1))
+
+
+def wilder(x: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's smoothing (alpha = 1 / period), used by RSI and ATR"""
+    return _ewm(np.asarray(x, dtype=np.float64), 1.0 / period)
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Relative Strength Index (0-100); one value per price step after the first"""
+    delta = np.diff(np.asarray(close, dtype=np.float64), axis=-1)
+    avg_gain = wilder(np.clip(delta, 0, None), period)
+    avg_loss = wilder(np.clip(-delta, 0, None), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        out = 100 - 100 / (1 + rs)
+    out = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), out)
+    return out
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26,
+         signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line and histogram"""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    high, low, close = (np.asarray(a, dtype=np.float64) for a in (high, low, close))
+    prev_close = np.concatenate([close[..., :1], close[..., :-1]], axis=-1)
+    return np.maximum(high, prev_close) - np.minimum(low, prev_close)
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Average True Range"""
+    return wilder(true_range(high, low, close), period)
+
+
+def bollinger(close: np.ndarray, period: int = 20,
+              num_std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Upper band, middle band (SMA) and lower band"""
+    close = np.asarray(close, dtype=np.float64)
+    middle = sma(close, period)
+    mean_sq = sma(close * close, period)
+    std = np.sqrt(np.clip(mean_sq - middle * middle, 0, None))
+    return middle + num_std * std, middle, middle - num_std * std
+
+
+def realized_volatility(close: np.ndarray, window: Optional[int] = None) -> np.ndarray:
+    """Standard deviation of log returns over the last window steps, scaled to the window, in percent"""
+    close = np.asarray(close, dtype=np.float64)
+    returns = np.diff(np.log(close), axis=-1)
+    if window is not None:
+        returns = returns[..., -window:]
+    return returns.std(axis=-1) * np.sqrt(returns.shape[-1]) * 100
+
+
+def latest_indicators(close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                      volume: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Latest value of every indicator for each row of (symbols, time) matrices.
+
+    Only the last value is needed on a tick, so the exponential averages are
+    collapsed into a handful of matrix-vector products instead of full series.
+    """
+    length = close.shape[-1]
+    price = close[:, -1]
+    ema_weights, wilder_weights = _latest_weights(length, 12, 26, 9, 14)
+    ema_fast, ema_slow, macd_line, macd_signal = (close @ ema_weights).T
+
+    delta = np.diff(close, axis=-1)
+    avg_gain = np.clip(delta, 0, None) @ wilder_weights
+    avg_loss = np.clip(-delta, 0, None) @ wilder_weights
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi_value = np.where(avg_loss > 0, 100 - 100 / (1 + avg_gain / avg_loss),
+                             np.where(avg_gain > 0, 100.0, 50.0))
+
+    # max(h - l, |h - prev|, |l - prev|) == max(h, prev) - min(l, prev), in two passes
+    prev_close = close[:, :-1]
+    tr = np.maximum(high[:, 1:], prev_close) - np.minimum(low[:, 1:], prev_close)
+    atr_value = tr @ wilder_weights
+
+    band = close[:, -20:]
+    middle = band.mean(axis=1)
+    std = band.std(axis=1)
+    upper, lower = middle + 2 * std, middle - 2 * std
+    log_returns = np.diff(np.log(close), axis=-1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent_b = np.where(std > 0, (price - lower) / (upper - lower), 0.5)
+        volume_ratio = volume[:, -1] / volume[:, :-1].mean(axis=1)
+
+    return {
+        'price': price,
+        'sma_20': middle,
+        'ema_12': ema_fast,
+        'ema_26': ema_slow,
+        'ema_gap_pct': (ema_fast - ema_slow) / price * 100,
+        'rsi': rsi_value,
+        'macd': macd_line,
+        'macd_signal': macd_signal,
+        'macd_hist': macd_line - macd_signal,
+        'atr_pct': atr_value / price * 100,
+        'bb_upper': upper,
+        'bb_lower': lower,
+        'bb_percent_b': percent_b,
+        'volatility': log_returns.std(axis=-1) * np.sqrt(length - 1) * 100,
+        'volume_ratio': np.nan_to_num(volume_ratio, nan=1.0, posinf=1.0),
+    }
+
+
+# Keys of latest_indicators(), the names strategies can declare
+INDICATOR_NAMES = (
+    'price', 'sma_20', 'ema_12', 'ema_26', 'ema_gap_pct', 'rsi', 'macd', 'macd_signal', 'macd_hist',
+    'atr_pct', 'bb_upper', 'bb_lower', 'bb_percent_b', 'volatility', 'volume_ratio',
+)
+
+
+def classify_trend(ind: Dict[str, float]) -> str:
+    """'bullish' / 'bearish' / 'neutral' from EMA crossover, MACD histogram and RSI"""
+    if ind['ema_gap_pct'] > 0 and ind['macd_hist'] > 0 and ind['rsi'] < 70:
+        return 'bullish'
+    if ind['ema_gap_pct'] < 0 and ind['macd_hist'] < 0 and ind['rsi'] > 30:
+        return 'bearish'
+    return 'neutral'
+
+
+class IndicatorEngine:
+    """
+    Computes indicators for the whole symbol universe in one vectorised pass.
+
+    Each call stacks the latest window candles of every symbol from the candle
+    store into (symbols, window) matrices, replaces the last close with the live
+    price, and evaluates all indicators as matrix operations. Symbols with less
+    than window candles are left out so callers can fall back.
+    """
+
+    def __init__(self, store: Optional[CandleStore] = None, interval: str = '1m', window: int = 100):
+        self.store = store or candle_store
+        self.interval = interval
+        self.window = window
+        self._matrix_key = None
+        self._matrix: Tuple[List[str], Dict[str, np.ndarray]] = ([], {})
+
+    def load_matrix(self, symbols: List[str]) -> Tuple[List[str], Dict[str, np.ndarray]]:
+        """Symbols with a full window of candles, and their stacked OHLCV columns"""
+        series = []
+        for symbol in symbols:
+            try:
+                found = self.store.find(symbol, self.interval)
+            except Exception:
+                continue
+            if found is not None:
+                series.append((symbol, found))
+
+        # Restack only when a candle was appended or updated since the last call
+        key = tuple((symbol, s.revision, len(s)) for symbol, s in series)
+        if key != self._matrix_key:
+            ready = [(symbol, s.tail(self.window)) for symbol, s in series if len(s) >= self.window]
+            matrix = {}
+            if ready:
+                matrix = {
+                    name: np.stack([tail[name] for _, tail in ready]).astype(np.float64)
+                    for name in ('high', 'low', 'close', 'volume')
+                }
+            self._matrix = ([symbol for symbol, _ in ready], matrix)
+            self._matrix_key = key
+
+        ready_symbols, matrix = self._matrix
+        # compute() patches live prices into the last close/high/low, so those are copies
+        return list(ready_symbols), {
+            name: column if name == 'volume' else column.copy() for name, column in matrix.items()
+        }
+
+    def compute(self, prices: Dict[str, float]) -> Dict[str, Dict[str, float]]:
+        """Indicators keyed by symbol for every symbol in prices that has enough history"""
+        return self.rows(*self.compute_vectors(prices))
+
+    def compute_vectors(self, prices: Dict[str, float]) -> Tuple[List[str], Dict[str, np.ndarray]]:
+        """Like compute(), but as the symbols and {indicator: array over those symbols}"""
+        symbols, matrix = self.load_matrix(list(prices))
+        if not symbols:
+            return [], {}
+
+        # Let the still-forming candle reflect the live price
+        live = np.array([prices[s] for s in symbols], dtype=np.float64)
+        matrix['close'][:, -1] = live
+        matrix['high'][:, -1] = np.maximum(matrix['high'][:, -1], live)
+        matrix['low'][:, -1] = np.minimum(matrix['low'][:, -1], live)
+
+        return symbols, latest_indicators(matrix['close'], matrix['high'], matrix['low'], matrix['volume'])
+
+    @staticmethod
+    def compute_matrix(symbols: List[str], matrix: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+        values = latest_indicators(matrix['close'], matrix['high'], matrix['low'], matrix['volume'])
+        return IndicatorEngine.rows(symbols, values)
+
+    @staticmethod
+    def rows(symbols: List[str], values: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+        """{indicator: array over symbols} as {symbol: {indicator: float}}"""
+        if not symbols:
+            return {}
+        names = list(values)
+        columns = np.column_stack([values[name] for name in names]).tolist()
+        return {symbol: dict(zip(names, row)) for symbol, row in zip(symbols, columns)}
@@ -0,0 +1,255 @@
+"""
+Streaming Market Data for MeMo Bot Pro
+Pushes per-symbol price updates from the Binance !miniTicker@arr WebSocket feed
+"""
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+from .binance_client import AsyncBinanceClient, market_cache
+
+
+BINANCE_MINI_TICKER_URL = 'wss://stream.binance.com:9443/ws/!miniTicker@arr'
+
+
+@dataclass
+class PriceUpdate:
+    """A single symbol price change pushed to subscribers"""
+    symbol: str
+    price: float
+    event_time: float  # Exchange event time in seconds
+    source: str = 'stream'  # 'stream' or 'resync'
+    volume: float = 0.0  # Base-asset volume traded since the symbol's previous update
+
+
+class MiniTickerStream:
+    """
+    Binance mini-ticker WebSocket client with automatic reconnect.
+
+    Every message is published to subscriber queues as a list of PriceUpdate.
+    After a reconnect, or when the gap between exchange event times exceeds
+    gap_seconds, a REST resync publishes the current prices so no move is missed.
+    """
+
+    def __init__(self, binance_client: AsyncBinanceClient, url: str = BINANCE_MINI_TICKER_URL,
+                 symbols: Optional[List[str]] = None, gap_seconds: float = 3.0,
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        self.binance_client = binance_client
+        self.url = url
+        self.symbols: Optional[Set[str]] = set(symbols) if symbols else None
+        self.gap_seconds = gap_seconds
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.running = False
+        self.connected = False
+        self._subscribers: List[asyncio.Queue] = []
+        self._last_event_time: Optional[float] = None
+        self._volumes: Dict[str, float] = {}  # Last 24h rolling volume ('v') per symbol
+
+        # Stream statistics
+        self.messages = 0
+        self.reconnects = 0
+        self.gaps = 0
+        self.resyncs = 0
+        self.dropped = 0
+
+    @staticmethod
+    def available() -> bool:
+        return websockets is not None
+
+    def subscribe(self, maxsize: int = 1000) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=maxsize)
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    async def run(self):
+        """Connect and keep the feed alive until stop() is called"""
+        if not self.available():
+            raise RuntimeError("websockets package not installed")
+
+        self.running = True
+        delay = self.reconnect_delay
+
+        while self.running:
+            try:
+                async with websockets.connect(self.url, ping_interval=20) as ws:
+                    self.connected = True
+                    delay = self.reconnect_delay
+                    print(f"📡 Market stream connected: {self.url}")
+                    await self._resync()
+
+                    while self.running:
+                        # A silent socket is treated like a gap: reconnect and resync
+                        raw = await asyncio.wait_for(ws.recv(), timeout=self.gap_seconds * 2)
+                        await self._handle_message(raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self.running:
+                    print(f"⚠️ Market stream disconnected: {e} (retrying in {delay:.0f}s)")
+            finally:
+                self.connected = False
+
+            if self.running:
+                self.reconnects += 1
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def stop(self):
+        self.running = False
+
+    def stats(self) -> Dict:
+        return {
+            'url': self.url,
+            'connected': self.connected,
+            'messages': self.messages,
+            'reconnects': self.reconnects,
+            'gaps': self.gaps,
+            'resyncs': self.resyncs,
+            'dropped': self.dropped,
+            'subscribers': len(self._subscribers)
+        }
+
+    async def _handle_message(self, raw):
+        payload = json.loads(raw)
+        events = payload if isinstance(payload, list) else [payload]
+        self.messages += 1
+
+        updates = []
+        newest = self._last_event_time
+        for event in events:
+            symbol = event.get('s')
+            if not symbol or (self.symbols and symbol not in self.symbols):
+                continue
+            event_time = event.get('E', time.time() * 1000) / 1000
+            newest = event_time if newest is None else max(newest, event_time)
+            updates.append(PriceUpdate(symbol=symbol, price=float(event['c']), event_time=event_time,
+                                       volume=self._volume_delta(symbol, event.get('v'))))
+
+        gap = (self._last_event_time is not None and newest is not None
+               and newest - self._last_event_time > self.gap_seconds)
+        self._last_event_time = newest
+
+        if gap:
+            self.gaps += 1
+            await self._resync()
+        elif updates:
+            self._publish(updates)
+
+    def _volume_delta(self, symbol: str, rolling_volume) -> float:
+        """
+        Volume since the previous update, from the 24h rolling volume 'v'. Trades
+        leaving the 24h window can make the difference negative; those updates
+        count as no volume. The first update of a symbol has no baseline.
+        """
+        if rolling_volume is None:
+            return 0.0
+        rolling_volume = float(rolling_volume)
+        previous = self._volumes.get(symbol)
+        self._volumes[symbol] = rolling_volume
+        return max(rolling_volume - previous, 0.0) if previous is not None else 0.0
+
+    async def _resync(self):
+        """Fetch fresh prices over REST and publish them as one batch"""
+        try:
+            market_cache.invalidate(self.binance_client.cache_key)
+            prices = await self.binance_client.get_all_prices()
+        except Exception as e:
+            print(f"❌ Market stream resync failed: {e}")
+            return
+
+        now = time.time()
+        updates = [
+            PriceUpdate(symbol=p['symbol'], price=float(p['price']), event_time=now, source='resync')
+            for p in prices
+            if not self.symbols or p['symbol'] in self.symbols
+        ]
+        self.resyncs += 1
+        self._last_event_time = now
+        if updates:
+            self._publish(updates)
+
+    def _publish(self, updates: List[PriceUpdate]):
+        for queue in self._subscribers:
+            if queue.full():
+                # Slow consumer: drop the oldest batch, the newest prices matter most
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(updates)
+
+
+class MockTickerServer:
+    """
+    Local stand-in for the Binance mini-ticker stream.
+
+    Broadcasts the mock client's prices in !miniTicker@arr format every interval,
+    so the streaming path can run in mock mode and in tests without network.
+    """
+
+    def __init__(self, binance_client, host: str = '127.0.0.1', port: int = 0, interval: float = 1.0):
+        self.binance_client = binance_client
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self._server = None
+        self._broadcast_task = None
+        self._connections = set()
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self) -> str:
+        if websockets is None:
+            raise RuntimeError("websockets package not installed")
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._broadcast_task = asyncio.create_task(self._broadcast_loop())
+        return self.url
+
+    async def stop(self):
+        if self._broadcast_task:
+            self._broadcast_task.cancel()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handler(self, websocket, path=None):
+        self._connections.add(websocket)
+        try:
+            await websocket.wait_closed()
+        finally:
+            self._connections.discard(websocket)
+
+    def _build_message(self) -> str:
+        mock = self.binance_client.client
+        tickers = mock.get_all_tickers()
+        # Under tick replay, stamp events with the virtual clock so gap detection follows it
+        replay = getattr(mock, 'replay', None)
+        event_time = replay.clock.now_ms() if replay else int(time.time() * 1000)
+        return json.dumps([
+            {'e': '24hrMiniTicker', 'E': event_time, 's': t['symbol'], 'c': t['price']}
+            for t in tickers
+        ])
+
+    async def _broadcast_loop(self):
+        while True:
+            if self._connections:
+                message = self._build_message()
+                for websocket in list(self._connections):
+                    try:
+                        await websocket.send(message)
+                    except Exception:
+                        self._connections.discard(websocket)
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,56 @@
+"""
+Message Cache for MeMo Bot Pro
+Rendered notification text and keyboards cached per (template, language, payload version)
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class RenderCache:
+    """
+    LRU cache of rendered message parts.
+
+    Keys are tuples such as (template, lang, version, ...). A wave of
+    notifications renders each distinct key once and sends the same object
+    to every recipient in that bucket, so string building scales with the
+    number of languages rather than the number of users. Rendered objects
+    are shared and must not be modified by callers.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.renders = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, render: Callable[[], Any]) -> Any:
+        """The cached value for key, calling render() only on a miss"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        value = render()
+        self.renders += 1
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.renders
+        return {
+            'entries': len(self._entries),
+            'renders': self.renders,
+            'hits': self.hits,
+            'hit_ratio': self.hits / lookups if lookups else 0.0
+        }
+
+
+# Shared by the bot's notification senders and the health monitor
+message_cache = RenderCache()
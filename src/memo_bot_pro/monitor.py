@@ -98,6 +98,24 @@ class BotHealthMonitor:
                 'details': 'Switch to live mode for real data'
             })
         
+        # Outbound connection pool, Binance request-weight, request coalescing, signal snapshot, bar, alert, fanout and outbox statistics
+        from .alert_thresholds import alert_thresholds
+        from .bar_aggregator import bar_aggregator
+        from .fanout import fanout
+        from .outbox import outbox_stats
+        from .binance_client import weight_governor
+        from .http_transport import shared_transport
+        from .signal_service import signal_service
+        from .singleflight import single_flight
+        health_status['transport'] = shared_transport.stats()
+        health_status['request_weight'] = weight_governor.stats()
+        health_status['single_flight'] = single_flight.stats()
+        health_status['signals'] = signal_service.stats()
+        health_status['bars'] = bar_aggregator.stats()
+        health_status['alerts'] = alert_thresholds.stats()
+        health_status['fanout'] = fanout.stats()
+        health_status['outbox'] = outbox_stats()
+        
         return health_status
     
     def _check_binance_api(self) -> Dict:
@@ -112,7 +130,7 @@ class BotHealthMonitor:
             
             # Make a real lightweight API call to test connectivity
             # IMPORTANT: Don't use mock mode for health checks - we need to test REAL API
-            from .binance_client import BinanceClient
+            from .binance_client import BinanceClient, market_cache
             try:
                 # Force live mode for health check (bypass deployment mock mode)
                 client = BinanceClient(
@@ -135,7 +153,8 @@ class BotHealthMonitor:
                     'healthy': True,
                     'status': 'Connected',
                     'mode': 'Mock' if self.config.mock_mode else 'Live',
-                    'pairs_available': len(prices)
+                    'pairs_available': len(prices),
+                    'price_cache': market_cache.stats()
                 }
             except Exception as api_error:
                 return {
@@ -170,11 +189,12 @@ class BotHealthMonitor:
             
             # Make a real lightweight API call to test bot connectivity
             import requests
+            from .http_transport import shared_transport
             try:
                 self.last_telegram_check = current_time
                 # Use getMe endpoint - lightweight operation to verify bot is alive
                 url = f"https://api.telegram.org/bot{self.config.telegram_bot_token}/getMe"
-                response = requests.get(url, timeout=5)
+                response = shared_transport.get(url, timeout=5)
                 
                 if response.status_code != 200:
                     return {
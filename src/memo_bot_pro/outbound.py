@@ -0,0 +1,23 @@
+"""
+Outbound Messages for MeMo Bot Pro
+Queue rows shared by the outbox senders and both queue stores, free of Telegram imports
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+
+# Lower numbers are claimed first
+PRIORITY_ALERT = 0
+PRIORITY_SUMMARY = 5
+PRIORITY_BULK = 9
+
+
+@dataclass
+class OutboundMessage:
+    chat_id: int
+    payload: str  # JSON send_message kwargs, reply_markup as a dict
+    dedupe_key: str
+    priority: int = PRIORITY_BULK
+    expires_in: Optional[float] = None  # Seconds after enqueue when an unsent message is dropped
+    id: Optional[int] = None
+    attempts: int = 0
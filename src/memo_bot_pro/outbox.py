@@ -0,0 +1,280 @@
+"""
+Outbound Queue for MeMo Bot Pro
+Durable Telegram message queue with dedupe keys, priorities, visibility timeouts and sender workers
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from telegram import InlineKeyboardMarkup
+from telegram.error import BadRequest, Forbidden
+
+from .fanout import NotificationFanout
+from .outbound import PRIORITY_BULK, OutboundMessage
+
+# Messages move pending -> sent, or pending -> failed once retries run out.
+# A claimed message stays 'pending' but invisible until its visibility
+# timeout passes; if the sender dies before acking, another sender picks it
+# up again. Delivery is therefore at-least-once: a crash between the
+# Telegram call and the ack can send a message twice, never zero times.
+
+
+def send_kwargs(message: OutboundMessage) -> Dict:
+    """send_message kwargs for a queued message, with its reply_markup rebuilt"""
+    kwargs = json.loads(message.payload)
+    if kwargs.get('reply_markup'):
+        kwargs['reply_markup'] = InlineKeyboardMarkup.de_json(kwargs['reply_markup'], None)
+    return kwargs
+
+
+def outbound_messages(messages: Iterable[Tuple[int, Dict]], dedupe_prefix: str, priority: int = PRIORITY_BULK,
+                      expires_in: Optional[float] = None) -> List[OutboundMessage]:
+    """
+    (chat_id, send_message kwargs) pairs as queue rows keyed '<dedupe_prefix>:<chat_id>'.
+    Payloads shared between chats (see message_cache) are serialised once.
+    """
+    serialised: Dict[int, str] = {}
+    rows = []
+    for chat_id, kwargs in messages:
+        payload = serialised.get(id(kwargs))
+        if payload is None:
+            data = dict(kwargs)
+            if data.get('reply_markup') is not None:
+                data['reply_markup'] = data['reply_markup'].to_dict()
+            payload = serialised[id(kwargs)] = json.dumps(data, ensure_ascii=False)
+        rows.append(OutboundMessage(chat_id, payload, f"{dedupe_prefix}:{chat_id}", priority, expires_in))
+    return rows
+
+
+class SQLiteOutbox:
+    """
+    Stand-in for the Postgres outbound_messages table (see Database) when
+    DATABASE_URL is not set. Same methods, one local file shared by every
+    process on the host.
+    """
+
+    def __init__(self, path: str = 'outbox.db'):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS outbound_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dedupe_key TEXT UNIQUE NOT NULL,
+                chat_id INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                priority INTEGER DEFAULT 9,
+                status TEXT DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                available_at REAL NOT NULL,
+                expires_at REAL,
+                created_at REAL NOT NULL,
+                sent_at REAL,
+                last_error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_outbound_ready ON outbound_messages(status, priority, available_at);
+        """)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def enqueue_outbound(self, messages: Sequence[OutboundMessage]) -> int:
+        """Insert messages in one transaction; rows whose dedupe_key exists are skipped"""
+        now = time.time()
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO outbound_messages "
+                "(dedupe_key, chat_id, payload, priority, available_at, expires_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(m.dedupe_key, m.chat_id, m.payload, m.priority, now,
+                  now + m.expires_in if m.expires_in else None, now) for m in messages]
+            )
+            return conn.total_changes - before
+
+    def claim_outbound(self, limit: int, visibility_timeout: float) -> List[OutboundMessage]:
+        """Take up to limit ready messages, hidden from other senders for visibility_timeout seconds"""
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, dedupe_key, chat_id, payload, priority, attempts FROM outbound_messages "
+                "WHERE status = 'pending' AND available_at <= ? AND (expires_at IS NULL OR expires_at > ?) "
+                "ORDER BY priority, id LIMIT ?",
+                (now, now, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE outbound_messages SET available_at = ?, attempts = attempts + 1 WHERE id = ?",
+                [(now + visibility_timeout, row[0]) for row in rows]
+            )
+        return [
+            OutboundMessage(chat_id, payload, key, priority, id=message_id, attempts=attempts + 1)
+            for message_id, key, chat_id, payload, priority, attempts in rows
+        ]
+
+    def ack_outbound(self, ids: Sequence[int]):
+        if ids:
+            now = time.time()
+            with self._transaction() as conn:
+                conn.executemany(
+                    "UPDATE outbound_messages SET status = 'sent', sent_at = ? WHERE id = ?",
+                    [(now, message_id) for message_id in ids]
+                )
+
+    def fail_outbound(self, failures: Sequence[Tuple[int, str, Optional[float]]]):
+        """(id, error, retry delay) per message; a None delay marks it failed for good"""
+        now = time.time()
+        with self._transaction() as conn:
+            for message_id, error, delay in failures:
+                if delay is None:
+                    conn.execute("UPDATE outbound_messages SET status = 'failed', last_error = ? WHERE id = ?",
+                                 (error, message_id))
+                else:
+                    conn.execute("UPDATE outbound_messages SET available_at = ?, last_error = ? WHERE id = ?",
+                                 (now + delay, error, message_id))
+
+    def outbound_stats(self) -> Dict[str, int]:
+        rows = self._connection().execute(
+            "SELECT status, COUNT(*) FROM outbound_messages GROUP BY status"
+        ).fetchall()
+        return dict(rows)
+
+    def purge_outbound(self, days: float = 7.0) -> int:
+        """Delete finished messages older than days, and pending ones that expired"""
+        now = time.time()
+        cursor = self._connection().execute(
+            "DELETE FROM outbound_messages WHERE (status != 'pending' AND created_at < ?) "
+            "OR (status = 'pending' AND expires_at IS NOT NULL AND expires_at <= ?)",
+            (now - days * 86400, now)
+        )
+        return cursor.rowcount
+
+
+def create_outbox(database=None, path: str = 'outbox.db'):
+    """The Postgres-backed Database when available, else a local SQLite queue"""
+    return database if database is not None else SQLiteOutbox(path)
+
+
+class OutboxSender:
+    """
+    Claims batches from an outbox and delivers them through a NotificationFanout.
+
+    Several senders (in one or more processes) can share a queue: claims
+    hide messages for visibility_timeout, which must comfortably exceed
+    the time to send one batch at the fanout rate. on_sent is called with
+    each delivered (chat_id, kwargs, OutboundMessage) item once it is acked.
+    """
+
+    def __init__(self, store, fanout: NotificationFanout, batch_size: int = 200,
+                 visibility_timeout: float = 60.0, max_attempts: int = 5,
+                 poll_interval: float = 1.0, purge_interval: float = 3600.0,
+                 on_sent: Optional[Callable] = None):
+        self.store = store
+        self.fanout = fanout
+        self.on_sent = on_sent
+        self.batch_size = batch_size
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.purge_interval = purge_interval
+        self.running = False
+        self._last_purge = 0.0
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+
+    async def run(self, bot):
+        self.running = True
+        while self.running:
+            try:
+                if not await self.drain_once(bot):
+                    await asyncio.sleep(self.poll_interval)
+                if time.monotonic() - self._last_purge >= self.purge_interval:
+                    self._last_purge = time.monotonic()
+                    await asyncio.get_running_loop().run_in_executor(None, self.store.purge_outbound)
+            except Exception as e:
+                print(f"❌ Outbox sender error: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    def stop(self):
+        self.running = False
+
+    async def drain_once(self, bot) -> int:
+        """Claim and deliver one batch; returns how many messages were claimed"""
+        loop = asyncio.get_running_loop()
+        batch = await loop.run_in_executor(None, self.store.claim_outbound, self.batch_size, self.visibility_timeout)
+        if not batch:
+            return 0
+
+        sent: List[Tuple] = []
+        failures: List[Tuple[int, str, Optional[float]]] = []
+
+        def on_failed(item, error):
+            message = item[2]
+            if isinstance(error, (Forbidden, BadRequest)) or message.attempts >= self.max_attempts:
+                # Blocked bot, deleted chat or malformed message - retrying cannot help
+                failures.append((message.id, str(error), None))
+            else:
+                failures.append((message.id, str(error), min(2 ** message.attempts, 300)))
+
+        await self.fanout.deliver(
+            bot,
+            [(message.chat_id, send_kwargs(message), message) for message in batch],
+            on_sent=sent.append,
+            on_failed=on_failed,
+            label='queued message'
+        )
+        if sent:
+            await loop.run_in_executor(None, self.store.ack_outbound, [item[2].id for item in sent])
+            if self.on_sent:
+                for item in sent:
+                    try:
+                        self.on_sent(item)
+                    except Exception as e:
+                        print(f"❌ Outbox delivery callback error: {e}")
+        if failures:
+            await loop.run_in_executor(None, self.store.fail_outbound, failures)
+        self.sent += len(sent)
+        self.failed += sum(1 for _, _, delay in failures if delay is None)
+        self.retried += sum(1 for _, _, delay in failures if delay is not None)
+        return len(batch)
+
+    def stats(self) -> Dict:
+        return {'sent': self.sent, 'failed': self.failed, 'retried': self.retried}
+
+
+# Senders running in this process, reported by the health monitor
+active_senders: List[OutboxSender] = []
+
+
+def outbox_stats() -> Dict:
+    """Delivery counts across active senders and queue depth by status"""
+    stats = {'senders': len(active_senders), 'sent': 0, 'failed': 0, 'retried': 0}
+    for sender in active_senders:
+        for key, value in sender.stats().items():
+            stats[key] += value
+    if active_senders:
+        try:
+            stats['queue'] = active_senders[0].store.outbound_stats()
+        except Exception as e:
+            stats['queue_error'] = str(e)
+    return stats
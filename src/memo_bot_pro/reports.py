@@ -11,9 +11,10 @@ ARABIC_MONTHS = {
 
 
 class ReportGenerator:
-    def __init__(self, binance_client, signal_generator):
+    def __init__(self, binance_client, signal_generator, signal_service=None):
         self.binance_client = binance_client
         self.signal_generator = signal_generator
+        self.signal_service = signal_service
     
     def generate_report(self, report_type: str, lang: str = 'en') -> str:
         if report_type == 'daily':
@@ -29,7 +30,10 @@ class ReportGenerator:
         today = datetime.now().strftime('%Y-%m-%d')
         
         currencies = self.binance_client.get_top_10_currencies()
-        signals = self.signal_generator.generate_signals()
+        if self.signal_service:
+            signals = self.signal_service.current(self.binance_client).signal_list()
+        else:
+            signals = self.signal_generator.generate_signals()
         
         buy_count = sum(1 for s in signals if s['recommendation'] == 'BUY')
         sell_count = sum(1 for s in signals if s['recommendation'] == 'SELL')
@@ -1,6 +1,13 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, timedelta
 import random
+import time
+import zlib
+
+import numpy as np
+
+from .indicators import IndicatorEngine, classify_trend
+from .strategies import ScalpingStrategy, StrategyRegistry, strategy_registry
 
 
 class ScalpingSignalGenerator:
@@ -10,8 +17,22 @@ class ScalpingSignalGenerator:
     Focus: Volatile coins (SOL, BNB, XRP) for quick gains
     """
     
-    def __init__(self, binance_client):
+    def __init__(self, binance_client, indicator_engine: Optional[IndicatorEngine] = None,
+                 seed: Optional[int] = None, rng: Optional[random.Random] = None,
+                 clock: Optional[Callable[[], float]] = None,
+                 strategies: Optional[StrategyRegistry] = None, strategy: str = 'scalping'):
         self.client = binance_client
+        self.indicators = indicator_engine or IndicatorEngine()
+        # With a seed, simulated values depend only on (seed, symbol, price).
+        # generated_at comes from the tick time when given, else from clock
+        # (epoch seconds, e.g. a replay clock); seeded runs never use the wall clock
+        self.seed = seed
+        self.rng = rng if rng is not None else random.Random()
+        self.clock = clock
+        # Every registered strategy is evaluated per tick; `strategy` decides the signal's action
+        self.strategies = strategies or strategy_registry
+        self.strategy = strategy
+        self._simulated = ScalpingStrategy()
         self.AED_RATE = 3.67
         
         self.RISK_PARAMS = {
@@ -23,11 +44,49 @@ class ScalpingSignalGenerator:
         }
         
         self.SCALPING_SYMBOLS = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'SOLUSDT', 'XRPUSDT']
+        
+        # Last closed bar per (symbol, interval), kept current by attach_bars()
+        self.closed_bars: Dict[tuple, object] = {}
+        self._bar_aggregator = None
+    
+    def attach_bars(self, aggregator):
+        """Follow bar closes from a BarAggregator to add 5m/15m/1h context to signals"""
+        if self._bar_aggregator is aggregator:
+            return
+        if self._bar_aggregator is not None:
+            self._bar_aggregator.unsubscribe(self.on_bar_close)
+        self._bar_aggregator = aggregator
+        aggregator.subscribe(self.on_bar_close)
+    
+    def on_bar_close(self, bar):
+        if bar.symbol in self.SCALPING_SYMBOLS:
+            self.closed_bars[(bar.symbol, bar.interval)] = bar
+    
+    def _timeframe_context(self, symbol: str) -> Dict[str, Dict]:
+        """Direction and size of the last closed bar on every followed timeframe"""
+        context = {}
+        for (bar_symbol, interval), bar in self.closed_bars.items():
+            if bar_symbol != symbol:
+                continue
+            change = bar.change_percent
+            context[interval] = {
+                'trend': 'bullish' if change > 0 else 'bearish' if change < 0 else 'neutral',
+                'change_percent': change,
+                'close': bar.close
+            }
+        return context
     
-    def generate_scalping_signal(self, symbol: str, current_price: float) -> Dict:
+    def generate_scalping_signal(self, symbol: str, current_price: float,
+                                 indicators: Optional[Dict[str, float]] = None,
+                                 decisions: Optional[Dict[str, Dict]] = None,
+                                 tick_time: Optional[float] = None) -> Dict:
         """
         Generate a scalping signal with entry/exit prices and risk management
         
+        indicators: latest IndicatorEngine values for the symbol, or None when it
+        has no candle history (simulated values are used instead)
+        decisions: this symbol's StrategyRegistry.evaluate() result, if already computed
+        
         Returns signal with:
         - action: BUY, SELL, HOLD
         - entry_price: Recommended entry price
@@ -40,31 +99,43 @@ class ScalpingSignalGenerator:
         - reasoning: Why this signal was generated
         """
         
-        volatility = self._calculate_volatility(symbol, current_price)
-        trend = self._detect_trend(symbol, current_price)
-        volume_spike = self._check_volume_spike(symbol)
-        
-        action = 'HOLD'
-        confidence = 50
-        reasoning = ""
-        
-        if trend == 'bullish' and volatility > 0.5 and volume_spike:
-            action = 'BUY'
-            confidence = random.randint(75, 95)
-            reasoning = f"Strong bullish trend detected with high volatility ({volatility:.1f}%) and volume spike"
-        elif trend == 'bearish' and volatility > 0.5:
-            action = 'SELL'
-            confidence = random.randint(70, 90)
-            reasoning = f"Bearish trend with high volatility ({volatility:.1f}%), good time to exit positions"
+        rng = self._rng(symbol, current_price)
+        
+        volatility = self._calculate_volatility(symbol, current_price, indicators, rng)
+        trend = self._detect_trend(symbol, current_price, indicators, rng)
+        volume_spike = self._check_volume_spike(symbol, indicators, rng)
+        
+        if indicators:
+            if decisions is None:
+                vectors = {name: np.array([value]) for name, value in indicators.items()}
+                decisions = self.strategies.evaluate([symbol], vectors)[symbol]
+            decision = decisions.get(self.strategy, {'action': 'HOLD', 'confidence': 50})
+            action, confidence = decision['action'], decision['confidence']
+            primary = self.strategies.get(self.strategy)
+            reasoning = primary.explain(action, {**indicators, 'trend': trend}) if primary else ""
         else:
-            action = 'HOLD'
-            confidence = random.randint(50, 70)
-            reasoning = f"Weak signals, waiting for better entry point (trend: {trend}, volatility: {volatility:.1f}%)"
+            # Simulated inputs go through the scalping rule, with a random confidence in its band
+            decisions = {}
+            if trend == 'bullish' and volatility > self._simulated.min_volatility and volume_spike:
+                action, (low, high) = 'BUY', (75, 95)
+            elif trend == 'bearish' and volatility > self._simulated.min_volatility:
+                action, (low, high) = 'SELL', (70, 90)
+            else:
+                action, (low, high) = 'HOLD', (50, 70)
+            confidence = rng.randint(low, high)
+            reasoning = self._simulated.explain(action, {'volatility': volatility, 'trend': trend})
         
-        take_profit_percent = random.uniform(
-            self.RISK_PARAMS['take_profit_min'], 
-            self.RISK_PARAMS['take_profit_max']
-        )
+        if indicators:
+            # Target about three ATRs, kept inside the configured take-profit band
+            take_profit_percent = min(
+                max(indicators['atr_pct'] * 3, self.RISK_PARAMS['take_profit_min']),
+                self.RISK_PARAMS['take_profit_max']
+            )
+        else:
+            take_profit_percent = rng.uniform(
+                self.RISK_PARAMS['take_profit_min'], 
+                self.RISK_PARAMS['take_profit_max']
+            )
         
         entry_price = current_price
         exit_target = current_price * (1 + take_profit_percent / 100)
@@ -74,7 +145,11 @@ class ScalpingSignalGenerator:
         profit_estimate_usdt = trade_amount_usdt * (take_profit_percent / 100)
         profit_estimate_aed = profit_estimate_usdt * self.AED_RATE
         
-        time_window = random.randint(5, 30)
+        if indicators and indicators['atr_pct'] > 0:
+            # Candles needed to cover the target at the current average range
+            time_window = int(min(max(take_profit_percent / indicators['atr_pct'], 5), 30))
+        else:
+            time_window = rng.randint(5, 30)
         
         return {
             'symbol': symbol,
@@ -94,41 +169,73 @@ class ScalpingSignalGenerator:
             'volatility': volatility,
             'trend': trend,
             'volume_spike': volume_spike,
-            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'strategies': decisions,
+            'timeframes': self._timeframe_context(symbol),
+            'generated_at': self._generated_at(tick_time)
         }
     
     def generate_all_signals(self) -> List[Dict]:
         """Generate scalping signals for all tracked symbols"""
-        signals = []
-        
         try:
-            prices = self.client.get_all_prices()
-            
-            for price_data in prices:
-                symbol = price_data['symbol']
-                if symbol in self.SCALPING_SYMBOLS:
-                    current_price = float(price_data['price'])
-                    signal = self.generate_scalping_signal(symbol, current_price)
-                    signals.append(signal)
-        
+            return self.generate_signals_from_prices(self.client.get_all_prices())
         except Exception as e:
             print(f"Error generating signals: {e}")
-        
-        return signals
+            return []
+    
+    def generate_signals_from_prices(self, prices: List[Dict], tick_time: Optional[float] = None) -> List[Dict]:
+        """Generate scalping signals from already-fetched {'symbol', 'price'} tickers (tick_time in epoch seconds)"""
+        tracked = {
+            price_data['symbol']: float(price_data['price'])
+            for price_data in prices
+            if price_data['symbol'] in self.SCALPING_SYMBOLS
+        }
+        # One vectorised indicator pass for every tracked symbol, shared by all strategies
+        symbols, vectors = self.indicators.compute_vectors(tracked)
+        indicators = IndicatorEngine.rows(symbols, vectors)
+        decisions = self.strategies.evaluate(symbols, vectors) if symbols else {}
+        return [
+            self.generate_scalping_signal(symbol, price, indicators.get(symbol), decisions.get(symbol), tick_time)
+            for symbol, price in tracked.items()
+        ]
     
-    def get_buy_signals(self, min_confidence: int = 75) -> List[Dict]:
+    def get_buy_signals(self, min_confidence: int = 75, prices: Optional[List[Dict]] = None) -> List[Dict]:
         """Get only BUY signals with confidence above threshold"""
-        all_signals = self.generate_all_signals()
+        if prices is None:
+            all_signals = self.generate_all_signals()
+        else:
+            all_signals = self.generate_signals_from_prices(prices)
         return [
             signal for signal in all_signals 
             if signal['action'] == 'BUY' and signal['confidence'] >= min_confidence
         ]
     
-    def _calculate_volatility(self, symbol: str, current_price: float) -> float:
+    def _generated_at(self, tick_time: Optional[float]) -> Optional[str]:
+        """Timestamp for a signal: tick time, then clock; None for a seeded run with neither"""
+        if tick_time is None:
+            if self.clock is not None:
+                tick_time = self.clock()
+            elif self.seed is None:
+                tick_time = time.time()
+            else:
+                return None
+        return datetime.fromtimestamp(tick_time).strftime('%Y-%m-%d %H:%M:%S')
+    
+    def _rng(self, symbol: str, price: float) -> random.Random:
+        """Source for simulated values: derived from the inputs when seeded, else self.rng"""
+        if self.seed is None:
+            return self.rng
+        return random.Random(zlib.crc32(f"{self.seed}:{symbol}:{price!r}".encode()))
+    
+    def _calculate_volatility(self, symbol: str, current_price: float,
+                              indicators: Optional[Dict[str, float]] = None,
+                              rng: Optional[random.Random] = None) -> float:
         """
-        Calculate volatility score (simulated for now)
-        In production, this would analyze recent price movements
+        Volatility score in percent: realised volatility of recent candles,
+        or a simulated per-symbol value when there is no candle history
         """
+        if indicators:
+            return indicators['volatility']
+        
         base_volatility = {
             'BTCUSDT': 1.0,
             'ETHUSDT': 1.5,
@@ -138,26 +245,34 @@ class ScalpingSignalGenerator:
         }
         
         volatility = base_volatility.get(symbol, 1.5)
-        noise = random.uniform(-0.5, 0.5)
+        noise = (rng or self._rng(symbol, current_price)).uniform(-0.5, 0.5)
         
         return max(0.1, volatility + noise)
     
-    def _detect_trend(self, symbol: str, current_price: float) -> str:
+    def _detect_trend(self, symbol: str, current_price: float,
+                      indicators: Optional[Dict[str, float]] = None,
+                      rng: Optional[random.Random] = None) -> str:
         """
-        Detect price trend (simulated for now)
-        In production, this would use moving averages, RSI, MACD
+        Detect price trend from EMA crossover, MACD and RSI
+        (simulated when there is no candle history)
         """
+        if indicators:
+            return classify_trend(indicators)
+        
         trends = ['bullish', 'bearish', 'neutral']
         weights = [0.4, 0.3, 0.3]
         
-        return random.choices(trends, weights=weights)[0]
+        return (rng or self._rng(symbol, current_price)).choices(trends, weights=weights)[0]
     
-    def _check_volume_spike(self, symbol: str) -> bool:
+    def _check_volume_spike(self, symbol: str, indicators: Optional[Dict[str, float]] = None,
+                            rng: Optional[random.Random] = None) -> bool:
         """
-        Check for volume spike (simulated for now)
-        In production, this would analyze 24h volume changes
+        Check for volume spike: current candle volume 1.5x the recent average
+        (simulated when there is no candle history)
         """
-        return random.random() > 0.6
+        if indicators:
+            return indicators['volume_ratio'] > 1.5
+        return (rng or self.rng).random() > 0.6
     
     def format_signal_message(self, signal: Dict, lang: str = 'en') -> str:
         """Format signal as a beautiful message for Telegram"""
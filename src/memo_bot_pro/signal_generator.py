@@ -1,26 +1,47 @@
 from typing import Dict, List, Optional
 import random
+import zlib
+
+from .indicators import IndicatorEngine, classify_trend
 
 
 class SignalGenerator:
-    def __init__(self, binance_client):
+    def __init__(self, binance_client, indicator_engine: Optional[IndicatorEngine] = None,
+                 seed: Optional[int] = None, rng: Optional[random.Random] = None):
         self.client = binance_client
+        self.indicators = indicator_engine or IndicatorEngine()
+        # With a seed, simulated values depend only on (seed, symbol, price)
+        self.seed = seed
+        self.rng = rng if rng is not None else random.Random()
 
     def generate_signals(self, symbols: Optional[List[str]] = None) -> List[Dict]:
         if symbols is None:
             symbols = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT']
 
-        signals = []
-        for symbol in symbols:
-            price_data = self.client.get_price(symbol)
-            signal = self._analyze_price(symbol, float(price_data['price']))
-            signals.append(signal)
+        return self.generate_signals_from_prices([self.client.get_price(symbol) for symbol in symbols])
 
-        return signals
+    def generate_signals_from_prices(self, prices: List[Dict]) -> List[Dict]:
+        """Generate signals from already-fetched {'symbol', 'price'} tickers"""
+        indicators = self.indicators.compute({p['symbol']: float(p['price']) for p in prices})
+        return [
+            self._analyze_price(p['symbol'], float(p['price']), indicators.get(p['symbol']))
+            for p in prices
+        ]
 
-    def _analyze_price(self, symbol: str, price: float) -> Dict:
-        trend = random.choice(['bullish', 'bearish', 'neutral'])
-        strength = random.choice(['strong', 'moderate', 'weak'])
+    def _analyze_price(self, symbol: str, price: float, indicators: Optional[Dict[str, float]] = None) -> Dict:
+        """Classify one symbol from its indicators (None: no candle history, so simulated)"""
+        if indicators:
+            trend = classify_trend(indicators)
+            gap = abs(indicators['ema_gap_pct'])
+            strength = 'strong' if gap >= 0.3 else 'moderate' if gap >= 0.1 else 'weak'
+            # RSI far from 50 in the trend's direction raises confidence
+            conviction = min(abs(indicators['rsi'] - 50) / 30, 1.0)
+            confidence = 60 + int(round(conviction * 35))
+        else:
+            rng = self._rng(symbol, price)
+            trend = rng.choice(['bullish', 'bearish', 'neutral'])
+            strength = rng.choice(['strong', 'moderate', 'weak'])
+            confidence = rng.randint(60, 95)
         
         recommendation = 'HOLD'
         if trend == 'bullish' and strength in ['strong', 'moderate']:
@@ -34,17 +55,24 @@ class SignalGenerator:
             'trend': trend,
             'strength': strength,
             'recommendation': recommendation,
-            'confidence': random.randint(60, 95)
+            'confidence': confidence
         }
 
+    def _rng(self, symbol: str, price: float) -> random.Random:
+        """Source for simulated values: derived from the inputs when seeded, else self.rng"""
+        if self.seed is None:
+            return self.rng
+        return random.Random(zlib.crc32(f"{self.seed}:{symbol}:{price!r}".encode()))
+
     def analyze_all_symbols(self, market_data: List[Dict]) -> Dict[str, Dict]:
         """Analyze all symbols from market data and return signals keyed by symbol"""
         signals_dict = {}
+        indicators = self.indicators.compute({d['symbol']: float(d['price']) for d in market_data})
         
         for symbol_data in market_data:
             symbol = symbol_data['symbol']
             price = float(symbol_data['price'])
-            signal = self._analyze_price(symbol, price)
+            signal = self._analyze_price(symbol, price, indicators.get(symbol))
             
             signals_dict[symbol] = {
                 'action': signal['recommendation'].lower(),
@@ -0,0 +1,169 @@
+"""
+Signal Service for MeMo Bot Pro
+One versioned signal snapshot per market tick, shared by the bot, web API, reports and trading
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .binance_client import TOP_SYMBOLS, market_cache
+from .scalping_signals import ScalpingSignalGenerator
+from .signal_generator import SignalGenerator
+
+
+@dataclass
+class SignalSnapshot:
+    """Advisory and scalping signals computed once from one set of prices"""
+    version: int
+    market_version: Optional[int]  # MarketSnapshot.version the prices came from (None for pushed ticks)
+    created_at: float
+    prices: Dict[str, float]
+    signals: Dict[str, Dict] = field(default_factory=dict)
+    scalping: Dict[str, Dict] = field(default_factory=dict)
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    def signal_list(self, symbols: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Advisory signals in SignalGenerator.generate_signals() format"""
+        symbols = symbols if symbols is not None else ['BTCUSDT', 'ETHUSDT', 'BNBUSDT']
+        return [self.signals[s] for s in symbols if s in self.signals]
+
+    def scalping_list(self) -> List[Dict]:
+        return list(self.scalping.values())
+
+    def buy_signals(self, min_confidence: int = 75) -> List[Dict]:
+        return [
+            signal for signal in self.scalping.values()
+            if signal['action'] == 'BUY' and signal['confidence'] >= min_confidence
+        ]
+
+    def alert_signals(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """Signals in SignalGenerator.analyze_all_symbols() format"""
+        symbols = symbols if symbols is not None else self.signals
+        return {
+            s: {
+                'action': self.signals[s]['recommendation'].lower(),
+                'trend': self.signals[s]['trend'],
+                'strength': self.signals[s]['strength'],
+                'confidence': self.signals[s]['confidence']
+            }
+            for s in symbols if s in self.signals
+        }
+
+
+class SignalService:
+    """
+    Computes signals once per market tick and serves every consumer from it.
+
+    A tick is either a new all-tickers snapshot in market_cache (current() /
+    current_async()) or a batch of pushed prices (publish()). Between ticks
+    everyone gets the same SignalSnapshot, so a BUY in the Mini App is a BUY
+    in Telegram and on the trade confirmation screen.
+    """
+
+    def __init__(self, symbols: Optional[List[str]] = None,
+                 signal_generator: Optional[SignalGenerator] = None,
+                 scalping_generator: Optional[ScalpingSignalGenerator] = None):
+        self.symbols = list(symbols or TOP_SYMBOLS)
+        # Prices are supplied by the service, so the generators never fetch themselves
+        self.signal_generator = signal_generator or SignalGenerator(None)
+        self.scalping_generator = scalping_generator or ScalpingSignalGenerator(None)
+        self._prices: Dict[str, float] = {}
+        self._snapshot: Optional[SignalSnapshot] = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self.computes = 0
+        self.hits = 0
+
+    def configure(self, symbols: Optional[List[str]] = None, seed: Optional[int] = None,
+                  clock: Optional[Callable[[], float]] = None):
+        """Change tracked symbols, or make simulated signals reproducible with a seed (and clock)"""
+        with self._lock:
+            if symbols is not None:
+                self.symbols = list(symbols)
+            if seed is not None:
+                self.signal_generator.seed = seed
+                self.scalping_generator.seed = seed
+            if clock is not None:
+                self.scalping_generator.clock = clock
+            self._snapshot = None
+
+    def peek(self) -> Optional[SignalSnapshot]:
+        return self._snapshot
+
+    def publish(self, prices: Dict[str, float], market_version: Optional[int] = None,
+                tick_time: Optional[float] = None) -> SignalSnapshot:
+        """Merge pushed prices into the price book and compute a new snapshot (tick_time in epoch seconds)"""
+        with self._lock:
+            return self._compute(prices, market_version, tick_time)
+
+    def current(self, binance_client) -> SignalSnapshot:
+        """Snapshot for the latest market tick, fetched through the shared price cache"""
+        snapshot = self._fresh()
+        if snapshot is not None:
+            return snapshot
+        return self._from_market(binance_client.get_market_snapshot())
+
+    async def current_async(self, async_binance_client) -> SignalSnapshot:
+        snapshot = self._fresh()
+        if snapshot is not None:
+            return snapshot
+        return self._from_market(await async_binance_client.get_market_snapshot())
+
+    def stats(self) -> Dict:
+        snapshot = self._snapshot
+        requests = self.hits + self.computes
+        return {
+            'version': snapshot.version if snapshot else 0,
+            'market_version': snapshot.market_version if snapshot else None,
+            'age': round(snapshot.age, 3) if snapshot else None,
+            'symbols': len(self.symbols),
+            'computes': self.computes,
+            'hits': self.hits,
+            'hit_ratio': self.hits / requests if requests else 0.0
+        }
+
+    def _fresh(self) -> Optional[SignalSnapshot]:
+        # Pushed ticks arrive faster than the cache TTL; serve them until the next one is due
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.age < market_cache.ttl:
+            self.hits += 1
+            return snapshot
+        return None
+
+    def _from_market(self, market) -> SignalSnapshot:
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.market_version == market.version:
+                self.hits += 1
+                return snapshot
+            return self._compute(market.price_map, market.version)
+
+    def _compute(self, prices: Dict[str, float], market_version: Optional[int],
+                 tick_time: Optional[float] = None) -> SignalSnapshot:
+        for symbol in self.symbols:
+            if symbol in prices:
+                self._prices[symbol] = float(prices[symbol])
+
+        tickers = [{'symbol': s, 'price': self._prices[s]} for s in self.symbols if s in self._prices]
+        signals = self.signal_generator.generate_signals_from_prices(tickers)
+        scalping = self.scalping_generator.generate_signals_from_prices(tickers, tick_time)
+
+        self._version += 1
+        self.computes += 1
+        self._snapshot = SignalSnapshot(
+            version=self._version,
+            market_version=market_version,
+            created_at=time.monotonic(),
+            prices=dict(self._prices),
+            signals={s['symbol']: s for s in signals},
+            scalping={s['symbol']: s for s in scalping}
+        )
+        return self._snapshot
+
+
+# Shared by the bot, the web API, reports and trading commands in this process
+signal_service = SignalService()
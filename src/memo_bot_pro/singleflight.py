@@ -0,0 +1,83 @@
+"""
+Request Coalescing for MeMo Bot Pro
+Single-flight execution: concurrent identical calls share one in-flight result
+"""
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class _Call:
+    """One in-flight execution and the result its waiters will share"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[Exception] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight block until it finishes and receive the same result (or exception).
+    Nothing is cached afterwards - the next call after completion runs again.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+        self._per_key: Dict[str, Dict[str, int]] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.calls += 1
+            counters = self._per_key.setdefault(key, {'calls': 0, 'executions': 0})
+            counters['calls'] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.collapsed += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                counters['executions'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'executions': self.executions,
+                'collapsed': self.collapsed,
+                'collapse_ratio': self.collapsed / self.calls if self.calls else 0.0,
+                'in_flight': len(self._calls),
+                'keys': {key: dict(counters) for key, counters in self._per_key.items()}
+            }
+
+
+# Shared by the web API endpoints that hit Binance or compute signals
+single_flight = SingleFlight()
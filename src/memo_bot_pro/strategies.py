@@ -0,0 +1,174 @@
+"""
+Strategy Registry for MeMo Bot Pro
+Pluggable BUY/SELL/HOLD strategies evaluated together in one vectorised pass over symbols
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .indicators import INDICATOR_NAMES
+
+
+HOLD, BUY, SELL = 0, 1, -1
+ACTIONS = {BUY: 'BUY', SELL: 'SELL', HOLD: 'HOLD'}
+
+
+# Strategies see the indicators as {name: array over symbols} - the output of
+# indicators.latest_indicators() - and return one action code and confidence
+# per symbol. A strategy is a few array comparisons, so evaluating every
+# registered strategy costs far less than the indicator pass they share.
+
+
+def trend_codes(ind: Dict[str, np.ndarray]) -> np.ndarray:
+    """indicators.classify_trend() for every symbol at once: BUY (bullish), SELL (bearish) or HOLD"""
+    bullish = (ind['ema_gap_pct'] > 0) & (ind['macd_hist'] > 0) & (ind['rsi'] < 70)
+    bearish = (ind['ema_gap_pct'] < 0) & (ind['macd_hist'] < 0) & (ind['rsi'] > 30)
+    return np.where(bullish, BUY, np.where(bearish, SELL, HOLD))
+
+
+def trend_strength(ind: Dict[str, np.ndarray]) -> np.ndarray:
+    """0-1 trend strength; a 0.5% EMA gap or a 0.1% MACD histogram counts as full strength"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        strength = np.maximum(np.abs(ind['ema_gap_pct']) / 0.5,
+                              np.abs(ind['macd_hist']) / ind['price'] * 1000)
+    return np.clip(np.nan_to_num(strength), 0.0, 1.0)
+
+
+def scale(strength: np.ndarray, low: int, high: int) -> np.ndarray:
+    """Confidence within [low, high] by strength"""
+    return low + np.round(strength * (high - low)).astype(np.int64)
+
+
+class Strategy:
+    """
+    Base class for registered strategies.
+
+    Subclasses list the indicator names they read in `indicators` and
+    implement evaluate(); explain() gives the reasoning shown to users.
+    """
+    name = ''
+    indicators: Tuple[str, ...] = ()
+
+    def evaluate(self, ind: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """(action codes, confidences) with one entry per symbol"""
+        raise NotImplementedError
+
+    def explain(self, action: str, values: Dict[str, float]) -> str:
+        return f"{self.name}: {action}"
+
+
+class ScalpingStrategy(Strategy):
+    """Bullish trend + volatility + volume spike to buy; bearish trend + volatility to exit"""
+    name = 'scalping'
+    indicators = ('price', 'ema_gap_pct', 'macd_hist', 'rsi', 'volatility', 'volume_ratio')
+
+    def __init__(self, min_volatility: float = 0.5, volume_spike: float = 1.5):
+        self.min_volatility = min_volatility
+        self.volume_spike = volume_spike
+
+    def evaluate(self, ind):
+        trend = trend_codes(ind)
+        strength = trend_strength(ind)
+        volatile = ind['volatility'] > self.min_volatility
+        buy = (trend == BUY) & volatile & (ind['volume_ratio'] > self.volume_spike)
+        sell = ~buy & (trend == SELL) & volatile
+
+        action = np.where(buy, BUY, np.where(sell, SELL, HOLD))
+        confidence = np.where(buy, scale(strength, 75, 95),
+                              np.where(sell, scale(strength, 70, 90), scale(strength, 50, 70)))
+        return action, confidence
+
+    def explain(self, action, values):
+        volatility = values['volatility']
+        if action == 'BUY':
+            return f"Strong bullish trend detected with high volatility ({volatility:.1f}%) and volume spike"
+        if action == 'SELL':
+            return f"Bearish trend with high volatility ({volatility:.1f}%), good time to exit positions"
+        return f"Weak signals, waiting for better entry point (trend: {values['trend']}, volatility: {volatility:.1f}%)"
+
+
+class MeanReversionStrategy(Strategy):
+    """Buy closes below the lower Bollinger band with RSI oversold; sell above the upper band overbought"""
+    name = 'mean_reversion'
+    indicators = ('bb_percent_b', 'rsi')
+
+    def __init__(self, oversold: float = 30, overbought: float = 70):
+        self.oversold = oversold
+        self.overbought = overbought
+
+    def evaluate(self, ind):
+        percent_b, rsi = ind['bb_percent_b'], ind['rsi']
+        buy = (percent_b < 0) & (rsi < self.oversold)
+        sell = (percent_b > 1) & (rsi > self.overbought)
+        action = np.where(buy, BUY, np.where(sell, SELL, HOLD))
+
+        # Further outside the band means a stronger pull back to the mean
+        stretch = np.clip(np.where(buy, -percent_b, np.where(sell, percent_b - 1, 0.0)) * 2, 0.0, 1.0)
+        confidence = np.where(action != HOLD, scale(stretch, 70, 90), 50)
+        return action, confidence
+
+    def explain(self, action, values):
+        if action == 'BUY':
+            return f"Price below the lower Bollinger band with RSI {values['rsi']:.0f}, expecting a bounce"
+        if action == 'SELL':
+            return f"Price above the upper Bollinger band with RSI {values['rsi']:.0f}, expecting a pullback"
+        return "Price inside the Bollinger bands"
+
+
+class StrategyRegistry:
+    """
+    Named strategies evaluated together on one set of indicator vectors.
+
+    The indicators are computed once per tick for all symbols; evaluate()
+    hands each strategy only the columns it declared, so adding a strategy
+    adds neither price fetches nor indicator work.
+    """
+
+    def __init__(self, strategies: Iterable[Strategy] = ()):
+        self._strategies: Dict[str, Strategy] = {}
+        for strategy in strategies:
+            self.register(strategy)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._strategies
+
+    def __len__(self) -> int:
+        return len(self._strategies)
+
+    def register(self, strategy: Strategy) -> Strategy:
+        """Add (or replace) a strategy; its declared indicators must exist"""
+        unknown = set(strategy.indicators) - set(INDICATOR_NAMES)
+        if unknown:
+            raise ValueError(f"Strategy {strategy.name} needs unknown indicators: {', '.join(sorted(unknown))}")
+        self._strategies[strategy.name] = strategy
+        return strategy
+
+    def unregister(self, name: str):
+        self._strategies.pop(name, None)
+
+    def get(self, name: str) -> Optional[Strategy]:
+        return self._strategies.get(name)
+
+    def names(self) -> List[str]:
+        return list(self._strategies)
+
+    @property
+    def indicators(self) -> List[str]:
+        """Union of the indicators the registered strategies read"""
+        needed = []
+        for strategy in self._strategies.values():
+            needed.extend(name for name in strategy.indicators if name not in needed)
+        return needed
+
+    def evaluate(self, symbols: List[str], ind: Dict[str, np.ndarray]) -> Dict[str, Dict[str, Dict]]:
+        """{symbol: {strategy: {'action', 'confidence'}}} for every symbol and strategy"""
+        results = {symbol: {} for symbol in symbols}
+        for name, strategy in self._strategies.items():
+            codes, confidence = strategy.evaluate({key: ind[key] for key in strategy.indicators})
+            for symbol, code, value in zip(symbols, codes.tolist(), confidence.tolist()):
+                results[symbol][name] = {'action': ACTIONS[code], 'confidence': int(value)}
+        return results
+
+
+# Strategies every ScalpingSignalGenerator evaluates unless given its own registry
+strategy_registry = StrategyRegistry([ScalpingStrategy(), MeanReversionStrategy()])
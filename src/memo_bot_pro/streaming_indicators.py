@@ -0,0 +1,294 @@
+"""
+Streaming Indicators for MeMo Bot Pro
+Constant-time per-tick EMA, RSI, rolling mean/variance and rolling min/max
+"""
+import json
+import math
+import os
+from collections import deque
+from typing import Dict, List, Optional
+
+
+# Each indicator consumes one price per update() in O(1) time and memory that
+# is bounded by its window, however long the stream runs. snapshot() returns
+# plain JSON-serialisable data and restore() resumes from it exactly.
+
+
+class StreamingEMA:
+    """Exponential moving average with alpha = 2 / (period + 1), seeded with the first value"""
+
+    def __init__(self, period: int, alpha: Optional[float] = None):
+        self.period = period
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self.value: Optional[float] = None
+
+    def update(self, x: float) -> float:
+        if self.value is None:
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+    def snapshot(self) -> Dict:
+        return {'value': self.value}
+
+    def restore(self, state: Dict):
+        self.value = state['value']
+
+
+class StreamingRSI:
+    """Wilder RSI (0-100) from successive prices; 50 until the first move"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._gain = StreamingEMA(period, alpha=1.0 / period)
+        self._loss = StreamingEMA(period, alpha=1.0 / period)
+        self._last: Optional[float] = None
+
+    @property
+    def value(self) -> float:
+        gain, loss = self._gain.value or 0.0, self._loss.value or 0.0
+        if loss == 0:
+            return 100.0 if gain > 0 else 50.0
+        return 100 - 100 / (1 + gain / loss)
+
+    def update(self, price: float) -> float:
+        if self._last is not None:
+            delta = price - self._last
+            self._gain.update(max(delta, 0.0))
+            self._loss.update(max(-delta, 0.0))
+        self._last = price
+        return self.value
+
+    def snapshot(self) -> Dict:
+        return {'last': self._last, 'gain': self._gain.value, 'loss': self._loss.value}
+
+    def restore(self, state: Dict):
+        self._last = state['last']
+        self._gain.value = state['gain']
+        self._loss.value = state['loss']
+
+
+class RollingStats:
+    """Mean and variance over the last window values (Welford's update, with removal)"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values: deque = deque()
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def variance(self) -> float:
+        n = len(self._values)
+        return max(self._m2 / n, 0.0) if n else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def update(self, x: float):
+        self._values.append(x)
+        n = len(self._values)
+        delta = x - self.mean
+        self.mean += delta / n
+        self._m2 += delta * (x - self.mean)
+
+        if n > self.window:
+            old = self._values.popleft()
+            n -= 1
+            delta = old - self.mean
+            self.mean -= delta / n
+            self._m2 -= delta * (old - self.mean)
+
+    def snapshot(self) -> Dict:
+        return {'values': list(self._values), 'mean': self.mean, 'm2': self._m2}
+
+    def restore(self, state: Dict):
+        self._values = deque(state['values'][-self.window:])
+        if len(state['values']) > self.window:
+            # Window shrank since the snapshot: recompute from the retained values
+            self.mean, self._m2 = 0.0, 0.0
+            values, self._values = list(self._values), deque()
+            for x in values:
+                self.update(x)
+        else:
+            self.mean = state['mean']
+            self._m2 = state['m2']
+
+
+class RollingExtrema:
+    """Minimum and maximum over the last window values using monotonic deques"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._count = 0
+        self._min: deque = deque()  # (index, value), values increasing
+        self._max: deque = deque()  # (index, value), values decreasing
+
+    @property
+    def min(self) -> Optional[float]:
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self) -> Optional[float]:
+        return self._max[0][1] if self._max else None
+
+    def update(self, x: float):
+        index = self._count
+        self._count += 1
+        while self._min and self._min[-1][1] >= x:
+            self._min.pop()
+        self._min.append((index, x))
+        while self._max and self._max[-1][1] <= x:
+            self._max.pop()
+        self._max.append((index, x))
+
+        expired = index - self.window
+        if self._min[0][0] <= expired:
+            self._min.popleft()
+        if self._max[0][0] <= expired:
+            self._max.popleft()
+
+    def snapshot(self) -> Dict:
+        return {'count': self._count, 'min': [list(e) for e in self._min], 'max': [list(e) for e in self._max]}
+
+    def restore(self, state: Dict):
+        self._count = state['count']
+        expired = self._count - 1 - self.window
+        self._min = deque((i, v) for i, v in state['min'] if i > expired)
+        self._max = deque((i, v) for i, v in state['max'] if i > expired)
+
+
+class SymbolIndicators:
+    """The streaming indicator set kept for one symbol"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, rsi_period: int = 14, window: int = 300):
+        self.ema_fast = StreamingEMA(fast)
+        self.ema_slow = StreamingEMA(slow)
+        self.rsi = StreamingRSI(rsi_period)
+        self.stats = RollingStats(window)
+        self.extrema = RollingExtrema(window)
+        self.price: Optional[float] = None
+        self.updates = 0
+
+    def update(self, price: float):
+        self.price = price
+        self.updates += 1
+        self.ema_fast.update(price)
+        self.ema_slow.update(price)
+        self.rsi.update(price)
+        self.stats.update(price)
+        self.extrema.update(price)
+
+    def values(self) -> Dict[str, float]:
+        price = self.price or 0.0
+        return {
+            'price': price,
+            'ema_fast': self.ema_fast.value,
+            'ema_slow': self.ema_slow.value,
+            'ema_gap_pct': (self.ema_fast.value - self.ema_slow.value) / price * 100 if price else 0.0,
+            'rsi': self.rsi.value,
+            'mean': self.stats.mean,
+            'std': self.stats.std,
+            'zscore': (price - self.stats.mean) / self.stats.std if self.stats.std > 0 else 0.0,
+            'min': self.extrema.min,
+            'max': self.extrema.max,
+            'samples': len(self.stats),
+        }
+
+    def snapshot(self) -> Dict:
+        return {
+            'price': self.price,
+            'updates': self.updates,
+            'ema_fast': self.ema_fast.snapshot(),
+            'ema_slow': self.ema_slow.snapshot(),
+            'rsi': self.rsi.snapshot(),
+            'stats': self.stats.snapshot(),
+            'extrema': self.extrema.snapshot(),
+        }
+
+    def restore(self, state: Dict):
+        self.price = state['price']
+        self.updates = state['updates']
+        self.ema_fast.restore(state['ema_fast'])
+        self.ema_slow.restore(state['ema_slow'])
+        self.rsi.restore(state['rsi'])
+        self.stats.restore(state['stats'])
+        self.extrema.restore(state['extrema'])
+
+
+class StreamingIndicatorBook:
+    """
+    Per-symbol streaming indicators fed one price at a time.
+
+    Windows are counted in updates (ticks), not candles, so with 1-second
+    polling the default window of 300 covers the last five minutes.
+    """
+
+    def __init__(self, fast: int = 12, slow: int = 26, rsi_period: int = 14, window: int = 300):
+        self.params = {'fast': fast, 'slow': slow, 'rsi_period': rsi_period, 'window': window}
+        self._symbols: Dict[str, SymbolIndicators] = {}
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._symbols
+
+    def update(self, symbol: str, price: float):
+        indicators = self._symbols.get(symbol)
+        if indicators is None:
+            indicators = self._symbols[symbol] = SymbolIndicators(**self.params)
+        indicators.update(price)
+
+    def get(self, symbol: str) -> Optional[Dict[str, float]]:
+        indicators = self._symbols.get(symbol)
+        return indicators.values() if indicators else None
+
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def snapshot(self) -> Dict:
+        return {
+            'params': dict(self.params),
+            'symbols': {symbol: s.snapshot() for symbol, s in self._symbols.items()}
+        }
+
+    def restore(self, state: Dict):
+        """Resume from snapshot(); state taken with other parameters is adapted to the current ones"""
+        self._symbols = {}
+        for symbol, symbol_state in state.get('symbols', {}).items():
+            indicators = SymbolIndicators(**self.params)
+            indicators.restore(symbol_state)
+            self._symbols[symbol] = indicators
+
+    def save(self, path: str):
+        """Write snapshot() to path atomically"""
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error saving indicator state: {e}")
+
+    def load(self, path: str) -> bool:
+        """Restore from a file written by save(); returns False if there was nothing usable"""
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path) as f:
+                self.restore(json.load(f))
+            return True
+        except Exception as e:
+            print(f"Error loading indicator state: {e}")
+            self._symbols = {}
+            return False
+
+    def stats(self) -> Dict:
+        return {
+            'symbols': len(self._symbols),
+            'window': self.params['window'],
+            'updates': sum(s.updates for s in self._symbols.values())
+        }
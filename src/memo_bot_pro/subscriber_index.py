@@ -0,0 +1,213 @@
+"""
+Subscriber Index for MeMo Bot Pro
+Signal subscribers bucketed by (symbol, confidence threshold, language) for per-tick lookups
+"""
+import math
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+@dataclass(frozen=True)
+class Subscriber:
+    """Who gets a signal: symbols=None means every symbol, min_confidence=0 every signal"""
+    user_id: int
+    language: str = 'en'
+    min_confidence: int = 0
+    symbols: Optional[FrozenSet[str]] = None
+    min_change_percent: Optional[float] = None  # Own minimum price move for alerts
+    digest_seconds: Optional[int] = None  # Alert digest window (None = configured default, 0 = instant)
+
+    @classmethod
+    def from_rows(cls, user: Dict, trading_config: Optional[Dict] = None) -> 'Subscriber':
+        """From a users row and, if the user has one, their trading_config row"""
+        digest_seconds = user.get('alert_digest_seconds')
+        if not trading_config:
+            return cls(user['user_id'], user.get('language') or 'en', digest_seconds=digest_seconds)
+        symbols = trading_config.get('enabled_symbols')
+        min_change = trading_config.get('alert_change_percent')
+        if isinstance(symbols, str):
+            symbols = [s.strip().upper() for s in symbols.split(',') if s.strip()]
+        return cls(
+            user_id=user['user_id'],
+            language=user.get('language') or 'en',
+            min_confidence=int(math.ceil(float(trading_config.get('min_confidence') or 0))),
+            symbols=frozenset(symbols) if symbols else None,
+            min_change_percent=float(min_change) if min_change else None,
+            digest_seconds=digest_seconds
+        )
+
+
+# Bucket key: (symbol, language), with symbol None for subscribers to every symbol
+BucketKey = Tuple[Optional[str], str]
+
+
+class SubscriberIndex:
+    """
+    Subscribers grouped into buckets by symbol and language, and within a
+    bucket by confidence threshold.
+
+    lookup() walks only the thresholds at or below a signal's confidence in
+    the buckets for its symbol, so the cost of finding recipients follows
+    the number of interested users rather than the number of subscribers.
+    """
+
+    def __init__(self, subscribers: Iterable[Subscriber] = ()):
+        self._subscribers: Dict[int, Subscriber] = {}
+        self._buckets: Dict[BucketKey, Dict[int, Set[int]]] = {}
+        self._thresholds: Dict[BucketKey, List[int]] = {}
+        self._languages: Dict[Optional[str], Set[str]] = {}
+        self.lookups = 0
+        self.matched = 0
+        self.rebuild(subscribers)
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._subscribers
+
+    def get(self, user_id: int) -> Optional[Subscriber]:
+        return self._subscribers.get(user_id)
+
+    def subscribers(self) -> List[Subscriber]:
+        return list(self._subscribers.values())
+
+    def rebuild(self, subscribers: Iterable[Subscriber]):
+        self._subscribers, self._buckets, self._thresholds, self._languages = {}, {}, {}, {}
+        for subscriber in subscribers:
+            self.add(subscriber)
+
+    def add(self, subscriber: Subscriber):
+        """Insert a subscriber, replacing any earlier entry for the same user"""
+        self.remove(subscriber.user_id)
+        self._subscribers[subscriber.user_id] = subscriber
+        for key in self._keys(subscriber):
+            thresholds = self._buckets.setdefault(key, {})
+            if subscriber.min_confidence not in thresholds:
+                thresholds[subscriber.min_confidence] = set()
+                self._thresholds[key] = sorted(thresholds)
+            thresholds[subscriber.min_confidence].add(subscriber.user_id)
+            self._languages.setdefault(key[0], set()).add(key[1])
+
+    def remove(self, user_id: int):
+        subscriber = self._subscribers.pop(user_id, None)
+        if subscriber is None:
+            return
+        for key in self._keys(subscriber):
+            thresholds = self._buckets[key]
+            users = thresholds[subscriber.min_confidence]
+            users.discard(user_id)
+            if users:
+                continue
+            del thresholds[subscriber.min_confidence]
+            if thresholds:
+                self._thresholds[key] = sorted(thresholds)
+            else:
+                del self._buckets[key], self._thresholds[key]
+                self._languages[key[0]].discard(key[1])
+                if not self._languages[key[0]]:
+                    del self._languages[key[0]]
+
+    def lookup(self, symbol: str, confidence: float, language: Optional[str] = None) -> Set[int]:
+        """Users who want a signal for symbol at this confidence (optionally only one language)"""
+        self.lookups += 1
+        users: Set[int] = set()
+        for bucket_symbol in (symbol, None):
+            languages = (language,) if language else self._languages.get(bucket_symbol, ())
+            for lang in languages:
+                key = (bucket_symbol, lang)
+                thresholds = self._thresholds.get(key)
+                if not thresholds:
+                    continue
+                bucket = self._buckets[key]
+                for threshold in thresholds[:bisect_right(thresholds, confidence)]:
+                    users |= bucket[threshold]
+        self.matched += len(users)
+        return users
+
+    def match(self, confidences: Dict[str, float]) -> Dict[int, List[str]]:
+        """For one tick of {symbol: signal confidence}, the symbols each interested user should get"""
+        recipients: Dict[int, List[str]] = {}
+        for symbol, confidence in confidences.items():
+            for user_id in self.lookup(symbol, confidence):
+                recipients.setdefault(user_id, []).append(symbol)
+        return recipients
+
+    def stats(self) -> Dict:
+        return {
+            'subscribers': len(self._subscribers),
+            'buckets': sum(len(thresholds) for thresholds in self._buckets.values()),
+            'filtered': sum(1 for s in self._subscribers.values() if s.symbols is not None or s.min_confidence),
+            'lookups': self.lookups,
+            'matched': self.matched
+        }
+
+    @staticmethod
+    def _keys(subscriber: Subscriber) -> List[BucketKey]:
+        if subscriber.symbols is None:
+            return [(None, subscriber.language)]
+        return [(symbol, subscriber.language) for symbol in subscriber.symbols]
+
+
+class SubscriberRoster:
+    """
+    A SubscriberIndex kept in memory over the user store.
+
+    The full roster is read once; settings writes are applied with
+    upsert()/remove() as they happen, and a full reload every
+    reconcile_interval picks up anything changed behind the bot's back
+    (another process, manual edits, trading_config updates). drift counts
+    the subscribers a reconcile had to add, drop or change.
+    """
+
+    def __init__(self, load: Callable[[], Iterable[Subscriber]], reconcile_interval: float = 600.0):
+        self.index = SubscriberIndex()
+        self._load = load
+        self.reconcile_interval = reconcile_interval
+        self._loaded_at: Optional[float] = None
+        self.reconciles = 0
+        self.updates = 0
+        self.drift = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def current(self) -> SubscriberIndex:
+        """The index, loading it on first use and reconciling it when due"""
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.reconcile_interval:
+            self.reconcile()
+        return self.index
+
+    def reconcile(self):
+        subscribers = {s.user_id: s for s in self._load()}
+        if self._loaded_at is not None:
+            self.reconciles += 1
+            before = {s.user_id: s for s in self.index.subscribers()}
+            self.drift += sum(1 for user_id in before.keys() | subscribers.keys()
+                              if before.get(user_id) != subscribers.get(user_id))
+        self.index.rebuild(subscribers.values())
+        self._loaded_at = time.monotonic()
+
+    def get(self, user_id: int) -> Optional[Subscriber]:
+        return self.index.get(user_id)
+
+    def upsert(self, subscriber: Subscriber):
+        self.index.add(subscriber)
+        self.updates += 1
+
+    def remove(self, user_id: int):
+        self.index.remove(user_id)
+        self.updates += 1
+
+    def stats(self) -> Dict:
+        stats = self.index.stats()
+        stats.update({
+            'age': time.monotonic() - self._loaded_at if self._loaded_at is not None else None,
+            'reconciles': self.reconciles,
+            'updates': self.updates,
+            'drift': self.drift
+        })
+        return stats
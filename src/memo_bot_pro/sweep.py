@@ -0,0 +1,231 @@
+"""
+Parameter Sweep for MeMo Bot Pro
+Grid and random search over scalping risk parameters, backtested in parallel on shared-memory candles
+"""
+import csv
+import itertools
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .backtest import BacktestParams, run_backtest
+
+
+CANDLE_FIELDS = {
+    'open_time': np.int64,
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.float64,
+}
+
+DEFAULT_SPACE = {
+    'stop_loss_percent': [0.3, 0.5, 0.75, 1.0],
+    'take_profit_min': [0.5, 1.0, 1.5],
+    'take_profit_max': [1.0, 2.0, 3.0],
+    'min_confidence': [75, 80, 85, 90],
+}
+
+# Stats where smaller is better when ranking
+ASCENDING_METRICS = {'max_drawdown_pct'}
+
+
+class SharedHistory:
+    """
+    Candle columns for many symbols packed into one shared-memory block per field.
+
+    Workers attach by block name and get zero-copy NumPy views, so the price
+    data exists once in memory however many processes read it.
+    """
+
+    def __init__(self, history: Dict[str, Dict[str, np.ndarray]]):
+        self.offsets: Dict[str, Tuple[int, int]] = {}
+        position = 0
+        for symbol, candles in history.items():
+            length = len(candles['open_time'])
+            self.offsets[symbol] = (position, position + length)
+            position += length
+
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        for name, dtype in CANDLE_FIELDS.items():
+            size = max(position * np.dtype(dtype).itemsize, 1)
+            block = shared_memory.SharedMemory(create=True, size=size)
+            self._blocks[name] = block
+            column = np.ndarray((position,), dtype=dtype, buffer=block.buf)
+            for symbol, (start, end) in self.offsets.items():
+                column[start:end] = history[symbol][name]
+
+    @property
+    def layout(self) -> Dict:
+        """Picklable description that attach() turns back into views"""
+        return {
+            'blocks': {name: block.name for name, block in self._blocks.items()},
+            'offsets': dict(self.offsets),
+        }
+
+    @staticmethod
+    def attach(layout: Dict) -> Tuple[List[shared_memory.SharedMemory], Dict[str, Dict[str, np.ndarray]]]:
+        total = max((end for _, end in layout['offsets'].values()), default=0)
+        blocks, columns = [], {}
+        for name, block_name in layout['blocks'].items():
+            block = shared_memory.SharedMemory(name=block_name)
+            blocks.append(block)
+            columns[name] = np.ndarray((total,), dtype=CANDLE_FIELDS[name], buffer=block.buf)
+        history = {
+            symbol: {name: column[start:end] for name, column in columns.items()}
+            for symbol, (start, end) in layout['offsets'].items()
+        }
+        return blocks, history
+
+    def close(self):
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks = {}
+
+
+def grid(space: Dict[str, Sequence]) -> List[Dict]:
+    """Every combination of the listed values"""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+
+def random_search(space: Dict[str, Sequence], samples: int, seed: int = 42) -> List[Dict]:
+    """
+    samples random combinations. A (low, high) tuple is sampled uniformly
+    (as an int if both ends are ints); a list is sampled from its items.
+    """
+    rng = random.Random(seed)
+    combinations = []
+    for _ in range(samples):
+        combination = {}
+        for name, values in space.items():
+            if isinstance(values, tuple) and len(values) == 2:
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    combination[name] = rng.randint(low, high)
+                else:
+                    combination[name] = round(rng.uniform(low, high), 4)
+            else:
+                combination[name] = rng.choice(list(values))
+        combinations.append(combination)
+    return combinations
+
+
+def symbol_sets(symbols: List[str]) -> List[Tuple[str, ...]]:
+    """All symbols together plus each symbol on its own"""
+    sets = [tuple(symbols)]
+    if len(symbols) > 1:
+        sets.extend((symbol,) for symbol in symbols)
+    return sets
+
+
+def is_valid(combination: Dict) -> bool:
+    return combination.get('take_profit_min', 0) <= combination.get('take_profit_max', float('inf'))
+
+
+# Per-worker state, set up once by _init_worker
+_worker_blocks: List[shared_memory.SharedMemory] = []
+_worker_history: Dict[str, Dict[str, np.ndarray]] = {}
+_worker_features: Dict = {}
+
+
+def _init_worker(layout: Dict):
+    global _worker_blocks, _worker_history
+    _worker_blocks, _worker_history = SharedHistory.attach(layout)
+
+
+def _evaluate(task: Tuple[Dict, Dict]) -> Dict:
+    combination, base = task
+    overrides = {name: value for name, value in combination.items() if name != 'symbols'}
+    params = BacktestParams(**{**base, **overrides})
+    symbols = combination.get('symbols') or tuple(_worker_history)
+    history = {symbol: _worker_history[symbol] for symbol in symbols if symbol in _worker_history}
+    stats = run_backtest(history, params, feature_cache=_worker_features).stats
+
+    row = dict(combination)
+    row['symbols'] = ','.join(symbols)
+    for name in ('trades', 'win_rate', 'total_pnl', 'return_pct', 'profit_factor',
+                 'max_drawdown_pct', 'sharpe', 'avg_hold_bars', 'total_fees'):
+        row[name] = stats[name]
+    return row
+
+
+def run_sweep(history: Dict[str, Dict[str, np.ndarray]], combinations: List[Dict],
+              base_params: Optional[BacktestParams] = None, processes: Optional[int] = None,
+              rank_by: str = 'sharpe', min_trades: int = 1) -> List[Dict]:
+    """
+    Backtest each combination (a dict of BacktestParams overrides, plus an
+    optional 'symbols' tuple) and return result rows ranked by rank_by.
+    Combinations with fewer than min_trades trades are ranked last.
+    """
+    base = asdict(base_params or BacktestParams())
+    tasks = [(combination, base) for combination in combinations if is_valid(combination)]
+    processes = processes or os.cpu_count() or 1
+
+    shared = SharedHistory(history)
+    try:
+        if processes <= 1 or len(tasks) <= 1:
+            _init_worker(shared.layout)
+            rows = [_evaluate(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                     initargs=(shared.layout,)) as pool:
+                rows = list(pool.map(_evaluate, tasks, chunksize=max(1, len(tasks) // (processes * 4))))
+    finally:
+        _release_worker()
+        shared.close()
+
+    return rank(rows, rank_by, min_trades)
+
+
+def _release_worker():
+    global _worker_blocks, _worker_history, _worker_features
+    _worker_history, _worker_features = {}, {}
+    for block in _worker_blocks:
+        block.close()
+    _worker_blocks = []
+
+
+def rank(rows: List[Dict], rank_by: str = 'sharpe', min_trades: int = 1) -> List[Dict]:
+    descending = rank_by not in ASCENDING_METRICS
+
+    def key(row):
+        value = row[rank_by]
+        # P&L breaks ties, e.g. Sharpe is 0 for every row on less than two days of data
+        return (row['trades'] >= min_trades, value if descending else -value, row['total_pnl'])
+
+    ranked = sorted(rows, key=key, reverse=True)
+    for position, row in enumerate(ranked, 1):
+        row['rank'] = position
+    return ranked
+
+
+def to_trading_config(row: Dict) -> Dict:
+    """A result row as database.trading_config column values"""
+    return {
+        'stop_loss_percent': row.get('stop_loss_percent'),
+        'take_profit_percent': round((row.get('take_profit_min', 0) + row.get('take_profit_max', 0)) / 2, 2),
+        'min_confidence': row.get('min_confidence'),
+        'enabled_symbols': row['symbols'].split(','),
+    }
+
+
+def export_results(rows: List[Dict], path: str):
+    """Write ranked rows to CSV, or JSON when path ends in .json"""
+    if path.endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump(rows, f, indent=2)
+        return
+    names = ['rank'] + [name for name in (rows[0] if rows else {}) if name != 'rank']
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=names)
+        writer.writeheader()
+        writer.writerows(rows)
@@ -1,7 +1,9 @@
 import asyncio
+import dataclasses
+import itertools
 import os
-import requests
-from typing import Optional
+import time
+from typing import Callable, Dict, Optional
 from datetime import datetime
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
@@ -15,8 +17,22 @@ from telegram.ext import (
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from .config import Config
-from .binance_client import BinanceClient
+from .binance_client import AsyncBinanceClient, BinanceClient, TOP_SYMBOLS, market_cache, weight_governor
+from .bar_aggregator import bar_aggregator
+from .candle_store import candle_store
+from .exchange_info import symbol_filters
+from .http_transport import shared_transport
+from .tick_replay import TickRecorder, create_replay_from_config
+from .market_stream import BINANCE_MINI_TICKER_URL, MiniTickerStream, MockTickerServer
 from .signal_generator import SignalGenerator
+from .signal_service import signal_service
+from .subscriber_index import Subscriber, SubscriberIndex, SubscriberRoster
+from .alert_thresholds import alert_thresholds, next_alert_change
+from .alert_digest import AlertDigest, next_digest_window
+from .fanout import FanoutResult, fanout
+from .message_cache import message_cache
+from .outbound import PRIORITY_ALERT, PRIORITY_BULK, PRIORITY_SUMMARY
+from .outbox import OutboxSender, active_senders, create_outbox, outbound_messages
 from .scalping_signals import ScalpingSignalGenerator
 from .translations import get_text, to_arabic_numerals
 from .database import Database
@@ -24,11 +40,24 @@ from .trading_commands import TradingCommands
 from .user_storage import UserStorage
 from .reports import ReportGenerator
 from .profit_calculator import ProfitCalculator
+from .streaming_indicators import StreamingIndicatorBook
 
 
 class EnhancedTelegramBot:
-    def __init__(self, config: Config, binance_client: BinanceClient = None, database: Database = None, trading_commands: TradingCommands = None):
+    def __init__(self, config: Config, binance_client: BinanceClient = None, database: Database = None, trading_commands: TradingCommands = None, async_binance_client: AsyncBinanceClient = None):
         self.config = config
+        market_cache.configure(ttl=config.price_cache_ttl, stale_ttl=config.price_cache_stale_ttl)
+        shared_transport.configure(
+            pool_maxsize=config.http_pool_size,
+            per_host_limit=config.http_per_host_limit,
+            dns_cache_ttl=config.http_dns_cache_ttl
+        )
+        weight_governor.configure(weight_limit=config.binance_weight_limit)
+        symbol_filters.configure(
+            cache_path=config.exchange_info_cache_path,
+            refresh_interval=config.exchange_info_refresh_hours * 3600
+        )
+        candle_store.configure(root=config.candle_store_path)
         
         # Use injected dependencies or create new ones
         if binance_client:
@@ -37,11 +66,23 @@ class EnhancedTelegramBot:
             self.binance_client = BinanceClient(
                 api_key=config.binance_api_key,
                 api_secret=config.binance_api_secret,
-                mock=config.mock_mode
+                mock=config.mock_mode,
+                replay=create_replay_from_config(config) if config.mock_mode else None
             )
         
-        self.signal_generator = SignalGenerator(self.binance_client)
-        self.scalping_signals = ScalpingSignalGenerator(self.binance_client)
+        # Coroutines must never block the bot loop on HTTP - they await this client instead
+        self.async_client = async_binance_client or AsyncBinanceClient.from_client(self.binance_client)
+        
+        # Tick replay drives mock prices on a virtual clock; alert timing follows that clock
+        self.replay = getattr(self.binance_client.client, 'replay', None)
+        self.tick_interval = 1.0 / self.replay.clock.speed if self.replay and self.replay.clock.speed > 0 else 1.0
+        self.tick_recorder = TickRecorder(config.tick_record_path) if config.tick_record_path else None
+        
+        self.signal_generator = SignalGenerator(self.binance_client, seed=config.signal_seed)
+        self.scalping_signals = ScalpingSignalGenerator(
+            self.binance_client, seed=config.signal_seed,
+            clock=self.replay.clock.time if self.replay else None
+        )
         
         # Use injected database or fallback to UserStorage for backward compatibility
         self.database = database
@@ -50,8 +91,23 @@ class EnhancedTelegramBot:
         # Use injected trading commands or fallback to None
         self.trading_commands = trading_commands
         
-        self.report_generator = ReportGenerator(self.binance_client, self.signal_generator)
+        # Every signal shown to users comes from one snapshot per market tick
+        self.signal_service = signal_service
+        self.signal_service.configure(
+            seed=config.signal_seed,
+            clock=self.replay.clock.time if self.replay else None
+        )
+        
+        # 1m/5m/15m/1h bars built from the same ticks; scalping signals follow their closes
+        self.bar_aggregator = bar_aggregator
+        self.signal_service.scalping_generator.attach_bars(self.bar_aggregator)
+        
+        self.report_generator = ReportGenerator(self.binance_client, self.signal_generator, self.signal_service)
         self.profit_calculator = ProfitCalculator()
+        # O(1)-per-tick EMA/RSI/rolling stats, resumed from the last snapshot
+        self.streaming_indicators = StreamingIndicatorBook()
+        if config.indicator_state_path:
+            self.streaming_indicators.load(config.indicator_state_path)
         self.scheduler = AsyncIOScheduler()
         self.app = None
         self.auto_notifications_enabled = True
@@ -59,9 +115,39 @@ class EnhancedTelegramBot:
         self.last_alert_time = {}  # Track last alert time per symbol to prevent spam
         self.last_2hour_prices = {}  # Track prices for 2-hour summary comparison
         self.price_monitor_running = False
+        self.price_stream = None
         self.summary_monitor_running = False
         self.alert_cooldown_seconds = 300  # 5 minutes cooldown per symbol
-        self.price_change_threshold = 0.0  # 0% = alert on ANY price change
+        # Every wave of messages goes through one Telegram rate budget
+        self.fanout = fanout
+        self.fanout.configure(
+            rate=config.telegram_rate_limit,
+            per_chat_interval=config.telegram_per_chat_interval,
+            concurrency=config.telegram_fanout_concurrency
+        )
+        # Waves are queued durably (one bulk insert) and drained by sender workers
+        self.outbox = create_outbox(self.database, config.outbox_path) if config.outbox_enabled else None
+        self.outbox_senders = []
+        # Run by the senders when a queued message of that kind (dedupe key prefix) is delivered;
+        # registered up front so messages queued before a restart are still reported
+        self._delivery_callbacks: Dict[str, Callable] = {'welcome': self._welcomed}
+        # Alert and summary text is rendered once per (template, language, wave)
+        self.message_cache = message_cache
+        self._render_version = itertools.count(1)
+        # Moves must clear a volatility-adaptive band per symbol (see alert_thresholds)
+        self.alert_thresholds = alert_thresholds
+        self.alert_thresholds.configure(
+            sigma=config.alert_sigma,
+            min_change_percent=config.alert_min_change_percent,
+            symbol_overrides=config.alert_symbol_thresholds
+        )
+        # Alerts for users with a digest window are merged into one message per window
+        self.alert_digest = AlertDigest()
+        self.alert_digest_seconds = config.alert_digest_seconds
+        self._latest_alert_signals = {}
+        # Alert subscribers bucketed by symbol/confidence/language: loaded once, patched on
+        # settings writes, reconciled with storage every subscriber_reconcile_interval
+        self.subscriber_roster = SubscriberRoster(self._load_subscribers, config.subscriber_reconcile_interval)
     
     def is_admin(self, user_id: int) -> bool:
         """Check if a user is an admin"""
@@ -81,6 +167,7 @@ class EnhancedTelegramBot:
             self.database.save_user(user_id, username, settings)
         else:
             self.user_storage.save_user_settings(user_id, username, settings)
+        self._update_subscriber(user_id, settings)
     
     def _update_last_activity(self, user_id: int):
         """Update user activity in database or user_storage"""
@@ -89,14 +176,71 @@ class EnhancedTelegramBot:
         else:
             self.user_storage.update_last_activity(user_id)
     
+    def _user_digest_window(self, settings) -> float:
+        """Digest window from a user's stored settings, falling back to the configured default"""
+        window = settings.get('alert_digest_seconds') if settings else None
+        return self.alert_digest_seconds if window is None else window
+    
+    def _format_digest_window(self, window, lang) -> str:
+        return get_text(lang, 'alert_digest_off') if not window else to_arabic_numerals(f"{int(window)}s", lang)
+    
+    def _user_alert_change(self, user_id: int) -> Optional[float]:
+        """A user's own minimum alert move in percent from their trading_config, None if unset"""
+        config = self.database.get_trading_configs([user_id]).get(user_id) if self.database else None
+        percent = config.get('alert_change_percent') if config else None
+        return float(percent) if percent else None
+    
+    def _save_alert_change(self, user_id: int, percent: Optional[float]):
+        """Store a user's own minimum alert move and apply it to the alert roster"""
+        # Users without a trading_config row get every alert; the new row must not filter them
+        config = self.database.get_trading_configs([user_id]).get(user_id) or {'min_confidence': 0, 'enabled_symbols': None}
+        self.database.update_trading_config(user_id, {**config, 'alert_change_percent': percent})
+        subscriber = self.subscriber_roster.get(user_id) if self.subscriber_roster.loaded else None
+        if subscriber is not None:
+            self.subscriber_roster.upsert(dataclasses.replace(subscriber, min_change_percent=percent))
+    
+    def _format_alert_change(self, percent, lang) -> str:
+        return get_text(lang, 'alert_min_move_off') if not percent else to_arabic_numerals(f"{percent:g}%", lang)
+    
     def _get_all_users_with_auto_signals(self):
         """Get users with auto signals enabled from database or user_storage"""
         if self.database:
             users = self.database.get_users_with_auto_signals()
-            return [{'user_id': u['user_id'], 'username': u['username'], 'language': u['language']} for u in users]
+            return [{'user_id': u['user_id'], 'username': u['username'], 'language': u['language'],
+                     'alert_digest_seconds': u.get('alert_digest_seconds')} for u in users]
         else:
             return self.user_storage.get_all_users_with_auto_signals()
     
+    def _load_subscribers(self):
+        """Alert subscribers with their trading_config filters, read in full from storage"""
+        users = self._get_all_users_with_auto_signals()
+        # Users without a trading_config row keep receiving every alert
+        configs = self.database.get_trading_configs() if self.database else {}
+        return [Subscriber.from_rows(u, configs.get(u['user_id'])) for u in users]
+    
+    def _get_subscriber_index(self) -> SubscriberIndex:
+        """The in-memory alert roster; storage is only read on first use and at reconciles"""
+        return self.subscriber_roster.current()
+    
+    def _update_subscriber(self, user_id: int, settings: dict):
+        """Apply a settings write to the alert roster, with the same defaults the stores use"""
+        if not self.subscriber_roster.loaded:
+            return
+        if not settings.get('auto_signals', True):
+            self.subscriber_roster.remove(user_id)
+            self.alert_digest.discard(user_id)
+            self.alert_thresholds.forget_user(user_id)
+            return
+        language = settings.get('language', 'en')
+        subscriber = self.subscriber_roster.get(user_id)
+        if subscriber is None:
+            configs = self.database.get_trading_configs([user_id]) if self.database else {}
+            user = self._get_user_settings(user_id)
+            subscriber = Subscriber.from_rows({**user, 'user_id': user_id}, configs.get(user_id))
+        # The stores keep the digest window when a write leaves it out
+        digest_seconds = settings.get('alert_digest_seconds', subscriber.digest_seconds)
+        self.subscriber_roster.upsert(dataclasses.replace(subscriber, language=language, digest_seconds=digest_seconds))
+    
     def _get_all_users(self):
         """Get all users from database or user_storage"""
         if self.database:
@@ -168,6 +312,10 @@ class EnhancedTelegramBot:
         return InlineKeyboardMarkup(keyboard)
 
     def _get_main_menu_keyboard(self, lang: str):
+        # Built once per language; markup objects are immutable and shared
+        return self.message_cache.get(('main_menu', lang), lambda: self._build_main_menu_keyboard(lang))
+
+    def _build_main_menu_keyboard(self, lang: str):
         keyboard = [
             [
                 InlineKeyboardButton(get_text(lang, 'signals'), callback_data='menu_signals'),
@@ -303,7 +451,7 @@ class EnhancedTelegramBot:
 
         elif data == 'menu_profit':
             lang = self._get_user_lang(user_id)
-            symbols = [symbol['symbol'] for symbol in self.binance_client.get_top_10_currencies()]
+            symbols = [symbol['symbol'] for symbol in await self.async_client.get_top_10_currencies()]
             profit_report = self.profit_calculator.format_profit_report(symbols, lang)
             
             back_keyboard = [[InlineKeyboardButton(get_text(lang, 'back'), callback_data='back_main')]]
@@ -320,13 +468,13 @@ class EnhancedTelegramBot:
 
         elif data == 'get_signals':
             lang = self._get_user_lang(user_id)
-            signals = self.signal_generator.generate_signals()
+            signals = await self._generate_signals()
             signals_text = self._format_signals(signals, lang)
             await query.message.reply_text(signals_text, parse_mode='HTML')
 
         elif data == 'top_10':
             lang = self._get_user_lang(user_id)
-            top_10 = self.binance_client.get_top_10_currencies()
+            top_10 = await self.async_client.get_top_10_currencies()
             text = self._format_top_10(top_10, lang)
             await query.message.reply_text(text, parse_mode='HTML')
 
@@ -344,7 +492,8 @@ class EnhancedTelegramBot:
         elif data.startswith('report_'):
             lang = self._get_user_lang(user_id)
             report_type = data.split('_')[1]
-            report = self.report_generator.generate_report(report_type, lang)
+            loop = asyncio.get_running_loop()
+            report = await loop.run_in_executor(None, self.report_generator.generate_report, report_type, lang)
             await query.message.reply_text(report, parse_mode='HTML')
 
         elif data == 'change_lang':
@@ -360,21 +509,53 @@ class EnhancedTelegramBot:
             auto_enabled = settings.get('auto_signals', False) if settings else False
             
             status = get_text(lang, 'auto_signals_on' if auto_enabled else 'auto_signals_off')
+            digest = self._format_digest_window(self._user_digest_window(settings), lang)
             text = f"{get_text(lang, 'notifications_settings')}\n\n{get_text(lang, 'notifications_status')}: {status}"
+            text += f"\n{get_text(lang, 'alert_digest')}: {digest}"
             
             keyboard = [
                 [InlineKeyboardButton(
                     get_text(lang, 'disable_notifications' if auto_enabled else 'enable_notifications'),
                     callback_data='toggle_auto'
                 )],
-                [InlineKeyboardButton(get_text(lang, 'back'), callback_data='menu_settings')]
+                [InlineKeyboardButton(f"{get_text(lang, 'alert_digest')}: {digest}", callback_data='cycle_digest')]
             ]
+            # The minimum move lives in trading_config, which only the database has
+            if self.database:
+                min_move = self._format_alert_change(self._user_alert_change(user_id), lang)
+                text += f"\n{get_text(lang, 'alert_min_move')}: {min_move}"
+                keyboard.append([InlineKeyboardButton(f"{get_text(lang, 'alert_min_move')}: {min_move}", callback_data='cycle_min_move')])
+            keyboard.append([InlineKeyboardButton(get_text(lang, 'back'), callback_data='menu_settings')])
             
             await query.edit_message_text(
                 text,
                 reply_markup=InlineKeyboardMarkup(keyboard)
             )
         
+        elif data == 'cycle_digest':
+            lang = self._get_user_lang(user_id)
+            settings = self._get_user_settings(user_id)
+            window = next_digest_window(self._user_digest_window(settings))
+            
+            self._save_user_settings(user_id, username, {
+                'auto_signals': settings.get('auto_signals', True),
+                'language': lang,
+                'alert_digest_seconds': window
+            })
+            
+            msg = f"{get_text(lang, 'alert_digest')}: {self._format_digest_window(window, lang)}"
+            await query.answer(msg, show_alert=True)
+        
+        elif data == 'cycle_min_move':
+            lang = self._get_user_lang(user_id)
+            if not self.database:
+                return
+            percent = next_alert_change(self._user_alert_change(user_id))
+            self._save_alert_change(user_id, percent)
+            
+            msg = f"{get_text(lang, 'alert_min_move')}: {self._format_alert_change(percent, lang)}"
+            await query.answer(msg, show_alert=True)
+        
         elif data == 'admin_toggle_notif':
             # Admin-only: Toggle auto-notifications globally
             if not self.is_admin(user_id):
@@ -401,6 +582,11 @@ class EnhancedTelegramBot:
             # Send confirmation via new message instead of second answer
             await query.message.reply_text(get_text(lang, 'auto_notif_sent'))
 
+    async def _generate_signals(self, symbols=None):
+        """Advisory signals from the shared snapshot for the current market tick"""
+        snapshot = await self.signal_service.current_async(self.async_client)
+        return snapshot.signal_list(symbols)
+
     def _format_signals(self, signals, lang):
         text = f"<b>💡 {get_text(lang, 'signals')}</b>\n\n"
         
@@ -441,7 +627,7 @@ class EnhancedTelegramBot:
         self._track_user_activity(user_id)
         lang = self._get_user_lang(user_id)
         
-        signals = self.signal_generator.generate_signals()
+        signals = await self._generate_signals()
         signals_text = self._format_signals(signals, lang)
         
         await update.message.reply_text(signals_text, parse_mode='HTML', reply_markup=self._get_main_menu_keyboard(lang))
@@ -472,7 +658,7 @@ class EnhancedTelegramBot:
         self._track_user_activity(user_id)
         lang = self._get_user_lang(user_id)
         
-        symbols = [symbol['symbol'] for symbol in self.binance_client.get_top_10_currencies()]
+        symbols = [symbol['symbol'] for symbol in await self.async_client.get_top_10_currencies()]
         profit_report = self.profit_calculator.format_profit_report(symbols, lang)
         
         await update.message.reply_text(
@@ -488,7 +674,7 @@ class EnhancedTelegramBot:
         lang = self._get_user_lang(user_id)
         
         try:
-            balances = self.binance_client.get_balance()
+            balances = await self.async_client.get_balance()
             
             if not balances:
                 await update.message.reply_text(
@@ -500,10 +686,11 @@ class EnhancedTelegramBot:
             
             total_usdt = 0.0
             balance_lines = []
+            usdt_values = await self.async_client.value_balances(balances)
             
             for asset, balance_info in balances.items():
                 amount = balance_info['total']
-                usdt_value = self.binance_client.get_asset_value_in_usdt(asset, amount)
+                usdt_value = usdt_values[asset]
                 total_usdt += usdt_value
                 
                 if usdt_value >= 1:
@@ -585,34 +772,29 @@ class EnhancedTelegramBot:
         
         # Get all users
         all_users = self._get_all_users()
-        sent_count = 0
-        failed_count = 0
+        version = next(self._render_version)
+        messages = []
         
-        # Send to all users
         for user in all_users:
-            try:
-                target_user_id = user['user_id']
-                target_lang = user.get('language', 'en')
-                
-                # Add admin signature
-                final_message = f"📢 <b>{get_text(target_lang, 'broadcast_from_admin')}</b>\n\n{broadcast_text}"
-                
-                await self.app.bot.send_message(
-                    chat_id=target_user_id,
-                    text=final_message,
-                    parse_mode='HTML',
-                    reply_markup=self._get_main_menu_keyboard(target_lang)
-                )
-                
-                sent_count += 1
-                await asyncio.sleep(0.05)  # Rate limiting
-                
-            except Exception as e:
-                print(f"❌ Error broadcasting to user {target_user_id}: {e}")
-                failed_count += 1
+            target_lang = user.get('language', 'en')
+            
+            # Add admin signature
+            messages.append((user['user_id'], self.message_cache.get(('broadcast', target_lang, version), lambda: {
+                'text': f"📢 <b>{get_text(target_lang, 'broadcast_from_admin')}</b>\n\n{broadcast_text}",
+                'parse_mode': 'HTML',
+                'reply_markup': self._get_main_menu_keyboard(target_lang)
+            })))
         
-        # Send confirmation to admin
-        result_msg = f"✅ {get_text(lang, 'broadcast_sent')}: {sent_count}\n❌ {get_text(lang, 'broadcast_failed')}: {failed_count}"
+        # Send to all users within the Telegram rate budget; a repeated update is queued only once
+        result = await self._dispatch(
+            messages, 'broadcast', f"broadcast:{update.effective_chat.id}:{update.message.message_id}"
+        )
+        
+        # Send confirmation to admin; the broadcast is sent directly if it could not be queued
+        if result.queued:
+            result_msg = f"📤 {get_text(lang, 'broadcast_queued')}: {result.queued}"
+        else:
+            result_msg = f"✅ {get_text(lang, 'broadcast_sent')}: {result.sent}\n❌ {get_text(lang, 'broadcast_failed')}: {result.failed}"
         await update.message.reply_text(result_msg, parse_mode='HTML')
     
     async def admin_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -682,83 +864,202 @@ class EnhancedTelegramBot:
         await update.message.reply_text(message, parse_mode='HTML', reply_markup=InlineKeyboardMarkup(keyboard))
     
     async def monitor_instant_price_changes(self):
-        """Check prices 60 times per minute - alerts on ANY price change with 5min cooldown"""
-        print("⚡ INSTANT price monitoring started - checking 60/min, alerting on ANY price change")
+        """Alert on price changes pushed by the market stream, falling back to polling 60/min"""
+        if self.config.market_stream_enabled and MiniTickerStream.available():
+            await self._monitor_price_stream()
+        else:
+            await self._monitor_price_polling()
+    
+    async def _monitor_price_stream(self):
+        """Consume mini-ticker pushes and alert on band-clearing moves with 5min cooldown"""
+        stream_url = self.config.market_stream_url or BINANCE_MINI_TICKER_URL
+        mock_server = None
+        if self.async_client.mock and not self.config.market_stream_url:
+            # No exchange to stream from in mock mode - serve the mock prices locally
+            mock_server = MockTickerServer(self.async_client, interval=self.tick_interval)
+            stream_url = await mock_server.start()
+        
+        self.price_stream = MiniTickerStream(self.async_client, url=stream_url, symbols=TOP_SYMBOLS)
+        updates_queue = self.price_stream.subscribe()
+        stream_task = asyncio.create_task(self.price_stream.run())
+        
+        print(f"⚡ STREAMING price monitoring started ({stream_url}), alerting on volatility-adaptive moves")
         print(f"   Rate Limiting: 5 minute cooldown per symbol (prevents spam)")
         self.price_monitor_running = True
         
-        while self.price_monitor_running:
-            try:
-                if not self.auto_notifications_enabled or not self.app:
-                    await asyncio.sleep(1)
-                    continue
-                
-                # Get subscribed users
-                users = self._get_all_users_with_auto_signals()
-                
-                if not users:
-                    await asyncio.sleep(1)
-                    continue
-                
-                # Fetch current market data
-                market_data = self.binance_client.get_top_10_currencies()
+        try:
+            while self.price_monitor_running:
+                try:
+                    updates = await asyncio.wait_for(updates_queue.get(), timeout=1)
+                except asyncio.TimeoutError:
+                    updates = None
                 
-                if not market_data:
-                    await asyncio.sleep(1)
-                    continue
+                try:
+                    if updates:
+                        # Every received batch is recorded and ingested; only alerts depend on the settings
+                        if self.tick_recorder:
+                            self.tick_recorder.record_updates(updates)
+                        market_data = [{'symbol': u.symbol, 'price': u.price, 'volume': u.volume} for u in updates]
+                        self._ingest_ticks(market_data)
+                        if self.auto_notifications_enabled and self.app:
+                            await self._process_market_data(market_data)
+                except Exception as e:
+                    print(f"❌ Error in streaming price monitoring: {e}")
                 
-                # Check for SIGNIFICANT price changes with rate limiting
-                current_time = asyncio.get_event_loop().time()
-                changed_symbols = []
+                await self._flush_alert_digests()
+        finally:
+            await self.price_stream.stop()
+            stream_task.cancel()
+            if mock_server:
+                await mock_server.stop()
+    
+    async def _monitor_price_polling(self):
+        """Check prices 60 times per minute - alerts on band-clearing moves with 5min cooldown"""
+        print("⚡ INSTANT price monitoring started - checking 60/min, alerting on volatility-adaptive moves")
+        print(f"   Rate Limiting: 5 minute cooldown per symbol (prevents spam)")
+        self.price_monitor_running = True
+        
+        while self.price_monitor_running:
+            try:
+                await self._flush_alert_digests()
                 
-                for symbol_data in market_data:
-                    symbol = symbol_data['symbol']
-                    current_price = float(symbol_data['price'])
-                    last_alerted_price = self.last_sent_prices.get(symbol)
-                    last_alert = self.last_alert_time.get(symbol, 0)
-                    
-                    # Update profit calculator with latest price
-                    self.profit_calculator.update_price(symbol, current_price)
-                    
-                    if last_alerted_price is None:
-                        # First time - save current price and mark as ready for future alerts
-                        self.last_sent_prices[symbol] = current_price
-                        self.last_alert_time[symbol] = 0  # Allow first alert immediately
-                        continue
-                    
-                    # Check if price changed (use epsilon for floating point comparison)
-                    epsilon = 1e-8  # Tiny value to avoid floating point precision issues
-                    price_changed = abs(current_price - last_alerted_price) > epsilon
-                    
-                    # Check cooldown (0 means never alerted, allow immediately)
-                    if last_alert == 0:
-                        cooldown_ok = True  # First alert - no cooldown
-                    else:
-                        time_since_alert = current_time - last_alert
-                        cooldown_ok = time_since_alert >= self.alert_cooldown_seconds
-                    
-                    # Alert if: ANY price change AND cooldown expired (prevents spam)
-                    if price_changed and cooldown_ok:
-                        changed_symbols.append({
-                            'symbol': symbol,
-                            'old_price': last_alerted_price,
-                            'new_price': current_price
-                        })
-                        # Update last alerted price and time
-                        self.last_sent_prices[symbol] = current_price
-                        self.last_alert_time[symbol] = current_time
+                # Fetch current market data; bars are built from every tick, alerts or not
+                market_data = await self.async_client.get_top_10_currencies()
                 
-                # Send alerts for ANY price changes
-                if changed_symbols:
-                    signals = self.signal_generator.analyze_all_symbols(market_data)
-                    await self._send_instant_price_alerts(changed_symbols, signals, users)
-                    print(f"⚡ Alert: {len(changed_symbols)} symbols (ANY change) → sent to {len(users)} users")
+                if market_data:
+                    if self.tick_recorder:
+                        self.tick_recorder.record_prices(market_data)
+                    self._ingest_ticks(market_data)
+                    if self.auto_notifications_enabled and self.app:
+                        await self._process_market_data(market_data)
                 
-                await asyncio.sleep(1)  # Check every 1 second (60 times per minute)
+                # Check every 1 second (60 times per minute), faster under accelerated replay
+                await asyncio.sleep(self.tick_interval)
                 
             except Exception as e:
                 print(f"❌ Error in instant price monitoring: {e}")
-                await asyncio.sleep(1)
+                await asyncio.sleep(self.tick_interval)
+    
+    async def _process_market_data(self, market_data):
+        """Detect alert-worthy price changes in market_data and notify subscribers"""
+        # Get subscribed users
+        index = self._get_subscriber_index()
+        
+        if not len(index):
+            return
+        
+        changed_symbols = self._detect_price_changes(market_data)
+        
+        # Send alerts for moves that cleared their symbol's band
+        if changed_symbols:
+            snapshot = self.signal_service.publish(
+                {d['symbol']: float(d['price']) for d in market_data},
+                tick_time=self.replay.clock.time() if self.replay else time.time()
+            )
+            signals = snapshot.alert_signals(d['symbol'] for d in market_data)
+            # Only users whose symbols and confidence threshold match get each change
+            recipients = index.match({
+                c['symbol']: signals.get(c['symbol'], {}).get('confidence', 0) for c in changed_symbols
+            })
+            changes = {c['symbol']: c for c in changed_symbols}
+            users = []
+            for user_id, symbols in recipients.items():
+                subscriber = index.get(user_id)
+                # Users with their own minimum move only get the changes that clear it since their last alert
+                symbols = {s for s in symbols if self.alert_thresholds.allow_user(
+                    user_id, s, subscriber.min_change_percent, changes[s]['old_price'], changes[s]['new_price']
+                )}
+                if symbols:
+                    users.append({'user_id': user_id, 'language': subscriber.language, 'symbols': symbols})
+            # Users with a digest window get these changes merged into their next digest instead
+            self._latest_alert_signals.update(signals)
+            now = self._alert_time()
+            instant = []
+            for user in users:
+                window = self._digest_window(index.get(user['user_id']))
+                if window > 0:
+                    user_changes = [c for c in changed_symbols if c['symbol'] in user['symbols']]
+                    self.alert_digest.add(user['user_id'], user['language'], user_changes, window, now)
+                else:
+                    instant.append(user)
+            await self._send_instant_price_alerts(changed_symbols, signals, instant)
+            print(f"⚡ Alert: {len(changed_symbols)} symbols → sent to {len(instant)} users, "
+                  f"{len(users) - len(instant)} digested")
+    
+    async def _flush_alert_digests(self):
+        """Send digests whose window closed; the monitor loops call this every iteration, ticks or not"""
+        if not len(self.alert_digest) or not self.app:
+            return
+        try:
+            await self._send_alert_digests(self._alert_time())
+        except Exception as e:
+            print(f"❌ Error sending alert digests: {e}")
+    
+    def _alert_time(self) -> float:
+        """Clock for alert cooldowns and digest windows (the replay clock under tick replay)"""
+        return self.replay.clock.time() if self.replay else asyncio.get_event_loop().time()
+    
+    def _digest_window(self, subscriber) -> float:
+        """A subscriber's digest window in seconds; 0 means instant alerts"""
+        if subscriber is None or subscriber.digest_seconds is None:
+            return self.alert_digest_seconds
+        return subscriber.digest_seconds
+    
+    def _ingest_ticks(self, market_data):
+        """Feed a received price batch to the per-tick consumers, whatever the alert settings"""
+        tick_time_ms = self.replay.clock.now_ms() if self.replay else int(time.time() * 1000)
+        for symbol_data in market_data:
+            symbol = symbol_data['symbol']
+            price = float(symbol_data['price'])
+            self.profit_calculator.update_price(symbol, price)
+            self.streaming_indicators.update(symbol, price)
+            # Polled prices carry no volume; stream updates carry the volume traded since the last one
+            self.bar_aggregator.on_tick(symbol, price, tick_time_ms, symbol_data.get('volume', 0.0))
+        # Close bars for symbols that had no tick in this batch
+        self.bar_aggregator.advance(tick_time_ms)
+    
+    def _detect_price_changes(self, market_data):
+        """Return symbols whose price moved since the last alert and whose cooldown expired"""
+        current_time = self._alert_time()
+        changed_symbols = []
+        
+        for symbol_data in market_data:
+            symbol = symbol_data['symbol']
+            current_price = float(symbol_data['price'])
+            last_alerted_price = self.last_sent_prices.get(symbol)
+            last_alert = self.last_alert_time.get(symbol, 0)
+            
+            if last_alerted_price is None:
+                # First time - save current price and mark as ready for future alerts
+                self.last_sent_prices[symbol] = current_price
+                self.last_alert_time[symbol] = 0  # Allow first alert immediately
+                continue
+            
+            # Check if price changed (use epsilon for floating point comparison)
+            epsilon = 1e-8  # Tiny value to avoid floating point precision issues
+            price_changed = abs(current_price - last_alerted_price) > epsilon
+            
+            # Check cooldown (0 means never alerted, allow immediately)
+            if last_alert == 0:
+                cooldown_ok = True  # First alert - no cooldown
+            else:
+                time_since_alert = current_time - last_alert
+                cooldown_ok = time_since_alert >= self.alert_cooldown_seconds
+            
+            # Alert if: the move clears the symbol's adaptive band AND cooldown expired (prevents spam)
+            if price_changed and cooldown_ok and self.alert_thresholds.check(
+                symbol, last_alerted_price, current_price, self.streaming_indicators.get(symbol)
+            ):
+                changed_symbols.append({
+                    'symbol': symbol,
+                    'old_price': last_alerted_price,
+                    'new_price': current_price
+                })
+                # Update last alerted price and time
+                self.last_sent_prices[symbol] = current_price
+                self.last_alert_time[symbol] = current_time
+        
+        return changed_symbols
     
     async def send_2hour_summary(self):
         """Send comprehensive 2-hour summary with WAS/NOW comparison + BUY/SELL/HOLD signals"""
@@ -772,20 +1073,24 @@ class EnhancedTelegramBot:
                 if not self.auto_notifications_enabled or not self.app:
                     continue
                 
-                # Get subscribed users
-                users = self._get_all_users_with_auto_signals()
+                # Get subscribed users from the in-memory roster
+                users = [
+                    {'user_id': s.user_id, 'language': s.language}
+                    for s in self._get_subscriber_index().subscribers()
+                ]
                 
                 if not users:
                     continue
                 
                 # Fetch current market data
-                market_data = self.binance_client.get_top_10_currencies()
+                market_data = await self.async_client.get_top_10_currencies()
                 
                 if not market_data:
                     continue
                 
                 # Generate trading signals
-                signals = self.signal_generator.analyze_all_symbols(market_data)
+                snapshot = await self.signal_service.current_async(self.async_client)
+                signals = snapshot.alert_signals(d['symbol'] for d in market_data)
                 
                 # Send 2-hour summary to all users
                 await self._send_2hour_summary_report(market_data, signals, users)
@@ -802,180 +1107,300 @@ class EnhancedTelegramBot:
     
     async def _send_instant_price_alerts(self, changed_symbols, signals, users):
         """Send instant alerts for price changes with clickable Binance links"""
-        sent_count = 0
+        # Users with the same language and symbols share one rendered message per wave
+        version = next(self._render_version)
+        messages = []
         
         for user in users:
             try:
                 user_id = user['user_id']
                 lang = user.get('language', 'en')
+                symbols = frozenset(user['symbols']) if 'symbols' in user else None
+                payload = self.message_cache.get(('instant_alert', lang, version, symbols), lambda: {
+                    'text': self._render_instant_alert(
+                        lang, [c for c in changed_symbols if symbols is None or c['symbol'] in symbols], signals
+                    ),
+                    'parse_mode': 'HTML',
+                    'disable_web_page_preview': True,  # Don't show preview, just make links clickable
+                    'reply_markup': self._get_main_menu_keyboard(lang)
+                })
+                messages.append((user_id, payload))
                 
-                # Create alert message
-                if lang == 'ar':
-                    message = f"⚡ <b>تنبيه: تغير السعر</b>\n\n"
-                else:
-                    message = f"⚡ <b>Price Change Alert</b>\n\n"
-                
-                for change in changed_symbols:
-                    symbol = change['symbol']
-                    old_price = change['old_price']
-                    new_price = change['new_price']
-                    
-                    # Get short name, logo, and Binance URL
-                    short_name = self._get_short_currency_name(symbol)
-                    logo = self._get_currency_logo(symbol)
-                    binance_url = self._get_binance_market_url(symbol)
-                    
-                    # Get signal
-                    signal_info = signals.get(symbol, {})
-                    action = signal_info.get('action', 'hold').upper()
-                    
-                    # Format signal emoji
-                    if action == 'BUY':
-                        signal_emoji = get_text(lang, 'buy_signal')
-                    elif action == 'SELL':
-                        signal_emoji = get_text(lang, 'sell_signal')
-                    else:
-                        signal_emoji = get_text(lang, 'hold_signal')
-                    
-                    # Calculate change values
-                    change_pct = ((new_price - old_price) / old_price) * 100
-                    change_amount = new_price - old_price
-                    
-                    # Format with clickable link and logo
-                    if lang == 'ar':
-                        message += f"{logo} <a href=\"{binance_url}\">{short_name}</a>\n"
-                        message += f"   كان: ${old_price:.4f}\n"
-                        message += f"   الآن: ${new_price:.4f}\n"
-                        message += f"   التغير: ${change_amount:+.4f} ({change_pct:+.2f}%)\n"
-                        message += f"   {signal_emoji}\n\n"
-                    else:
-                        message += f"{logo} <a href=\"{binance_url}\">{short_name}</a>\n"
-                        message += f"   WAS: ${old_price:.4f}\n"
-                        message += f"   NOW: ${new_price:.4f}\n"
-                        message += f"   Change: ${change_amount:+.4f} ({change_pct:+.2f}%)\n"
-                        message += f"   {signal_emoji}\n\n"
-                
-                # Convert numbers to Arabic numerals
-                message = to_arabic_numerals(message, lang)
-                
-                # Send alert with clickable links enabled
-                await self.app.bot.send_message(
-                    chat_id=user_id,
-                    text=message,
-                    parse_mode='HTML',
-                    disable_web_page_preview=True,  # Don't show preview, just make links clickable
-                    reply_markup=self._get_main_menu_keyboard(lang)
-                )
-                
-                sent_count += 1
-                await asyncio.sleep(0.05)  # Minimal rate limiting
-                
             except Exception as e:
-                print(f"❌ Error sending instant alert to user {user_id}: {e}")
+                print(f"❌ Error building instant alert for user {user_id}: {e}")
+        
+        # An alert older than the cooldown is stale; drop it rather than send it late
+        return await self._dispatch(
+            messages, 'instant alert', f"alert:{int(time.time() * 1000)}",
+            priority=PRIORITY_ALERT, expires_in=self.alert_cooldown_seconds
+        )
+    
+    async def _send_alert_digests(self, now):
+        """Send one merged alert to every user whose digest window has closed"""
+        digests = self.alert_digest.due(now)
+        if not digests:
+            return None
+        # Users whose digests hold the same changes share one rendered message
+        version = next(self._render_version)
+        signals = self._latest_alert_signals
+        messages = []
+        
+        for user_id, lang, changes in digests:
+            try:
+                key = ('alert_digest', lang, version, tuple((c['symbol'], c['old_price'], c['new_price']) for c in changes))
+                messages.append((user_id, self.message_cache.get(key, lambda: {
+                    'text': self._render_instant_alert(lang, changes, signals),
+                    'parse_mode': 'HTML',
+                    'disable_web_page_preview': True,
+                    'reply_markup': self._get_main_menu_keyboard(lang)
+                })))
+            except Exception as e:
+                print(f"❌ Error building alert digest for user {user_id}: {e}")
+        
+        return await self._dispatch(
+            messages, 'alert digest', f"digest:{int(time.time() * 1000)}",
+            priority=PRIORITY_ALERT, expires_in=self.alert_cooldown_seconds
+        )
+    
+    def _render_instant_alert(self, lang, changes, signals) -> str:
+        """Price change alert text for one language and set of changes"""
+        # Create alert message
+        if lang == 'ar':
+            message = f"⚡ <b>تنبيه: تغير السعر</b>\n\n"
+        else:
+            message = f"⚡ <b>Price Change Alert</b>\n\n"
+        
+        for change in changes:
+            symbol = change['symbol']
+            old_price = change['old_price']
+            new_price = change['new_price']
+            
+            # Get short name, logo, and Binance URL
+            short_name = self._get_short_currency_name(symbol)
+            logo = self._get_currency_logo(symbol)
+            binance_url = self._get_binance_market_url(symbol)
+            
+            # Get signal
+            signal_info = signals.get(symbol, {})
+            action = signal_info.get('action', 'hold').upper()
+            
+            # Format signal emoji
+            if action == 'BUY':
+                signal_emoji = get_text(lang, 'buy_signal')
+            elif action == 'SELL':
+                signal_emoji = get_text(lang, 'sell_signal')
+            else:
+                signal_emoji = get_text(lang, 'hold_signal')
+            
+            # Calculate change values
+            change_pct = ((new_price - old_price) / old_price) * 100
+            change_amount = new_price - old_price
+            
+            # Format with clickable link and logo
+            if lang == 'ar':
+                message += f"{logo} <a href=\"{binance_url}\">{short_name}</a>\n"
+                message += f"   كان: ${old_price:.4f}\n"
+                message += f"   الآن: ${new_price:.4f}\n"
+                message += f"   التغير: ${change_amount:+.4f} ({change_pct:+.2f}%)\n"
+                message += f"   {signal_emoji}\n\n"
+            else:
+                message += f"{logo} <a href=\"{binance_url}\">{short_name}</a>\n"
+                message += f"   WAS: ${old_price:.4f}\n"
+                message += f"   NOW: ${new_price:.4f}\n"
+                message += f"   Change: ${change_amount:+.4f} ({change_pct:+.2f}%)\n"
+                message += f"   {signal_emoji}\n\n"
+        
+        # Convert numbers to Arabic numerals
+        message = to_arabic_numerals(message, lang)
+        return message
     
     async def _send_2hour_summary_report(self, market_data, signals, users):
         """Send comprehensive 2-hour summary with WAS vs NOW comparison"""
-        sent_count = 0
+        version = next(self._render_version)
+        profit_data = self.profit_calculator.calculate_total_profit([s['symbol'] for s in market_data])
+        messages = []
         
         for user in users:
             try:
                 user_id = user['user_id']
                 lang = user.get('language', 'en')
+                # Rendered once per language for the whole wave
+                payload = self.message_cache.get(('2hour_summary', lang, version), lambda: {
+                    'text': self._render_2hour_summary(lang, market_data, signals, profit_data),
+                    'parse_mode': 'HTML',
+                    'disable_web_page_preview': True,  # Don't show preview, just make links clickable
+                    'reply_markup': self._get_main_menu_keyboard(lang)
+                })
+                messages.append((user_id, payload))
                 
-                # Create summary header
+            except Exception as e:
+                print(f"❌ Error building 2-hour summary for user {user_id}: {e}")
+        
+        # Keyed by 2-hour window so a wave is queued at most once per window; restarts cannot
+        # repeat it anyway, since the loop waits a full interval before its first summary
+        result = await self._dispatch(
+            messages, '2-hour summary', f"summary:{int(time.time() // 7200)}",
+            priority=PRIORITY_SUMMARY, expires_in=7200
+        )
+        if result.sent > 0:
+            print(f"📊 2-hour summary sent to {result.sent} users in {result.elapsed:.1f}s")
+        elif result.queued > 0:
+            print(f"📊 2-hour summary queued for {result.queued} users")
+        return result
+    
+    async def _dispatch(self, messages, label, dedupe_prefix, priority=PRIORITY_BULK, expires_in=None,
+                        on_sent=None) -> FanoutResult:
+        """
+        Queue (chat_id, kwargs) messages in the outbox with one bulk insert, or
+        send them directly when the outbox is disabled or unavailable. on_sent
+        runs once a message is delivered, from the outbox senders when queued.
+        """
+        if self.outbox is not None and messages:
+            try:
+                rows = outbound_messages(messages, dedupe_prefix, priority, expires_in)
+                loop = asyncio.get_running_loop()
+                queued = await loop.run_in_executor(None, self.outbox.enqueue_outbound, rows)
+                if on_sent:
+                    self._delivery_callbacks[dedupe_prefix.split(':', 1)[0]] = on_sent
+                return FanoutResult(queued=queued)
+            except Exception as e:
+                print(f"❌ Error queueing {label}, sending directly: {e}")
+        return await self.fanout.deliver(self.app.bot, messages, on_sent=on_sent, label=label)
+    
+    def start_outbox_senders(self) -> list:
+        """Start the sender workers that drain the outbox; returns their tasks"""
+        if self.outbox is None or self.outbox_senders:
+            return []
+        self.outbox_senders = [
+            OutboxSender(self.outbox, self.fanout, visibility_timeout=self.config.outbox_visibility_timeout,
+                         on_sent=self._on_outbox_delivered)
+            for _ in range(max(1, self.config.outbox_workers))
+        ]
+        active_senders.extend(self.outbox_senders)
+        return [asyncio.create_task(sender.run(self.app.bot)) for sender in self.outbox_senders]
+    
+    def _on_outbox_delivered(self, item):
+        """Sender callback for a delivered (chat_id, kwargs, OutboundMessage) item"""
+        callback = self._delivery_callbacks.get(item[2].dedupe_key.split(':', 1)[0])
+        if callback:
+            callback(item)
+    
+    def stop_outbox_senders(self):
+        for sender in self.outbox_senders:
+            sender.stop()
+            if sender in active_senders:
+                active_senders.remove(sender)
+        self.outbox_senders = []
+    
+    def _render_2hour_summary(self, lang, market_data, signals, profit_data) -> str:
+        """2-hour WAS vs NOW summary text for one language"""
+        # Create summary header
+        if lang == 'ar':
+            message = f"📊 <b>ملخص ساعتين - تقرير شامل</b>\n"
+            message += f"<i>مقارنة الأسعار والتوصيات</i>\n\n"
+        else:
+            message = f"📊 <b>2-Hour Summary - Full Report</b>\n"
+            message += f"<i>Price Comparison & Trading Advice</i>\n\n"
+        
+        for idx, symbol_data in enumerate(market_data, 1):
+            symbol = symbol_data['symbol']
+            now_price = float(symbol_data['price'])
+            was_price = self.last_2hour_prices.get(symbol, now_price)
+            
+            # Get short name, logo, and Binance URL
+            short_name = self._get_short_currency_name(symbol)
+            logo = self._get_currency_logo(symbol)
+            binance_url = self._get_binance_market_url(symbol)
+            
+            # Get signal
+            signal_info = signals.get(symbol, {})
+            action = signal_info.get('action', 'hold').upper()
+            
+            # Format signal
+            if action == 'BUY':
+                signal_emoji = get_text(lang, 'buy_signal')
                 if lang == 'ar':
-                    message = f"📊 <b>ملخص ساعتين - تقرير شامل</b>\n"
-                    message += f"<i>مقارنة الأسعار والتوصيات</i>\n\n"
+                    signal_text = "شراء"
                 else:
-                    message = f"📊 <b>2-Hour Summary - Full Report</b>\n"
-                    message += f"<i>Price Comparison & Trading Advice</i>\n\n"
-                
-                for idx, symbol_data in enumerate(market_data, 1):
-                    symbol = symbol_data['symbol']
-                    now_price = float(symbol_data['price'])
-                    was_price = self.last_2hour_prices.get(symbol, now_price)
-                    
-                    # Get short name, logo, and Binance URL
-                    short_name = self._get_short_currency_name(symbol)
-                    logo = self._get_currency_logo(symbol)
-                    binance_url = self._get_binance_market_url(symbol)
-                    
-                    # Get signal
-                    signal_info = signals.get(symbol, {})
-                    action = signal_info.get('action', 'hold').upper()
-                    
-                    # Format signal
-                    if action == 'BUY':
-                        signal_emoji = get_text(lang, 'buy_signal')
-                        if lang == 'ar':
-                            signal_text = "شراء"
-                        else:
-                            signal_text = "BUY"
-                    elif action == 'SELL':
-                        signal_emoji = get_text(lang, 'sell_signal')
-                        if lang == 'ar':
-                            signal_text = "بيع"
-                        else:
-                            signal_text = "SELL"
-                    else:
-                        signal_emoji = get_text(lang, 'hold_signal')
-                        if lang == 'ar':
-                            signal_text = "انتظر"
-                        else:
-                            signal_text = "HOLD"
-                    
-                    # Calculate change
-                    change = now_price - was_price
-                    change_pct = (change / was_price * 100) if was_price != 0 else 0
-                    
-                    # Format message with clickable link and logo
-                    message += f"<b>{idx}. {logo} <a href=\"{binance_url}\">{short_name}</a></b>\n"
-                    if lang == 'ar':
-                        message += f"   كان: ${was_price:.4f}\n"
-                        message += f"   الآن: ${now_price:.4f}\n"
-                        message += f"   التوصية: {signal_emoji} {signal_text}\n\n"
-                    else:
-                        message += f"   WAS: ${was_price:.4f}\n"
-                        message += f"   NOW: ${now_price:.4f}\n"
-                        message += f"   ADVICE: {signal_emoji} {signal_text}\n\n"
-                
-                # Add profit calculator summary
-                symbols = [s['symbol'] for s in market_data]
-                profit_data = self.profit_calculator.calculate_total_profit(symbols)
-                
-                if profit_data['elapsed_hours'] > 0:
-                    profit_emoji = "🟢" if profit_data['projected_weekly_profit_aed'] >= 0 else "🔴"
-                    message += "─" * 30 + "\n"
-                    if lang == 'ar':
-                        message += f"💰 <b>توقعات الأرباح (١٠٠٠ درهم)</b>\n"
-                        message += f"{profit_emoji} الربح المتوقع أسبوعياً: {profit_data['projected_weekly_profit_aed']:+.2f} درهم\n"
-                        message += f"💎 القيمة النهائية: {profit_data['projected_weekly_value_aed']:.2f} درهم\n"
-                    else:
-                        message += f"💰 <b>Profit Projection (1000 AED)</b>\n"
-                        message += f"{profit_emoji} Weekly Profit: {profit_data['projected_weekly_profit_aed']:+.2f} AED\n"
-                        message += f"💎 Final Value: {profit_data['projected_weekly_value_aed']:.2f} AED\n"
-                
-                # Convert numbers to Arabic numerals
-                message = to_arabic_numerals(message, lang)
-                
-                # Send summary with clickable links enabled
-                await self.app.bot.send_message(
-                    chat_id=user_id,
-                    text=message,
-                    parse_mode='HTML',
-                    disable_web_page_preview=True,  # Don't show preview, just make links clickable
-                    reply_markup=self._get_main_menu_keyboard(lang)
-                )
-                
-                sent_count += 1
-                await asyncio.sleep(0.1)  # Rate limiting
-                
-            except Exception as e:
-                print(f"❌ Error sending 2-hour summary to user {user_id}: {e}")
+                    signal_text = "BUY"
+            elif action == 'SELL':
+                signal_emoji = get_text(lang, 'sell_signal')
+                if lang == 'ar':
+                    signal_text = "بيع"
+                else:
+                    signal_text = "SELL"
+            else:
+                signal_emoji = get_text(lang, 'hold_signal')
+                if lang == 'ar':
+                    signal_text = "انتظر"
+                else:
+                    signal_text = "HOLD"
+            
+            # Calculate change
+            change = now_price - was_price
+            change_pct = (change / was_price * 100) if was_price != 0 else 0
+            
+            # Format message with clickable link and logo
+            message += f"<b>{idx}. {logo} <a href=\"{binance_url}\">{short_name}</a></b>\n"
+            if lang == 'ar':
+                message += f"   كان: ${was_price:.4f}\n"
+                message += f"   الآن: ${now_price:.4f}\n"
+                message += f"   التوصية: {signal_emoji} {signal_text}\n\n"
+            else:
+                message += f"   WAS: ${was_price:.4f}\n"
+                message += f"   NOW: ${now_price:.4f}\n"
+                message += f"   ADVICE: {signal_emoji} {signal_text}\n\n"
         
-        if sent_count > 0:
-            print(f"📊 2-hour summary sent to {sent_count} users")
+        if profit_data['elapsed_hours'] > 0:
+            profit_emoji = "🟢" if profit_data['projected_weekly_profit_aed'] >= 0 else "🔴"
+            message += "─" * 30 + "\n"
+            if lang == 'ar':
+                message += f"💰 <b>توقعات الأرباح (١٠٠٠ درهم)</b>\n"
+                message += f"{profit_emoji} الربح المتوقع أسبوعياً: {profit_data['projected_weekly_profit_aed']:+.2f} درهم\n"
+                message += f"💎 القيمة النهائية: {profit_data['projected_weekly_value_aed']:.2f} درهم\n"
+            else:
+                message += f"💰 <b>Profit Projection (1000 AED)</b>\n"
+                message += f"{profit_emoji} Weekly Profit: {profit_data['projected_weekly_profit_aed']:+.2f} AED\n"
+                message += f"💎 Final Value: {profit_data['projected_weekly_value_aed']:.2f} AED\n"
+        
+        # Convert numbers to Arabic numerals
+        message = to_arabic_numerals(message, lang)
+        return message
     
+    def add_market_data_jobs(self):
+        """Schedule symbol filter refreshes, incremental candle backfills and indicator snapshots"""
+        # Keep LOT_SIZE / MIN_NOTIONAL filters current for order sizing
+        self.scheduler.add_job(
+            self.async_client.refresh_symbol_filters,
+            'interval',
+            hours=self.config.exchange_info_refresh_hours,
+            kwargs={'force': True},
+            id='exchange_info_refresh'
+        )
+        # Top up local 1m candles; the first run backfills history at startup
+        self.scheduler.add_job(
+            self.backfill_candles,
+            'interval',
+            minutes=1,
+            next_run_time=datetime.now(),
+            id='candle_backfill'
+        )
+        if self.config.indicator_state_path:
+            self.scheduler.add_job(
+                self.streaming_indicators.save,
+                'interval',
+                minutes=5,
+                args=[self.config.indicator_state_path],
+                id='indicator_state_snapshot'
+            )
+
+    async def backfill_candles(self):
+        """Fetch klines newer than the local candle store for the tracked symbols"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, candle_store.backfill_all, self.binance_client, TOP_SYMBOLS, '1m'
+        )
+
     async def check_inactive_users(self):
         """Check for inactive users and send welcome messages"""
         try:
@@ -987,33 +1412,29 @@ class EnhancedTelegramBot:
             if not inactive_users:
                 return
             
+            messages = []
             for user in inactive_users:
-                try:
-                    user_id = user['user_id']
-                    lang = user.get('language', 'en')
-                    
-                    # Send welcome back message with main menu
-                    message = get_text(lang, 'welcome_back')
-                    
-                    await self.app.bot.send_message(
-                        chat_id=user_id,
-                        text=message,
-                        parse_mode='HTML',
-                        reply_markup=self._get_main_menu_keyboard(lang)
-                    )
-                    
-                    # Update last welcome timestamp
-                    self._update_last_welcome(user_id)
-                    
-                    print(f"📬 Welcome message sent to inactive user {user_id}")
-                    await asyncio.sleep(0.3)
-                    
-                except Exception as e:
-                    print(f"❌ Error sending welcome to user {user_id}: {e}")
+                lang = user.get('language', 'en')
+                
+                # Send welcome back message with main menu
+                messages.append((user['user_id'], self.message_cache.get(('welcome_back', lang), lambda: {
+                    'text': get_text(lang, 'welcome_back'),
+                    'parse_mode': 'HTML',
+                    'reply_markup': self._get_main_menu_keyboard(lang)
+                })))
+            
+            await self._dispatch(
+                messages, 'welcome', f"welcome:{datetime.now():%Y%m%d%H}", expires_in=3600, on_sent=self._welcomed
+            )
                     
         except Exception as e:
             print(f"❌ Error checking inactive users: {e}")
     
+    def _welcomed(self, item):
+        """A welcome back message reached the user: update their last welcome timestamp"""
+        self._update_last_welcome(item[0])
+        print(f"📬 Welcome message sent to inactive user {item[0]}")
+    
     async def send_heartbeat_loop(self):
         """Send heartbeat to web dashboard every 60 seconds"""
         heartbeat_interval = 60
@@ -1040,7 +1461,7 @@ class EnhancedTelegramBot:
                         loop = asyncio.get_event_loop()
                         response = await loop.run_in_executor(
                             None,
-                            lambda u=url: requests.post(
+                            lambda u=url: shared_transport.post(
                                 u,
                                 json={
                                     'environment': environment,
@@ -1092,26 +1513,30 @@ class EnhancedTelegramBot:
                 minutes=10,
                 id='inactive_user_check'
             )
+            self.add_market_data_jobs()
             self.scheduler.start()
             
             # Start all monitoring tasks
             instant_monitor_task = asyncio.create_task(self.monitor_instant_price_changes())
             summary_monitor_task = asyncio.create_task(self.send_2hour_summary())
             heartbeat_task = asyncio.create_task(self.send_heartbeat_loop())
+            outbox_tasks = self.start_outbox_senders()
             
             print("🚀 MeMo Bot Pro Enhanced Telegram Bot is running...")
             print("✅ Features: EN/AR support, Interactive menus, Auto signals, Reports")
-            print("⚡ INSTANT Alerts: Checking 60 times/minute, alerting on ANY price change")
+            print("⚡ INSTANT Alerts: Checking 60 times/minute, alerting on volatility-adaptive moves")
             print("📊 2-Hour Summary: WAS vs NOW comparison + BUY/SELL/HOLD advice")
             print("💡 Auto-Signals: ON by default for all users")
             print("👋 Welcome Messages: Checking inactive users every 10 minutes")
             print("📢 Admin Broadcast: /broadcast command available")
+            if outbox_tasks:
+                print(f"📤 Outbound Queue: {len(outbox_tasks)} sender worker(s)")
             print("💓 Production Monitoring: Heartbeat enabled (60s interval)")
             print("")
             print("⚠️ NOTE: This bot runs via WEBHOOKS (not polling)")
             print("   Run via web_app.py for webhook mode deployment")
             
-            await asyncio.gather(instant_monitor_task, summary_monitor_task, heartbeat_task)
+            await asyncio.gather(instant_monitor_task, summary_monitor_task, heartbeat_task, *outbox_tasks)
 
         except KeyboardInterrupt:
             print("\n⚠️ Bot stopped by user")
@@ -1121,8 +1546,11 @@ class EnhancedTelegramBot:
             # Stop both monitoring tasks
             self.price_monitor_running = False
             self.summary_monitor_running = False
+            self.stop_outbox_senders()
             print("🔕 Price monitoring stopped")
             
+            await self.async_client.close()
+            
             # Shutdown bot
             if self.app and self.app.running:
                 try:
@@ -0,0 +1,199 @@
+"""
+Tick Replay for MeMo Bot Pro
+Recorded or seeded synthetic price streams replayed through MockBinanceClient on a virtual clock
+"""
+import json
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .binance_client import MOCK_PRICES
+
+
+TICK_GENERATORS = ('random_walk', 'jumps', 'flat')
+
+# Fixed start for synthetic streams so timestamps are identical on every run
+DEFAULT_START_MS = 1_700_000_000_000
+
+
+@dataclass
+class Tick:
+    """One price print; serialised as a JSON line {"t": ms, "s": symbol, "p": price}"""
+    time_ms: int
+    symbol: str
+    price: float
+
+    def to_json(self) -> str:
+        return json.dumps({'t': self.time_ms, 's': self.symbol, 'p': self.price})
+
+    @classmethod
+    def from_json(cls, line: str) -> 'Tick':
+        data = json.loads(line)
+        return cls(time_ms=int(data['t']), symbol=data['s'], price=float(data['p']))
+
+
+def read_ticks(path: str) -> Iterator[Tick]:
+    """Stream ticks from a JSONL capture, skipping blank and '#' comment lines"""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield Tick.from_json(line)
+
+
+class TickRecorder:
+    """Append live prices to a JSONL capture that TickReplay can play back"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'a')
+        self.recorded = 0
+
+    def record(self, symbol: str, price: float, time_ms: Optional[int] = None):
+        tick = Tick(time_ms=time_ms if time_ms is not None else int(time.time() * 1000),
+                    symbol=symbol, price=float(price))
+        self._file.write(tick.to_json() + '\n')
+        self.recorded += 1
+
+    def record_updates(self, updates: Iterable):
+        """Record market_stream.PriceUpdate batches (event_time in seconds)"""
+        for update in updates:
+            self.record(update.symbol, update.price, int(update.event_time * 1000))
+        self._file.flush()
+
+    def record_prices(self, prices: List[Dict], time_ms: Optional[int] = None):
+        """Record a polled [{'symbol', 'price'}] batch at one timestamp"""
+        time_ms = time_ms if time_ms is not None else int(time.time() * 1000)
+        for item in prices:
+            self.record(item['symbol'], item['price'], time_ms)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def jumps(prices: Dict[str, float], seed: int = 42, interval_ms: int = 1000, volatility: float = 0.0005,
+          jump_probability: float = 0.01, jump_size: float = 0.03, start_ms: int = DEFAULT_START_MS,
+          count: Optional[int] = None) -> Iterator[Tick]:
+    """Gaussian random walk with occasional +/- jump_size moves; one tick per symbol per interval"""
+    rng = random.Random(seed)
+    current = dict(prices)
+    symbols = sorted(current)
+    time_ms = start_ms
+    steps = 0
+    while count is None or steps < count:
+        for symbol in symbols:
+            move = rng.gauss(0, volatility)
+            if jump_probability and rng.random() < jump_probability:
+                move += jump_size if rng.random() < 0.5 else -jump_size
+            current[symbol] *= 1 + move
+            yield Tick(time_ms=time_ms, symbol=symbol, price=round(current[symbol], 8))
+        time_ms += interval_ms
+        steps += 1
+
+
+def random_walk(prices: Dict[str, float], seed: int = 42, interval_ms: int = 1000, volatility: float = 0.0005,
+                start_ms: int = DEFAULT_START_MS, count: Optional[int] = None) -> Iterator[Tick]:
+    """Gaussian random walk without jumps"""
+    return jumps(prices, seed=seed, interval_ms=interval_ms, volatility=volatility,
+                 jump_probability=0.0, start_ms=start_ms, count=count)
+
+
+def flat(prices: Dict[str, float], interval_ms: int = 1000, start_ms: int = DEFAULT_START_MS,
+         count: Optional[int] = None) -> Iterator[Tick]:
+    """Constant prices; useful to check that nothing alerts when nothing moves"""
+    return jumps(prices, interval_ms=interval_ms, volatility=0.0, jump_probability=0.0,
+                 start_ms=start_ms, count=count)
+
+
+class ReplayClock:
+    """
+    Virtual market clock.
+
+    With speed > 0 it runs from start_ms at speed x wall-clock time. With
+    speed == 0 it only moves when advance() is called, so a test or benchmark
+    harness controls every timestamp.
+    """
+
+    def __init__(self, start_ms: int, speed: float = 1.0):
+        self.start_ms = start_ms
+        self.speed = speed
+        self._offset_ms = 0.0
+        self._wall_start = time.monotonic()
+
+    def now_ms(self) -> int:
+        elapsed = (time.monotonic() - self._wall_start) * 1000 * self.speed if self.speed > 0 else 0.0
+        return int(self.start_ms + elapsed + self._offset_ms)
+
+    def time(self) -> float:
+        """Seconds since the epoch on the virtual clock"""
+        return self.now_ms() / 1000
+
+    def advance(self, ms: float):
+        self._offset_ms += ms
+
+
+class TickReplay:
+    """Applies ticks to a price book as the virtual clock passes their timestamps"""
+
+    def __init__(self, ticks: Iterable[Tick], speed: float = 1.0, start_ms: Optional[int] = None):
+        self._ticks = iter(ticks)
+        self._pending: Optional[Tick] = next(self._ticks, None)
+        if start_ms is None:
+            start_ms = self._pending.time_ms if self._pending else DEFAULT_START_MS
+        self.clock = ReplayClock(start_ms, speed)
+        self.prices: Dict[str, float] = {}
+        self.ticks_applied = 0
+        self.sync()
+
+    @property
+    def exhausted(self) -> bool:
+        return self._pending is None
+
+    def sync(self) -> Dict[str, float]:
+        """Apply every tick up to the current virtual time and return the price book"""
+        now = self.clock.now_ms()
+        while self._pending is not None and self._pending.time_ms <= now:
+            self.prices[self._pending.symbol] = self._pending.price
+            self.ticks_applied += 1
+            self._pending = next(self._ticks, None)
+        return self.prices
+
+    def step(self, ms: float = 1000) -> Dict[str, float]:
+        """Advance the clock by ms and apply the ticks that became due"""
+        self.clock.advance(ms)
+        return self.sync()
+
+    def stats(self) -> Dict:
+        return {
+            'virtual_time_ms': self.clock.now_ms(),
+            'speed': self.clock.speed,
+            'ticks_applied': self.ticks_applied,
+            'symbols': len(self.prices),
+            'exhausted': self.exhausted
+        }
+
+
+def create_replay(source: str, speed: float = 1.0, seed: int = 42,
+                  prices: Optional[Dict[str, float]] = None) -> TickReplay:
+    """Build a replay from a generator name in TICK_GENERATORS or a JSONL capture path"""
+    prices = prices or MOCK_PRICES
+    if source == 'random_walk':
+        ticks = random_walk(prices, seed=seed)
+    elif source == 'jumps':
+        ticks = jumps(prices, seed=seed)
+    elif source == 'flat':
+        ticks = flat(prices)
+    else:
+        ticks = read_ticks(source)
+    return TickReplay(ticks, speed=speed)
+
+
+def create_replay_from_config(config) -> Optional[TickReplay]:
+    """Tick replay configured by MOCK_REPLAY, or None when replay is off"""
+    if not config.mock_replay:
+        return None
+    replay = create_replay(config.mock_replay, speed=config.mock_replay_speed, seed=config.mock_replay_seed)
+    print(f"⏯️ Mock tick replay: {config.mock_replay} at {config.mock_replay_speed:g}x")
+    return replay
@@ -1,19 +1,22 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, CallbackQueryHandler
-from typing import Dict
+from typing import Dict, Optional
 from .translations import get_text
 from .scalping_signals import ScalpingSignalGenerator
+from .signal_service import signal_service
 from .database import Database
-from .binance_client import BinanceClient
+from .binance_client import AsyncBinanceClient, BinanceClient, value_balances_in_usdt
 
 
 class TradingCommands:
     """Handles all trading-related commands"""
     
-    def __init__(self, binance_client: BinanceClient, database: Database):
+    def __init__(self, binance_client: BinanceClient, database: Database, async_binance_client: Optional[AsyncBinanceClient] = None):
         self.binance = binance_client
+        self.async_binance = async_binance_client or AsyncBinanceClient.from_client(binance_client)
         self.db = database
         self.signal_generator = ScalpingSignalGenerator(binance_client)
+        self.signal_service = signal_service
         self.AED_RATE = 3.67
     
     async def cmd_trade(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -183,7 +186,8 @@ class TradingCommands:
         user_settings = self.db.get_user(user.id)
         lang = user_settings.get('language', 'en') if user_settings else 'en'
         
-        signals = self.signal_generator.get_buy_signals(min_confidence=70)
+        snapshot = await self.signal_service.current_async(self.async_binance)
+        signals = snapshot.buy_signals(min_confidence=70)
         
         if not signals:
             text = "⚠️ No strong BUY signals at the moment.\n\nCheck back in a few minutes!"
@@ -229,27 +233,27 @@ class TradingCommands:
         lang = user_settings.get('language', 'en') if user_settings else 'en'
         
         try:
-            balances = self.binance.get_balance()
+            balances = await self.async_binance.get_balance()
+            
+            # One snapshot prices every holding instead of one ticker call per asset
+            price_map = (await self.async_binance.get_market_snapshot()).price_map
+            usdt_values = value_balances_in_usdt(balances, price_map)
             
             holdings = []
             for asset, balance_data in balances.items():
-                if asset != 'USDT' and balance_data['total'] > 0:
-                    symbol = f"{asset}USDT"
-                    try:
-                        price_info = self.binance.get_price(symbol)
-                        current_price = float(price_info['price'])
-                        usdt_value = balance_data['total'] * current_price
-                        
-                        if usdt_value >= 1.0:
-                            holdings.append({
-                                'asset': asset,
-                                'symbol': symbol,
-                                'quantity': balance_data['total'],
-                                'price': current_price,
-                                'usdt_value': usdt_value
-                            })
-                    except:
-                        continue
+                symbol = f"{asset}USDT"
+                # Only assets with a direct USDT pair can be sold from this menu
+                if asset != 'USDT' and balance_data['total'] > 0 and symbol in price_map:
+                    usdt_value = usdt_values[asset]
+                    
+                    if usdt_value >= 1.0:
+                        holdings.append({
+                            'asset': asset,
+                            'symbol': symbol,
+                            'quantity': balance_data['total'],
+                            'price': price_map[symbol],
+                            'usdt_value': usdt_value
+                        })
             
             if not holdings:
                 text = "📭 No holdings to sell.\n\nBuy some crypto first!"
@@ -297,10 +301,14 @@ class TradingCommands:
         lang = user_settings.get('language', 'en') if user_settings else 'en'
         
         try:
-            signal = self.signal_generator.generate_scalping_signal(
-                symbol,
-                float(self.binance.get_price(symbol)['price'])
-            )
+            # Confirm against the same snapshot the buy menu was built from
+            snapshot = await self.signal_service.current_async(self.async_binance)
+            signal = snapshot.scalping.get(symbol)
+            if signal is None:
+                price = float((await self.async_binance.get_price(symbol))['price'])
+                signal = self.signal_generator.generate_scalping_signal(
+                    symbol, price, self.signal_generator.indicators.compute({symbol: price}).get(symbol)
+                )
             
             config = self.db.get_trading_config(user.id)
             trade_amount = config.get('max_trade_amount_usdt', 50.00)
@@ -345,14 +353,14 @@ class TradingCommands:
             config = self.db.get_trading_config(user.id)
             trade_amount = config.get('max_trade_amount_usdt', 50.00)
             
-            balances = self.binance.get_balance()
+            balances = await self.async_binance.get_balance()
             usdt_balance = balances.get('USDT', {}).get('free', 0)
             
             if usdt_balance < trade_amount:
                 await query.answer(get_text(lang, 'insufficient_balance'), show_alert=True)
                 return
             
-            order = self.binance.execute_buy(symbol, trade_amount)
+            order = await self.async_binance.execute_buy(symbol, trade_amount)
             
             price = float(order['fills'][0]['price'])
             quantity = float(order['executedQty'])
@@ -399,14 +407,14 @@ class TradingCommands:
         
         try:
             asset = symbol.replace('USDT', '')
-            balances = self.binance.get_balance()
+            balances = await self.async_binance.get_balance()
             asset_balance = balances.get(asset, {}).get('free', 0)
             
             if asset_balance <= 0:
                 await query.answer(get_text(lang, 'insufficient_balance'), show_alert=True)
                 return
             
-            order = self.binance.execute_sell(symbol, asset_balance)
+            order = await self.async_binance.execute_sell(symbol, asset_balance)
             
             price = float(order['fills'][0]['price'])
             quantity = float(order['executedQty'])
@@ -31,6 +31,10 @@ TRANSLATIONS = {
         'enable_notifications': "🔔 Enable Notifications",
         'disable_notifications': "🔕 Disable Notifications",
         'notifications_status': "📊 Current Status",
+        'alert_digest': "⏱ Alert Digest",
+        'alert_digest_off': "Off (instant)",
+        'alert_min_move': "📏 Min Alert Move",
+        'alert_min_move_off': "Auto (per symbol)",
         'buy_signal': "🟢 BUY",
         'sell_signal': "🔴 SELL",
         'hold_signal': "🟡 HOLD",
@@ -141,6 +145,7 @@ Support: support@memobotpro.com""",
         'broadcast_from_admin': "Admin Broadcast",
         'broadcast_sent': "Sent",
         'broadcast_failed': "Failed",
+        'broadcast_queued': "Queued for delivery",
         
         # Balance and Trading
         'wallet_balance': "Wallet Balance",
@@ -228,6 +233,10 @@ Support: support@memobotpro.com""",
         'enable_notifications': "🔔 تفعيل الإشعارات",
         'disable_notifications': "🔕 إيقاف الإشعارات",
         'notifications_status': "📊 الحالة الحالية",
+        'alert_digest': "⏱ ملخص التنبيهات",
+        'alert_digest_off': "متوقف (فوري)",
+        'alert_min_move': "📏 أدنى حركة للتنبيه",
+        'alert_min_move_off': "تلقائي (حسب العملة)",
         'buy_signal': "🟢 شراء",
         'sell_signal': "🔴 بيع",
         'hold_signal': "🟡 انتظار",
@@ -338,6 +347,7 @@ Support: support@memobotpro.com""",
         'broadcast_from_admin': "بث من المشرف",
         'broadcast_sent': "تم الإرسال",
         'broadcast_failed': "فشل",
+        'broadcast_queued': "في قائمة الإرسال",
         
         # Balance and Trading
         'wallet_balance': "رصيد المحفظة",
@@ -6,6 +6,14 @@ from typing import Dict, Optional
 
 STORAGE_FILE = 'user_settings.xlsx'
 
+
+def _digest_seconds(value) -> Optional[int]:
+    """Alert Digest cell as seconds; empty means the configured default"""
+    if value is None or value == '':
+        return None
+    return int(value)
+
+
 class UserStorage:
     def __init__(self):
         self.file_path = STORAGE_FILE
@@ -16,14 +24,21 @@ class UserStorage:
             wb = Workbook()
             ws = wb.active
             ws.title = "User Settings"
-            ws.append(['User ID', 'Username', 'Language', 'Auto Signals', 'Timezone', 'Last Updated', 'Last Activity', 'Last Welcome'])
+            ws.append(['User ID', 'Username', 'Language', 'Auto Signals', 'Timezone', 'Last Updated', 'Last Activity', 'Last Welcome',
+                       'Alert Digest'])
             wb.save(self.file_path)
         else:
             wb = openpyxl.load_workbook(self.file_path)
             ws = wb['User Settings']
+            changed = False
             if ws['G1'].value is None:
                 ws['G1'] = 'Last Activity'
                 ws['H1'] = 'Last Welcome'
+                changed = True
+            if ws['I1'].value is None:
+                ws['I1'] = 'Alert Digest'
+                changed = True
+            if changed:
                 wb.save(self.file_path)
     
     def get_user_settings(self, user_id: int) -> Optional[Dict]:
@@ -41,7 +56,8 @@ class UserStorage:
                         'timezone': row[4].value or 'UTC',
                         'last_updated': row[5].value,
                         'last_activity': row[6].value if len(row) > 6 and row[6].value else None,
-                        'last_welcome': row[7].value if len(row) > 7 and row[7].value else None
+                        'last_welcome': row[7].value if len(row) > 7 and row[7].value else None,
+                        'alert_digest_seconds': _digest_seconds(row[8].value if len(row) > 8 else None)
                     }
             return None
         except Exception as e:
@@ -65,6 +81,7 @@ class UserStorage:
             last_updated = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             last_activity = settings.get('last_activity', last_updated)
             last_welcome = settings.get('last_welcome')
+            alert_digest_seconds = settings.get('alert_digest_seconds')
             
             if row_to_update:
                 ws[f'A{row_to_update}'] = user_id
@@ -75,8 +92,11 @@ class UserStorage:
                 ws[f'F{row_to_update}'] = last_updated
                 ws[f'G{row_to_update}'] = last_activity
                 ws[f'H{row_to_update}'] = last_welcome
+                if alert_digest_seconds is not None:
+                    ws[f'I{row_to_update}'] = alert_digest_seconds
             else:
-                ws.append([user_id, username, language, auto_signals, timezone, last_updated, last_activity, last_welcome])
+                ws.append([user_id, username, language, auto_signals, timezone, last_updated, last_activity, last_welcome,
+                           alert_digest_seconds])
             
             wb.save(self.file_path)
             return True
@@ -116,7 +136,8 @@ class UserStorage:
                     users.append({
                         'user_id': row[0],
                         'username': row[1],
-                        'language': row[2] or 'en'
+                        'language': row[2] or 'en',
+                        'alert_digest_seconds': _digest_seconds(row[8] if len(row) > 8 else None)
                     })
         except Exception as e:
             print(f"Error getting users: {e}")
@@ -1,7 +1,13 @@
 from flask import Flask, render_template_string, jsonify, request, send_from_directory
 from flask_cors import CORS
 from .config import Config
-from .binance_client import BinanceClient
+from .binance_client import AsyncBinanceClient, BinanceClient, market_cache, weight_governor
+from .candle_store import candle_store
+from .exchange_info import OrderSizeError, symbol_filters
+from .http_transport import shared_transport
+from .signal_service import signal_service
+from .singleflight import single_flight
+from .tick_replay import create_replay_from_config
 from .signal_generator import SignalGenerator
 from .scalping_signals import ScalpingSignalGenerator
 from .monitor import BotHealthMonitor
@@ -40,6 +46,7 @@ CORS(app, resources={
 
 # Global client instances (lazy initialization)
 _client = None
+_async_client = None
 _signal_gen = None
 _scalping_signals = None
 _database = None
@@ -114,7 +121,7 @@ def get_or_create_client():
     Returns:
         tuple: (_client, _signal_gen, _monitor, _database)
     """
-    global _client, _signal_gen, _scalping_signals, _database, _trading_commands, _last_error, _monitor
+    global _client, _async_client, _signal_gen, _scalping_signals, _database, _trading_commands, _last_error, _monitor
     
     if _client is None:
         try:
@@ -124,13 +131,29 @@ def get_or_create_client():
             is_deployment = os.getenv('REPLIT_DEPLOYMENT') == '1'
             mock_mode = config.mock_mode or is_deployment
             
+            market_cache.configure(ttl=config.price_cache_ttl, stale_ttl=config.price_cache_stale_ttl)
+            shared_transport.configure(
+                pool_maxsize=config.http_pool_size,
+                per_host_limit=config.http_per_host_limit,
+                dns_cache_ttl=config.http_dns_cache_ttl
+            )
+            weight_governor.configure(weight_limit=config.binance_weight_limit)
+            symbol_filters.configure(
+                cache_path=config.exchange_info_cache_path,
+                refresh_interval=config.exchange_info_refresh_hours * 3600
+            )
+            candle_store.configure(root=config.candle_store_path)
             _client = BinanceClient(
                 api_key=config.binance_api_key,
                 api_secret=config.binance_api_secret,
-                mock=mock_mode
+                mock=mock_mode,
+                replay=create_replay_from_config(config) if mock_mode else None
             )
-            _signal_gen = SignalGenerator(_client)
-            _scalping_signals = ScalpingSignalGenerator(_client)
+            # One pooled async session shared by the bot and trading commands
+            _async_client = AsyncBinanceClient.from_client(_client)
+            _signal_gen = SignalGenerator(_client, seed=config.signal_seed)
+            _scalping_signals = ScalpingSignalGenerator(_client, seed=config.signal_seed)
+            signal_service.configure(seed=config.signal_seed)
             _monitor = BotHealthMonitor(config)
             
             # Initialize database (with fallback)
@@ -144,7 +167,7 @@ def get_or_create_client():
             
             # Initialize trading commands if database is available
             if _database:
-                _trading_commands = TradingCommands(_client, _database)
+                _trading_commands = TradingCommands(_client, _database, _async_client)
                 logger.info("✅ Trading commands initialized")
             else:
                 _trading_commands = None
@@ -156,6 +179,7 @@ def get_or_create_client():
             # Fallback to mock mode on error
             config = Config.from_env()
             _client = BinanceClient(mock=True)
+            _async_client = AsyncBinanceClient(mock=True)
             _signal_gen = SignalGenerator(_client)
             _scalping_signals = ScalpingSignalGenerator(_client)
             _monitor = BotHealthMonitor(config)
@@ -502,7 +526,7 @@ def index():
         try:
             prices = client.get_all_prices()
             summary = client.get_market_summary()
-            signals = signal_gen.generate_signals(['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'SOLUSDT'])
+            signals = signal_service.current(client).signal_list(['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'SOLUSDT'])
         except Exception as e:
             # Return error page with helpful message
             return render_template_string('''
@@ -636,7 +660,7 @@ def api_prices():
     """API endpoint for prices with error handling"""
     try:
         client, _, _, _ = get_or_create_client()
-        return jsonify({'prices': client.get_all_prices()})
+        return jsonify({'prices': single_flight.do('all_prices', client.get_all_prices)})
     except Exception as e:
         return jsonify({'error': str(e)}), 503
 
@@ -644,8 +668,9 @@ def api_prices():
 def api_signals():
     """API endpoint for signals with error handling"""
     try:
-        _, signal_gen, _, _ = get_or_create_client()
-        return jsonify({'signals': signal_gen.generate_signals()})
+        client, _, _, _ = get_or_create_client()
+        snapshot = single_flight.do('signals', lambda: signal_service.current(client))
+        return jsonify({'signals': snapshot.signal_list(), 'version': snapshot.version})
     except Exception as e:
         return jsonify({'error': str(e)}), 503
 
@@ -655,7 +680,7 @@ def api_market_data():
     """API endpoint for market data (Mini App frontend expects this format)"""
     try:
         client, _, _, _ = get_or_create_client()
-        prices = client.get_all_prices()
+        prices = single_flight.do('all_prices', client.get_all_prices)
         return jsonify({'prices': prices, 'timestamp': time.time()})
     except Exception as e:
         return jsonify({'error': str(e)}), 503
@@ -665,15 +690,8 @@ def api_scalping_signals():
     """API endpoint for scalping signals with entry/exit/stop-loss/take-profit"""
     try:
         client, _, _, _ = get_or_create_client()
-        
-        # Get scalping signals generator
-        global _scalping_signals
-        if _scalping_signals is None:
-            from .scalping_signals import ScalpingSignalGenerator
-            _scalping_signals = ScalpingSignalGenerator(client)
-        
-        signals = _scalping_signals.generate_all_signals()
-        return jsonify({'signals': signals, 'timestamp': time.time()})
+        snapshot = single_flight.do('signals', lambda: signal_service.current(client))
+        return jsonify({'signals': snapshot.scalping_list(), 'version': snapshot.version, 'timestamp': time.time()})
     except Exception as e:
         logger.error(f"Error generating scalping signals: {e}")
         return jsonify({'error': str(e)}), 503
@@ -692,30 +710,11 @@ def api_balance():
         
         # Get Binance balances
         try:
-            account_info = client.client.get_account()
-            balances = {}
-            total_usdt = 0
+            balance_info = client.get_balance()
+            balances = {asset: info['total'] for asset, info in balance_info.items()}
             
-            for balance in account_info.get('balances', []):
-                asset = balance['asset']
-                free = float(balance['free'])
-                locked = float(balance['locked'])
-                total = free + locked
-                
-                if total > 0:
-                    balances[asset] = total
-                    
-                    # Calculate USDT value
-                    if asset == 'USDT':
-                        total_usdt += total
-                    else:
-                        try:
-                            symbol = f"{asset}USDT"
-                            ticker = client.client.get_ticker(symbol=symbol)
-                            price = float(ticker['lastPrice'])
-                            total_usdt += total * price
-                        except:
-                            pass
+            # Value all holdings against one shared snapshot instead of one ticker call per asset
+            total_usdt = sum(client.value_balances(balance_info).values())
             
             # Convert to AED (1 USDT ≈ 3.67 AED)
             total_aed = total_usdt * 3.67
@@ -796,16 +795,19 @@ def api_trade():
         # Fetch current market price
         try:
             binance_symbol = f"{symbol.upper()}USDT"
-            ticker = client.client.get_ticker(symbol=binance_symbol)
-            current_price = float(ticker['lastPrice'])
+            ticker = client.get_price(binance_symbol)
+            current_price = float(ticker['price'])
             
             logger.info(f"Fetched current price for {binance_symbol}: {current_price}")
         except Exception as e:
             logger.error(f"Error fetching price for {binance_symbol}: {e}")
             return jsonify({'error': f'Unable to fetch current price for {symbol}'}), 503
         
-        # Calculate quantity from USDT amount
-        quantity = amount_float / current_price
+        # Calculate quantity from USDT amount, rounded to the symbol's LOT_SIZE
+        try:
+            quantity = float(client.size_order(binance_symbol, amount_float / current_price, current_price))
+        except OrderSizeError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Execute trade via Binance
         try:
@@ -849,11 +851,7 @@ def api_trade():
                 })
             
             # Real Binance order
-            order = client.client.order_market(
-                symbol=binance_symbol,
-                side=side,
-                quantity=quantity
-            )
+            order = client.execute_market_order(binance_symbol, side, quantity, current_price)
             
             # Record trade in database
             if database:
@@ -1101,12 +1099,16 @@ async def _start_monitoring_tasks(bot_instance):
         asyncio.create_task(bot_instance.send_heartbeat_loop())
         logger.info("✅ Started heartbeat monitoring")
         
+        # Start outbound queue senders
+        if bot_instance.start_outbox_senders():
+            logger.info(f"✅ Started {len(bot_instance.outbox_senders)} outbox sender worker(s)")
+        
     except Exception as e:
         logger.error(f"Error starting monitoring tasks: {e}")
 
 def init_telegram_bot_webhook():
     """Initialize Telegram bot in webhook mode (no polling)"""
-    global _telegram_bot, _telegram_app, _bot_initialized, _bot_loop, _bot_thread, _client, _database, _trading_commands
+    global _telegram_bot, _telegram_app, _bot_initialized, _bot_loop, _bot_thread, _client, _async_client, _database, _trading_commands
     
     if _bot_initialized:
         logger.info("Telegram bot already initialized")
@@ -1125,7 +1127,7 @@ def init_telegram_bot_webhook():
         get_or_create_client()
         
         # Create bot instance with injected dependencies
-        _telegram_bot = EnhancedTelegramBot(config, _client, _database, _trading_commands)
+        _telegram_bot = EnhancedTelegramBot(config, _client, _database, _trading_commands, _async_client)
         
         # Create new event loop for bot
         _bot_loop = asyncio.new_event_loop()
@@ -1187,6 +1189,7 @@ def init_telegram_bot_webhook():
                 minutes=10,
                 id='inactive_user_check'
             )
+            _telegram_bot.add_market_data_jobs()
             
             # Add auto-trading scheduler if database and trading_commands available
             if _database and _trading_commands:
@@ -0,0 +1,60 @@
+from memo_bot_pro.alert_digest import DIGEST_WINDOWS, AlertDigest, next_digest_window
+
+
+def change(symbol, old_price, new_price):
+    return {'symbol': symbol, 'old_price': old_price, 'new_price': new_price}
+
+
+def test_changes_merge_per_symbol_within_a_window():
+    digest = AlertDigest()
+    digest.add(1, 'en', [change('BTCUSDT', 100, 101)], window=30, now=0)
+    digest.add(1, 'en', [change('BTCUSDT', 101, 102), change('ETHUSDT', 10, 11)], window=30, now=10)
+
+    [(user_id, language, changes)] = digest.due(30)
+
+    assert (user_id, language) == (1, 'en')
+    # The price from the start of the window is kept, with the latest price
+    assert changes == [change('BTCUSDT', 100, 102), change('ETHUSDT', 10, 11)]
+    assert digest.stats() == {'pending': 0, 'buffered': 2, 'flushed': 1, 'merged': 1}
+
+
+def test_window_is_due_from_the_first_alert():
+    digest = AlertDigest()
+    digest.add(1, 'en', [change('BTCUSDT', 100, 101)], window=30, now=0)
+    digest.add(1, 'ar', [change('BTCUSDT', 101, 102)], window=30, now=25)
+
+    assert digest.due(29.9) == []
+    [(_, language, _)] = digest.due(30)
+    assert language == 'ar'  # Latest language wins
+    assert len(digest) == 0
+
+
+def test_a_new_alert_after_flush_opens_a_new_window():
+    digest = AlertDigest()
+    digest.add(1, 'en', [change('BTCUSDT', 100, 101)], window=10, now=0)
+    digest.due(10)
+
+    digest.add(1, 'en', [change('BTCUSDT', 101, 103)], window=10, now=15)
+
+    assert digest.due(20) == []
+    assert digest.due(25) == [(1, 'en', [change('BTCUSDT', 101, 103)])]
+
+
+def test_users_flush_independently_and_discard_drops_pending():
+    digest = AlertDigest()
+    digest.add(1, 'en', [change('BTCUSDT', 100, 101)], window=10, now=0)
+    digest.add(2, 'en', [change('BTCUSDT', 100, 101)], window=60, now=0)
+    digest.add(3, 'en', [change('BTCUSDT', 100, 101)], window=10, now=0)
+    digest.discard(3)
+
+    assert [user_id for user_id, _, _ in digest.due(10)] == [1]
+    assert len(digest) == 1
+
+
+def test_next_digest_window_cycles_through_choices():
+    windows = [DIGEST_WINDOWS[0]]
+    for _ in DIGEST_WINDOWS:
+        windows.append(next_digest_window(windows[-1]))
+
+    assert windows == list(DIGEST_WINDOWS) + [DIGEST_WINDOWS[0]]
+    assert next_digest_window(None) == DIGEST_WINDOWS[1]
@@ -0,0 +1,101 @@
+import numpy as np
+
+from memo_bot_pro.backtest import (
+    EXIT_STOP_LOSS, EXIT_TAKE_PROFIT, EXIT_TIME, BacktestParams, simulate_trades
+)
+
+
+def make_candles(length=12, price=100.0):
+    """Flat candles at price with a 0.2% range, too narrow to hit a 1% target or 0.5% stop"""
+    return {
+        'open_time': np.arange(length, dtype=np.int64) * 60_000,
+        'open_': np.full(length, price),
+        'high': np.full(length, price * 1.002),
+        'low': np.full(length, price * 0.998),
+        'close': np.full(length, price),
+    }
+
+
+def make_signals(length=12, buys=(0,), hold=5, take_profit=1.0):
+    buy = np.zeros(length, dtype=bool)
+    buy[list(buys)] = True
+    return {
+        'buy': buy,
+        'hold': np.full(length, hold),
+        'take_profit': np.full(length, take_profit),
+        'confidence': np.full(length, 80.0),
+    }
+
+
+def simulate(candles, signals, **params):
+    return simulate_trades(**candles, signals=signals, params=BacktestParams(**params))
+
+
+def test_stop_fills_before_take_profit_in_the_same_candle():
+    candles = make_candles()
+    candles['high'][1] = 102.0  # Take-profit at 101 ...
+    candles['low'][1] = 99.0  # ... and stop at 99.5 both inside the entry candle
+
+    trades = simulate(candles, make_signals(), stop_loss_percent=0.5)
+
+    assert trades['exit_reason'].tolist() == [EXIT_STOP_LOSS]
+    assert trades['exit_price'][0] == 99.5
+    assert trades['hold_bars'][0] == 1
+
+
+def test_take_profit_fills_at_target():
+    candles = make_candles()
+    candles['high'][2] = 101.5
+
+    trades = simulate(candles, make_signals())
+
+    assert trades['exit_reason'].tolist() == [EXIT_TAKE_PROFIT]
+    assert trades['exit_price'][0] == 101.0
+    assert trades['entry_time'][0] == 60_000
+    assert trades['exit_time'][0] == 3 * 60_000
+
+
+def test_stop_gapped_through_fills_at_the_open():
+    candles = make_candles()
+    candles['open_'][2] = 98.0
+    candles['low'][2] = 97.0
+
+    trades = simulate(candles, make_signals(), stop_loss_percent=0.5)
+
+    assert trades['exit_reason'].tolist() == [EXIT_STOP_LOSS]
+    assert trades['exit_price'][0] == 98.0
+    assert trades['hold_bars'][0] == 2
+
+
+def test_time_exit_at_close_of_last_hold_bar():
+    candles = make_candles()
+    candles['close'][5] = 100.3
+
+    trades = simulate(candles, make_signals(hold=5))
+
+    assert trades['exit_reason'].tolist() == [EXIT_TIME]
+    assert trades['exit_price'][0] == 100.3
+    assert trades['hold_bars'][0] == 5
+
+
+def test_entries_overlapping_the_open_position_are_skipped():
+    candles = make_candles()
+    candles['high'][3] = 101.5  # First trade (entered at 1) exits at candle 3
+
+    trades = simulate(candles, make_signals(buys=(0, 1, 2, 3)))
+
+    # Entries at 2 and 3 start before the first exit is done; the entry at 4 is taken
+    assert (trades['entry_time'] // 60_000).tolist() == [1, 4]
+    assert trades['exit_reason'].tolist() == [EXIT_TAKE_PROFIT, EXIT_TIME]
+
+
+def test_pnl_includes_entry_and_exit_fees():
+    candles = make_candles()
+    candles['high'][1] = 101.5
+
+    trades = simulate(candles, make_signals(), fee_percent=0.1, trade_amount_usdt=50.0)
+
+    exit_value = 50.0 / 100.0 * 101.0
+    fees = (50.0 + exit_value) * 0.001
+    assert np.isclose(trades['fees'][0], fees)
+    assert np.isclose(trades['pnl'][0], exit_value - 50.0 - fees)
@@ -0,0 +1,35 @@
+from memo_bot_pro.bar_aggregator import BarAggregator
+
+MINUTE = 60_000
+
+
+def test_base_bars_roll_up_into_coarser_intervals():
+    aggregator = BarAggregator(intervals=('1m', '5m'))
+    closed = []
+    for minute, price in enumerate([100, 103, 99, 101, 102, 104]):
+        closed += aggregator.on_tick('BTCUSDT', price, minute * MINUTE)
+
+    five_minute = [bar for bar in closed if bar.interval == '5m']
+    assert [bar.interval for bar in closed] == ['1m'] * 5 + ['5m']
+    assert (five_minute[0].open, five_minute[0].high, five_minute[0].low, five_minute[0].close) == (100, 103, 99, 102)
+
+
+def test_advance_closes_rollups_for_a_symbol_that_stopped_ticking():
+    aggregator = BarAggregator(intervals=('1m', '5m', '1h'))
+    aggregator.on_tick('BTCUSDT', 100, 0)
+    aggregator.on_tick('BTCUSDT', 101, 2 * MINUTE)
+
+    closed = aggregator.advance(60 * MINUTE)
+
+    assert [(bar.interval, bar.open_time) for bar in closed] == [('1m', 2 * MINUTE), ('5m', 0), ('1h', 0)]
+    assert aggregator.advance(120 * MINUTE) == []
+
+
+def test_late_ticks_do_not_reopen_closed_bars():
+    aggregator = BarAggregator(intervals=('1m', '5m'))
+    aggregator.on_tick('BTCUSDT', 100, 0)
+    aggregator.advance(5 * MINUTE)
+
+    assert aggregator.on_tick('BTCUSDT', 90, 4 * MINUTE) == []
+    assert aggregator.late_ticks == 1
+    assert aggregator.advance(10 * MINUTE) == []
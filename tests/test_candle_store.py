@@ -0,0 +1,63 @@
+import threading
+
+import numpy as np
+
+from memo_bot_pro.candle_store import CANDLE_COLUMNS, CandleSeries, CandleStore
+
+
+def rows(start, count):
+    times = np.arange(start, start + count, dtype=np.int64) * 60_000
+    return {name: times.astype(dtype) if name == 'open_time' else np.full(count, 1.0 + start)
+            for name, dtype in CANDLE_COLUMNS.items()}
+
+
+def test_append_skips_known_rows_and_replaces_the_last(tmp_path):
+    series = CandleSeries(str(tmp_path), initial_capacity=4)
+
+    assert series.append(rows(0, 3)) == 3
+    assert series.append(rows(2, 4)) == 3  # Row 2 overwritten, rows 3-5 added past capacity
+
+    assert len(series) == 6
+    assert series.tail(2)['open_time'].tolist() == [4 * 60_000, 5 * 60_000]
+    assert series.range(2 * 60_000, 3 * 60_000)['close'].tolist() == [3.0, 3.0]
+    # Reopened from disk
+    assert len(CandleSeries(str(tmp_path))) == 6
+
+
+def test_readers_never_see_partial_columns_while_capacity_grows(tmp_path):
+    series = CandleSeries(str(tmp_path), initial_capacity=1)
+    errors = []
+
+    def read():
+        while not done.is_set():
+            try:
+                tail = series.tail(5)
+                assert len({len(column) for column in tail.values()}) == 1
+            except Exception as e:  # KeyError from a half-built column dict
+                errors.append(e)
+                return
+
+    done = threading.Event()
+    reader = threading.Thread(target=read)
+    reader.start()
+    for i in range(500):
+        series.append(rows(i, 1))
+    done.set()
+    reader.join()
+
+    assert errors == []
+    assert len(series) == 500
+
+
+def test_backfill_skips_mock_clients(tmp_path):
+    class MockClient:
+        mock = True
+
+        def get_klines(self, *args, **kwargs):
+            raise AssertionError("mock klines must not be fetched")
+
+    store = CandleStore(str(tmp_path))
+
+    assert store.backfill(MockClient(), 'BTCUSDT') == 0
+    assert store.stats()['backfills_skipped'] == 1
+    assert store.find('BTCUSDT', '1m') is None
@@ -0,0 +1,27 @@
+import asyncio
+import json
+
+from memo_bot_pro.market_stream import MiniTickerStream
+
+
+def mini_ticker(symbol, price, volume, event_time):
+    return {'e': '24hrMiniTicker', 'E': event_time, 's': symbol, 'c': str(price), 'v': str(volume)}
+
+
+def handle(stream, *events):
+    asyncio.run(stream._handle_message(json.dumps(list(events))))
+
+
+def test_updates_carry_volume_traded_since_the_previous_update():
+    stream = MiniTickerStream(None, symbols=['BTCUSDT'])
+    queue = stream.subscribe()
+
+    handle(stream, mini_ticker('BTCUSDT', 100, 5000, 1_000), mini_ticker('ETHUSDT', 10, 1, 1_000))
+    handle(stream, mini_ticker('BTCUSDT', 101, 5002.5, 2_000))
+    # Trades leaving the 24h window shrink the rolling volume: no volume for that update
+    handle(stream, mini_ticker('BTCUSDT', 102, 4990, 3_000))
+
+    batches = [queue.get_nowait() for _ in range(3)]
+    assert [[(u.symbol, u.price, u.volume) for u in batch] for batch in batches] == [
+        [('BTCUSDT', 100.0, 0.0)], [('BTCUSDT', 101.0, 2.5)], [('BTCUSDT', 102.0, 0.0)]
+    ]
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from telegram.error import Forbidden
+
+from memo_bot_pro import outbox
+from memo_bot_pro.fanout import NotificationFanout
+from memo_bot_pro.outbound import PRIORITY_ALERT, PRIORITY_BULK, OutboundMessage
+from memo_bot_pro.outbox import OutboxSender, SQLiteOutbox
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(outbox.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    return SQLiteOutbox(str(tmp_path / 'outbox.db'))
+
+
+def message(chat_id, key=None, priority=PRIORITY_BULK, expires_in=None):
+    return OutboundMessage(chat_id, '{"text": "hi"}', key or f"test:{chat_id}", priority, expires_in)
+
+
+def test_enqueue_skips_duplicate_dedupe_keys(store):
+    assert store.enqueue_outbound([message(1), message(2)]) == 2
+    assert store.enqueue_outbound([message(1), message(3)]) == 1
+    assert store.outbound_stats() == {'pending': 3}
+
+
+def test_claim_orders_by_priority_then_insertion(store):
+    store.enqueue_outbound([message(1), message(2, priority=PRIORITY_ALERT), message(3)])
+
+    claimed = store.claim_outbound(10, visibility_timeout=60)
+
+    assert [m.chat_id for m in claimed] == [2, 1, 3]
+    assert all(m.attempts == 1 for m in claimed)
+
+
+def test_claimed_messages_are_hidden_until_visibility_timeout(store, clock):
+    store.enqueue_outbound([message(1), message(2)])
+
+    assert [m.chat_id for m in store.claim_outbound(1, visibility_timeout=60)] == [1]
+    assert [m.chat_id for m in store.claim_outbound(10, visibility_timeout=60)] == [2]
+    assert store.claim_outbound(10, visibility_timeout=60) == []
+
+    # A sender that died without acking: its messages come back after the timeout
+    clock[0] += 60
+    reclaimed = store.claim_outbound(10, visibility_timeout=60)
+    assert [m.chat_id for m in reclaimed] == [1, 2]
+    assert all(m.attempts == 2 for m in reclaimed)
+
+
+def test_acked_messages_are_not_claimed_again(store, clock):
+    store.enqueue_outbound([message(1), message(2)])
+    first, second = store.claim_outbound(10, visibility_timeout=60)
+
+    store.ack_outbound([first.id])
+    clock[0] += 60
+
+    assert [m.chat_id for m in store.claim_outbound(10, visibility_timeout=60)] == [2]
+    assert store.outbound_stats() == {'pending': 1, 'sent': 1}
+
+
+def test_failures_retry_after_delay_or_stop_for_good(store, clock):
+    store.enqueue_outbound([message(1), message(2)])
+    retry, permanent = store.claim_outbound(10, visibility_timeout=60)
+
+    store.fail_outbound([(retry.id, 'NetworkError', 5.0), (permanent.id, 'Forbidden', None)])
+
+    assert store.claim_outbound(10, visibility_timeout=60) == []
+    clock[0] += 5
+    assert [m.chat_id for m in store.claim_outbound(10, visibility_timeout=60)] == [1]
+    assert store.outbound_stats() == {'pending': 1, 'failed': 1}
+
+
+def test_expired_messages_are_dropped(store, clock):
+    store.enqueue_outbound([message(1, expires_in=30), message(2)])
+
+    clock[0] += 30
+
+    assert [m.chat_id for m in store.claim_outbound(10, visibility_timeout=60)] == [2]
+    assert store.purge_outbound() == 1
+
+
+def test_sender_reports_delivery_only_for_sent_messages(store):
+    class Bot:
+        async def send_message(self, chat_id, **kwargs):
+            if chat_id == 2:
+                raise Forbidden("bot was blocked by the user")
+
+    delivered = []
+    store.enqueue_outbound([message(1), message(2)])
+    sender = OutboxSender(store, NotificationFanout(), on_sent=lambda item: delivered.append(item[0]))
+
+    assert asyncio.run(sender.drain_once(Bot())) == 2
+    assert delivered == [1]
+    assert store.outbound_stats() == {'sent': 1, 'failed': 1}
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from memo_bot_pro.indicators import ema, rsi
+from memo_bot_pro.streaming_indicators import StreamingIndicatorBook
+
+
+@pytest.fixture
+def prices():
+    # Longer than two smoothing blocks so indicators.py takes its blocked path too
+    rng = np.random.default_rng(7)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.002, 600)))
+
+
+def feed(prices, **params):
+    book = StreamingIndicatorBook(**params)
+    for price in prices:
+        book.update('BTCUSDT', float(price))
+    return book.get('BTCUSDT')
+
+
+def test_ema_and_rsi_match_indicators(prices):
+    values = feed(prices, fast=12, slow=26, rsi_period=14)
+
+    assert values['ema_fast'] == pytest.approx(ema(prices, 12)[-1], rel=1e-9)
+    assert values['ema_slow'] == pytest.approx(ema(prices, 26)[-1], rel=1e-9)
+    assert values['rsi'] == pytest.approx(rsi(prices, 14)[-1], rel=1e-9)
+
+
+def test_rolling_window_matches_numpy(prices):
+    values = feed(prices, window=50)
+    window = prices[-50:]
+
+    assert values['samples'] == 50
+    assert values['mean'] == pytest.approx(window.mean(), rel=1e-9)
+    assert values['std'] == pytest.approx(window.std(), rel=1e-6)
+    assert values['min'] == window.min()
+    assert values['max'] == window.max()
+
+
+def test_every_step_matches_indicators(prices):
+    book = StreamingIndicatorBook(fast=12, slow=26, rsi_period=14)
+    expected_ema = ema(prices, 12)
+    expected_rsi = rsi(prices, 14)
+    for i, price in enumerate(prices):
+        book.update('BTCUSDT', float(price))
+        values = book.get('BTCUSDT')
+        assert values['ema_fast'] == pytest.approx(expected_ema[i], rel=1e-9)
+        if i:
+            assert values['rsi'] == pytest.approx(expected_rsi[i - 1], rel=1e-9)
+
+
+def test_snapshot_restore_resumes_exactly(prices):
+    book = StreamingIndicatorBook(window=50)
+    for price in prices[:300]:
+        book.update('BTCUSDT', float(price))
+    restored = StreamingIndicatorBook(window=50)
+    restored.restore(book.snapshot())
+
+    for price in prices[300:]:
+        book.update('BTCUSDT', float(price))
+        restored.update('BTCUSDT', float(price))
+
+    assert restored.get('BTCUSDT') == book.get('BTCUSDT')
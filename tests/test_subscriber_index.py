@@ -0,0 +1,78 @@
+from memo_bot_pro.subscriber_index import Subscriber, SubscriberIndex
+
+
+def test_lookup_includes_thresholds_at_or_below_confidence():
+    index = SubscriberIndex([
+        Subscriber(1, min_confidence=0),
+        Subscriber(2, min_confidence=75),
+        Subscriber(3, min_confidence=90),
+    ])
+
+    assert index.lookup('BTCUSDT', 74.9) == {1}
+    assert index.lookup('BTCUSDT', 75) == {1, 2}
+    assert index.lookup('BTCUSDT', 100) == {1, 2, 3}
+
+
+def test_lookup_combines_symbol_buckets_with_all_symbol_subscribers():
+    index = SubscriberIndex([
+        Subscriber(1, symbols=frozenset({'BTCUSDT'})),
+        Subscriber(2, symbols=frozenset({'ETHUSDT'})),
+        Subscriber(3),
+    ])
+
+    assert index.lookup('BTCUSDT', 50) == {1, 3}
+    assert index.lookup('ETHUSDT', 50) == {2, 3}
+    assert index.lookup('SOLUSDT', 50) == {3}
+
+
+def test_lookup_by_language():
+    index = SubscriberIndex([
+        Subscriber(1, language='en'),
+        Subscriber(2, language='ar', symbols=frozenset({'BTCUSDT'})),
+    ])
+
+    assert index.lookup('BTCUSDT', 80, language='ar') == {2}
+    assert index.lookup('BTCUSDT', 80, language='en') == {1}
+    assert index.lookup('BTCUSDT', 80) == {1, 2}
+
+
+def test_add_replaces_and_remove_empties_buckets():
+    index = SubscriberIndex([Subscriber(1, min_confidence=50)])
+
+    index.add(Subscriber(1, min_confidence=90))
+    assert index.lookup('BTCUSDT', 60) == set()
+    assert index.lookup('BTCUSDT', 95) == {1}
+
+    index.remove(1)
+    assert len(index) == 0
+    assert index.lookup('BTCUSDT', 95) == set()
+    assert index.stats()['buckets'] == 0
+
+
+def test_match_groups_symbols_per_user():
+    index = SubscriberIndex([
+        Subscriber(1, min_confidence=80),
+        Subscriber(2, symbols=frozenset({'ETHUSDT'})),
+    ])
+
+    recipients = index.match({'BTCUSDT': 85, 'ETHUSDT': 60})
+
+    assert recipients == {1: ['BTCUSDT'], 2: ['ETHUSDT']}
+
+
+def test_from_rows_rounds_threshold_up_and_parses_symbols():
+    subscriber = Subscriber.from_rows(
+        {'user_id': 7, 'language': 'ar'},
+        {'min_confidence': 74.5, 'enabled_symbols': 'btcusdt, ETHUSDT'}
+    )
+
+    assert subscriber.min_confidence == 75
+    assert subscriber.symbols == frozenset({'BTCUSDT', 'ETHUSDT'})
+    assert Subscriber.from_rows({'user_id': 8}).symbols is None
+
+
+def test_from_rows_reads_own_alert_change():
+    subscriber = Subscriber.from_rows({'user_id': 7}, {'alert_change_percent': 1.5})
+
+    assert subscriber.min_change_percent == 1.5
+    assert Subscriber.from_rows({'user_id': 8}, {'alert_change_percent': None}).min_change_percent is None